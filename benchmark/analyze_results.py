@@ -1,33 +1,850 @@
 """
 Phân tích và vẽ biểu đồ so sánh các thuật toán pathfinding
+
+Chạy:
+    python analyze_results.py [results_dir|file] [-o charts] [--headless | --json]
+    python analyze_results.py compare BASE NEW [--min-effect 0.05]
+    python analyze_results.py validate RESULTS [--maps MAPS]
+    python analyze_results.py scaling [results_dir|file] [--json]
+
+matplotlib/seaborn chỉ được import khi thật sự vẽ biểu đồ; import module này
+không đọc file và không thay đổi rcParams.
 """
 
+import argparse
+import json
+import os
+import pickle
+import re
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 from pathlib import Path
 
-# Thiết lập style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
-plt.rcParams['figure.figsize'] = (14, 8)
-plt.rcParams['font.size'] = 10
+# matplotlib/seaborn được import lười trong setup_plotting()
+plt = None
+sns = None
+
+
+def setup_plotting():
+    """Import thư viện vẽ, dùng backend Agg và thiết lập style (chỉ chạy một lần)."""
+    global plt, sns
+    if plt is not None:
+        return
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as pyplot
+    import seaborn
+
+    plt, sns = pyplot, seaborn
+    # Thiết lập style
+    plt.style.use('seaborn-v0_8-darkgrid')
+    sns.set_palette("husl")
+    plt.rcParams['figure.figsize'] = (14, 8)
+    plt.rcParams['font.size'] = 10
+
+# ============================================================================
+# ĐỌC DỮ LIỆU - Streaming theo chunk, gộp thống kê online
+# ============================================================================
+# Các cột số liệu cần thống kê (count/mean/std/min/max)
+# Bộ đếm chi phí chỉ có khi chạy runFullBenchmark.mjs --instrument; file không có
+# (hoặc ô trống) được coi là NaN và không tính vào count/mean
+COUNTER_MEASURES = ['Heap_Pushes', 'Heap_Pops', 'Stale_Pops', 'Heuristic_Calls',
+                    'Neighbour_Arrays', 'Relaxations']
+MEASURES = ['Nodes_Visited', 'Execution_Time_ms', 'Path_Length', 'Memory_Usage_Nodes'] + COUNTER_MEASURES
+GROUP_KEYS = ['Algorithm_Name', 'Map_Type']
+STATS = ['count', 'mean', 'm2', 'min', 'max']
+# Thống kê theo kích thước grid (số ô) cho phần fit độ phức tạp
+SIZE_KEYS = ['Algorithm_Name', 'Cells']
+SCALING_MEASURES = ['Execution_Time_ms', 'Nodes_Visited', 'Memory_Usage_Nodes']
+# File cũ không có cột Rows/Cols: mọi test chạy trên grid 25×50
+LEGACY_GRID_SIZE = (25, 50)
+
+# Số dòng mỗi chunk - bộ nhớ tối đa chỉ phụ thuộc vào giá trị này
+CHUNK_SIZE = 200_000
+CSV_COLUMNS = GROUP_KEYS + ['Rows', 'Cols', 'Parameters', 'Path_Found'] + MEASURES
+CSV_DTYPES = {
+    'Algorithm_Name': 'category',
+    'Map_Type': 'category',
+    'Rows': 'float64',
+    'Cols': 'float64',
+    'Parameters': 'string',
+    'Path_Found': 'category',
+    **{measure: 'float64' for measure in MEASURES},
+}
+
+# File cũ ghi JSON trong cột Parameters mà không escape dấu ngoặc kép
+# ("{"metric":"manhattan","weight":1}"), C parser không đọc được trực tiếp
+_PARAMETERS_FIELD = re.compile(r'"(\{[^{}]*\})"')
+_LEGACY_PARAMETERS = re.compile(r',"\{"[^"]')
+
+
+@lru_cache(maxsize=None)
+def _escape_parameters(field):
+    if '""' in field:
+        return f'"{field}"'
+    return '"' + field.replace('"', '""') + '"'
+
+
+class _LegacyCSVReader:
+    """File-like object sửa lại cột Parameters theo từng block, không đọc cả file vào RAM."""
+
+    def __init__(self, path, block_size=1 << 22):
+        self._file = open(path, 'r', encoding='utf-8', newline='')
+        self._block_size = block_size
+        self._rest = ''
+
+    def read(self, size=-1):
+        while True:
+            block = self._file.read(self._block_size)
+            if not block:
+                text, self._rest = self._rest, ''
+                return _PARAMETERS_FIELD.sub(lambda m: _escape_parameters(m.group(1)), text)
+            block = self._rest + block
+            cut = block.rfind('\n') + 1
+            if cut == 0:
+                self._rest = block
+                continue
+            self._rest = block[cut:]
+            return _PARAMETERS_FIELD.sub(lambda m: _escape_parameters(m.group(1)), block[:cut])
+
+    def close(self):
+        self._file.close()
+
+
+def _open_csv(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        head = f.read(1 << 16)
+    if _LEGACY_PARAMETERS.search(head):
+        return _LegacyCSVReader(path)
+    return path
+
+
+@lru_cache(maxsize=None)
+def _parse_parameters(text):
+    params = json.loads(text) if isinstance(text, str) and text else {}
+    return params.get('metric', ''), float(params.get('weight', np.nan))
+
+
+def parse_parameters(parameters):
+    """Parse cột Parameters (JSON) thành 2 cột có kiểu: metric (str) và weight (float).
+
+    Mỗi chuỗi JSON khác nhau chỉ được parse một lần cho cả file.
+    """
+    codes, uniques = pd.factorize(parameters, use_na_sentinel=False)
+    parsed = [_parse_parameters(None if pd.isna(text) else text) for text in uniques]
+    metric = np.array([p[0] for p in parsed], dtype=object)[codes]
+    weight = np.array([p[1] for p in parsed], dtype='float64')[codes]
+    return pd.DataFrame({'metric': metric, 'weight': weight}, index=parameters.index)
+
+
+@dataclass
+class Aggregates:
+    """Thống kê online theo nhóm (Algorithm_Name, Map_Type).
+
+    runs:    số test ('tests') và số test thành công ('successes') mỗi nhóm
+    moments: cột MultiIndex (stat, measure) với stat thuộc STATS;
+             'm2' là tổng bình phương độ lệch (Welford) để tính std
+    params:  metric/weight đã parse, index theo Algorithm_Name
+    scaling: moments của SCALING_MEASURES theo (Algorithm_Name, Cells)
+    """
+    runs: pd.DataFrame
+    moments: pd.DataFrame
+    params: pd.DataFrame
+    scaling: pd.DataFrame
+
+    @classmethod
+    def empty(cls):
+        index = pd.MultiIndex.from_arrays([[], []], names=GROUP_KEYS)
+        columns = pd.MultiIndex.from_product([STATS, MEASURES], names=['stat', 'measure'])
+        size_index = pd.MultiIndex.from_arrays([[], []], names=SIZE_KEYS)
+        size_columns = pd.MultiIndex.from_product([STATS, SCALING_MEASURES], names=['stat', 'measure'])
+        return cls(
+            runs=pd.DataFrame({'tests': [], 'successes': []}, index=index, dtype='float64'),
+            moments=pd.DataFrame(index=index, columns=columns, dtype='float64'),
+            params=pd.DataFrame({'metric': pd.Series(dtype=object), 'weight': pd.Series(dtype='float64')},
+                                index=pd.Index([], name='Algorithm_Name')),
+            scaling=pd.DataFrame(index=size_index, columns=size_columns, dtype='float64'),
+        )
+
+    def merge(self, other):
+        """Gộp hai tập thống kê (công thức song song của Chan, tương đương Welford)."""
+        runs = self.runs.add(other.runs, fill_value=0)
+        params = pd.concat([self.params, other.params])
+        params = params[~params.index.duplicated()]
+        return Aggregates(runs, _merge_moments(self.moments, other.moments), params,
+                          _merge_moments(self.scaling, other.scaling))
+
+
+def _moments_frame(parts):
+    return pd.concat(parts, axis=1, names=['stat', 'measure'])
+
+
+def _merge_moments(a, b):
+    index = a.index.union(b.index)
+    a, b = a.reindex(index), b.reindex(index)
+    na, nb = a['count'].fillna(0), b['count'].fillna(0)
+    n = na + nb
+    ma, mb = a['mean'].fillna(0), b['mean'].fillna(0)
+    delta = mb - ma
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = (ma + delta * (nb / n)).where(n > 0)
+        m2 = (a['m2'].fillna(0) + b['m2'].fillna(0) + delta ** 2 * (na * nb / n).fillna(0)).where(n > 0)
+    return _moments_frame({
+        'count': n, 'mean': mean, 'm2': m2,
+        'min': np.fmin(a['min'], b['min']), 'max': np.fmax(a['max'], b['max']),
+    })
+
+
+def _plain_index(frame):
+    # Bỏ kiểu Categorical khỏi index để các chunk/file khác nhau gộp được với nhau
+    names = list(frame.index.names)
+    frame.index = pd.MultiIndex.from_arrays(
+        [frame.index.get_level_values(key).astype(str if key in GROUP_KEYS else 'float64')
+         for key in names], names=names)
+    return frame
+
+
+def _group_moments(values, keys, names):
+    grouped = values.groupby(keys, observed=True)
+    count = grouped.count().astype('float64')
+    moments = _moments_frame({
+        'count': count,
+        'mean': grouped.mean(),
+        'm2': grouped.var(ddof=0) * count,
+        'min': grouped.min(),
+        'max': grouped.max(),
+    })
+    moments.index.names = names
+    return _plain_index(moments)
+
+
+def _grid_cells(chunk):
+    # Số ô của grid mỗi dòng; file cũ (không có Rows/Cols) là grid 25×50
+    rows = chunk['Rows'] if 'Rows' in chunk else pd.Series(np.nan, index=chunk.index)
+    cols = chunk['Cols'] if 'Cols' in chunk else pd.Series(np.nan, index=chunk.index)
+    return (rows.fillna(LEGACY_GRID_SIZE[0]) * cols.fillna(LEGACY_GRID_SIZE[1])).astype('float64')
+
+
+def summarize_chunk(chunk):
+    """Tính thống kê một chunk (số lượng dòng bị giới hạn) thành Aggregates."""
+    success = chunk['Path_Found'].eq('Yes').fillna(False).to_numpy(dtype=bool)
+    keys = [chunk[key] for key in GROUP_KEYS]
+
+    runs = pd.Series(success, index=chunk.index).groupby(keys, observed=True).agg(['size', 'sum'])
+    runs = runs.astype('float64')
+    runs.columns = ['tests', 'successes']
+    runs.index.names = GROUP_KEYS
+    _plain_index(runs)
+
+    moments = _group_moments(chunk.loc[success, MEASURES], [key[success] for key in keys], GROUP_KEYS)
+    scaling = _group_moments(chunk.loc[success, SCALING_MEASURES],
+                             [chunk['Algorithm_Name'][success], _grid_cells(chunk)[success]], SIZE_KEYS)
+
+    params = chunk[['Algorithm_Name', 'metric', 'weight']].drop_duplicates('Algorithm_Name')
+    params = params.astype({'Algorithm_Name': 'string', 'metric': object}).set_index('Algorithm_Name')
+    return Aggregates(runs, moments, params, scaling)
+
+
+def iter_chunks(path, chunksize=CHUNK_SIZE, columns=CSV_COLUMNS):
+    """Đọc file CSV kết quả theo từng chunk bằng C parser, kèm cột metric/weight đã parse.
+
+    Cột trong `columns` mà file không có (file cũ) được bỏ qua.
+    """
+    wanted = set(columns)
+    source = _open_csv(path)
+    try:
+        reader = pd.read_csv(source, usecols=lambda column: column in wanted, dtype=CSV_DTYPES,
+                             chunksize=chunksize, engine='c')
+        for chunk in reader:
+            chunk = chunk.reindex(columns=chunk.columns.union(COUNTER_MEASURES, sort=False))
+            yield chunk.join(parse_parameters(chunk['Parameters']))
+    finally:
+        if hasattr(source, 'close'):
+            source.close()
+
+
+# File nhị phân dạng cột (.pfcol) do runFullBenchmark.mjs ghi cạnh file CSV
+COLUMNAR_MAGIC = b'PFCOLV1\n'
+COLUMNAR_SUFFIX = '.pfcol'
+
+
+def open_columnar(path):
+    """Memory-map file .pfcol, trả về (số dòng, dict cột -> mảng NumPy, dictionaries).
+
+    Các mảng là view trực tiếp lên file (zero-copy), không parse text.
+    """
+    raw = np.memmap(path, dtype=np.uint8, mode='r')
+    if bytes(raw[:len(COLUMNAR_MAGIC)]) != COLUMNAR_MAGIC:
+        raise ValueError(f"{path} không phải file columnar (.pfcol)")
+    start = len(COLUMNAR_MAGIC)
+    header_length = int(raw[start:start + 4].view('<u4')[0])
+    header = json.loads(bytes(raw[start + 4:start + 4 + header_length]))
+    rows = header['rows']
+    columns = {}
+    for column in header['columns']:
+        dtype = np.dtype(column['dtype'])
+        offset = column['offset']
+        width = column.get('width', 1)
+        values = raw[offset:offset + rows * width * dtype.itemsize].view(dtype)
+        columns[column['name']] = values.reshape(rows, width) if 'width' in column else values
+    return rows, columns, header['dictionaries']
+
+
+def iter_columnar_chunks(path, chunksize=CHUNK_SIZE):
+    """Đọc file .pfcol theo chunk, cùng schema với iter_chunks (cột chuỗi là Categorical)."""
+    rows, columns, dictionaries = open_columnar(path)
+    categories = {name: pd.Index(values) for name, values in dictionaries.items()}
+    found = pd.Index(['No', 'Yes'])
+    for begin in range(0, rows, chunksize):
+        window = slice(begin, min(begin + chunksize, rows))
+        chunk = {
+            key: pd.Categorical.from_codes(columns[key][window], categories[key])
+            for key in GROUP_KEYS
+        }
+        chunk['metric'] = np.asarray(categories['metric'], dtype=object)[columns['metric'][window]]
+        chunk['weight'] = columns['weight'][window]
+        chunk['Path_Found'] = pd.Categorical.from_codes(columns['Path_Found'][window], found)
+        for key in ('Rows', 'Cols'):
+            if key in columns:
+                chunk[key] = columns[key][window]
+        for measure in MEASURES:
+            chunk[measure] = columns[measure][window] if measure in columns else np.nan
+        yield pd.DataFrame(chunk)
+
+
+def aggregate_file(path, chunksize=CHUNK_SIZE):
+    """Đọc cả file (CSV hoặc .pfcol) theo chunk và gộp thành Aggregates.
+
+    Bộ nhớ không phụ thuộc kích thước file.
+    """
+    path = Path(path)
+    chunks = iter_columnar_chunks if path.suffix == COLUMNAR_SUFFIX else iter_chunks
+    aggregates = Aggregates.empty()
+    for chunk in chunks(path, chunksize):
+        aggregates = aggregates.merge(summarize_chunk(chunk))
+    return aggregates
+
+
+# ============================================================================
+# SO SÁNH HAI LẦN CHẠY - Bootstrap CI cho tỉ lệ median, chặn regression trên CI
+# ============================================================================
+COMPARE_KEYS = ['Map_ID', 'Algorithm_Name', 'Parameters']
+COMPARE_MEASURES = ['Execution_Time_ms', 'Nodes_Visited', 'Memory_Usage_Nodes']
+SAMPLES_COLUMN = 'Execution_Time_Samples_ms'
+# Giới hạn số phần tử của một batch bootstrap để bộ nhớ không phụ thuộc số resample
+BOOTSTRAP_BATCH_ELEMENTS = 20_000_000
+
+
+def load_cases(path, measures=COMPARE_MEASURES):
+    """Đọc kết quả từng test (đã thành công) của một lần chạy để so sánh.
+
+    `path` là file .csv/.pfcol hoặc thư mục (dùng file mới nhất trong đó).
+    Trả về (bảng index COMPARE_KEYS với các cột `measures`, mảng samples
+    thời gian shape (n, k)); file cũ không có samples thì k = 1.
+    """
+    path = Path(path)
+    if path.is_dir():
+        files = find_result_files(path)
+        if not files:
+            raise FileNotFoundError(f"Không có file kết quả trong {path}")
+        path = files[-1]
+
+    if path.suffix == COLUMNAR_SUFFIX:
+        rows, columns, dictionaries = open_columnar(path)
+        frame = pd.DataFrame({
+            key: np.asarray(dictionaries[key], dtype=object)[columns[key]] for key in COMPARE_KEYS
+        })
+        for measure in measures:
+            frame[measure] = columns[measure]
+        frame['Path_Found'] = columns['Path_Found'] == 1
+        samples = columns.get(SAMPLES_COLUMN)
+        samples = np.asarray(samples if samples is not None else columns['Execution_Time_ms'][:, None],
+                             dtype='float64')
+    else:
+        wanted = COMPARE_KEYS + list(measures) + ['Execution_Time_ms', 'Path_Found', SAMPLES_COLUMN]
+        frame = pd.concat(chunk.drop(columns=['metric', 'weight'])
+                          for chunk in iter_chunks(path, columns=wanted))
+        frame = frame.reset_index(drop=True)
+        frame['Path_Found'] = frame['Path_Found'].eq('Yes').fillna(False).astype(bool)
+        if SAMPLES_COLUMN in frame:
+            samples = (frame.pop(SAMPLES_COLUMN).astype('string')
+                       .str.split(';', expand=True).astype('float64').to_numpy())
+        else:
+            samples = frame['Execution_Time_ms'].to_numpy(dtype='float64')[:, None]
+
+    keep = frame['Path_Found'].to_numpy() & ~frame.duplicated(COMPARE_KEYS, keep='last').to_numpy()
+    frame = frame.loc[keep, COMPARE_KEYS + list(measures)].astype({key: str for key in COMPARE_KEYS})
+    return frame.set_index(COMPARE_KEYS), samples[keep]
+
+
+def bootstrap_median_ratio(base, new, resamples=2000, confidence=0.95, rng=None):
+    """Tỉ lệ median new/base qua các test, kèm khoảng tin cậy bootstrap.
+
+    base, new: mảng (n_cases, k) các lần đo của cùng n test. Mỗi lần bootstrap
+    lấy lại các test (có hoàn lại) và các lần đo trong từng test, tính median
+    từng test rồi median của tỉ lệ - toàn bộ được vector hoá theo batch.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n, kb = base.shape
+    kn = new.shape[1]
+    with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+        # nanmedian cảnh báo khi cả hàng là NaN (test bị bỏ qua) - kết quả NaN là đúng
+        warnings.simplefilter('ignore', RuntimeWarning)
+        point = np.median(np.nanmedian(new, axis=1) / np.nanmedian(base, axis=1))
+        batch = max(1, BOOTSTRAP_BATCH_ELEMENTS // (n * max(kb, kn)))
+        estimates = []
+        for start in range(0, resamples, batch):
+            size = min(batch, resamples - start)
+            cases = rng.integers(0, n, (size, n))[..., None]
+            base_sample = base[cases, rng.integers(0, kb, (size, n, kb))]
+            new_sample = new[cases, rng.integers(0, kn, (size, n, kn))]
+            ratio = np.nanmedian(new_sample, axis=2) / np.nanmedian(base_sample, axis=2)
+            estimates.append(np.nanmedian(ratio, axis=1))
+    alpha = (1 - confidence) / 2
+    low, high = np.nanquantile(np.concatenate(estimates), [alpha, 1 - alpha])
+    return point, low, high
+
+
+def compare_runs(base_path, new_path, resamples=2000, confidence=0.95, min_effect=0.0, seed=0):
+    """So sánh hai lần chạy theo (Map_ID, Algorithm_Name, Parameters).
+
+    Trả về bảng theo (Algorithm_Name, measure) với tỉ lệ median new/base, CI và
+    cờ 'regression' khi cận dưới của CI > 1 + min_effect.
+    """
+    base, base_samples = load_cases(base_path)
+    new, new_samples = load_cases(new_path)
+    common = base.index.intersection(new.index)
+    base_pos = base.index.get_indexer(common)
+    new_pos = new.index.get_indexer(common)
+    algorithms = common.get_level_values('Algorithm_Name')
+    rng = np.random.default_rng(seed)
+
+    rows = []
+    for algo in algorithms.unique():
+        mask = np.asarray(algorithms == algo)
+        b_pos, n_pos = base_pos[mask], new_pos[mask]
+        for measure in COMPARE_MEASURES:
+            if measure == 'Execution_Time_ms':
+                b, n = base_samples[b_pos], new_samples[n_pos]
+            else:
+                b = base[measure].to_numpy(dtype='float64')[b_pos, None]
+                n = new[measure].to_numpy(dtype='float64')[n_pos, None]
+            # Bỏ test có giá trị base = 0 (thời gian làm tròn về 0) để tỉ lệ xác định
+            valid = np.nanmedian(b, axis=1) > 0
+            if not valid.any():
+                continue
+            point, low, high = bootstrap_median_ratio(b[valid], n[valid], resamples, confidence, rng)
+            rows.append({
+                'Algorithm_Name': algo, 'measure': measure, 'cases': int(valid.sum()),
+                'ratio': point, 'ci_low': low, 'ci_high': high,
+                'regression': bool(low > 1 + min_effect),
+                'improvement': bool(high < 1 - min_effect),
+            })
+    return pd.DataFrame(rows, columns=['Algorithm_Name', 'measure', 'cases', 'ratio', 'ci_low',
+                                       'ci_high', 'regression', 'improvement'])
+
+
+def parse_compare_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='analyze_results.py compare',
+        description='So sánh hai lần chạy benchmark, exit 1 nếu có regression có ý nghĩa thống kê')
+    parser.add_argument('base', type=Path, help='kết quả gốc (file hoặc thư mục)')
+    parser.add_argument('new', type=Path, help='kết quả mới (file hoặc thư mục)')
+    parser.add_argument('--resamples', type=int, default=2000, help='số lần bootstrap')
+    parser.add_argument('--confidence', type=float, default=0.95, help='mức tin cậy của CI')
+    parser.add_argument('--min-effect', type=float, default=0.0,
+                        help='chỉ báo regression khi cận dưới CI > 1 + min_effect (vd. 0.05 = 5%%)')
+    parser.add_argument('--seed', type=int, default=0, help='seed cho bootstrap (kết quả lặp lại được)')
+    parser.add_argument('--json', action='store_true', help='in kết quả dạng JSON')
+    return parser.parse_args(argv)
+
+
+def compare_main(argv=None):
+    args = parse_compare_args(argv)
+    result = compare_runs(args.base, args.new, args.resamples, args.confidence,
+                          args.min_effect, args.seed)
+    regressions = result[result['regression']]
+    if args.json:
+        print(result.to_json(orient='records', indent=2))
+    else:
+        print("\n" + "="*80)
+        print(f"🔍 SO SÁNH: {args.base} → {args.new}  (CI {args.confidence:.0%}, tỉ lệ median new/base)")
+        print("="*80)
+        print(result.to_string(index=False, float_format=lambda x: f'{x:.4f}'))
+        print("="*80)
+        if len(regressions):
+            print(f"❌ {len(regressions)} regression có ý nghĩa thống kê:")
+            for row in regressions.itertuples():
+                print(f"   - {row.Algorithm_Name} / {row.measure}: ×{row.ratio:.3f} "
+                      f"[{row.ci_low:.3f}, {row.ci_high:.3f}]")
+        else:
+            print("✅ Không có regression có ý nghĩa thống kê")
+    return 1 if len(regressions) else 0
+
+
+# ============================================================================
+# KIỂM CHỨNG - Chạy lại các map của bản JS bằng engine NumPy (grid_engine.py)
+# ============================================================================
+VALIDATE_MEASURES = ['Path_Length', 'Nodes_Visited', 'Memory_Usage_Nodes']
+MAPS_PREFIX = 'benchmark_FULL_maps_'
+
+
+def maps_file_for(results_path):
+    """File map cùng timestamp với file kết quả benchmark_FULL_results_<ts>.*"""
+    results_path = Path(results_path)
+    timestamp = results_path.stem.replace('benchmark_FULL_results_', '', 1)
+    return results_path.with_name(f'{MAPS_PREFIX}{timestamp}.json')
+
+
+def validate_run(results_path, maps_path=None):
+    """So sánh từng test của bản JS với engine tham chiếu trên cùng map.
+
+    Chỉ các thuật toán engine hỗ trợ (Dijkstra, BFS, A*, Greedy) được so sánh.
+    Trả về bảng các test, cột '<measure>_js' / '<measure>_engine' và 'match'.
+    """
+    import grid_engine
+
+    results_path = Path(results_path)
+    if results_path.is_dir():
+        files = find_result_files(results_path)
+        if not files:
+            raise FileNotFoundError(f"Không có file kết quả trong {results_path}")
+        results_path = files[-1]
+    maps_path = Path(maps_path) if maps_path else maps_file_for(results_path)
+
+    js, _ = load_cases(results_path, VALIDATE_MEASURES)
+    engine = pd.DataFrame(grid_engine.run_maps(grid_engine.load_maps(maps_path)))
+    engine = (engine[engine['Path_Found'] == 'Yes']
+              .set_index(COMPARE_KEYS)[VALIDATE_MEASURES])
+    table = js.join(engine, how='inner', lsuffix='_js', rsuffix='_engine')
+    table['match'] = np.logical_and.reduce([
+        table[f'{m}_js'].to_numpy() == table[f'{m}_engine'].to_numpy() for m in VALIDATE_MEASURES
+    ])
+    return table
+
+
+def validate_main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='analyze_results.py validate',
+        description='Kiểm chứng kết quả JS bằng engine NumPy, exit 1 nếu có test không khớp')
+    parser.add_argument('results', type=Path, help='kết quả JS (file hoặc thư mục)')
+    parser.add_argument('--maps', type=Path, default=None,
+                        help='file benchmark_FULL_maps_*.json (mặc định: cùng timestamp)')
+    args = parser.parse_args(argv)
+
+    table = validate_run(args.results, args.maps)
+    mismatches = table[~table['match']]
+    print(f"🔬 Kiểm chứng {len(table)} tests trên {table.index.unique('Map_ID').size} maps")
+    if len(mismatches):
+        print(f"❌ {len(mismatches)} tests không khớp:")
+        print(mismatches.drop(columns='match').to_string())
+        return 1
+    print(f"✅ {', '.join(VALIDATE_MEASURES)} khớp với engine tham chiếu")
+    return 0
+
+
+# ============================================================================
+# THƯ MỤC KẾT QUẢ - Cache thống kê từng file, chỉ parse file mới/đã thay đổi
+# ============================================================================
+BENCHMARK_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BENCHMARK_DIR / 'results'
+RESULTS_PATTERN = 'benchmark_FULL_results_*'
+CACHE_NAME = '.analysis_cache.pkl'
+CACHE_VERSION = 3
+
+
+def find_result_files(results_dir):
+    """Liệt kê các file kết quả trong thư mục, ưu tiên .pfcol nếu lần chạy có cả .csv."""
+    runs = {}
+    for path in sorted(Path(results_dir).glob(RESULTS_PATTERN)):
+        if path.suffix == COLUMNAR_SUFFIX or (path.suffix == '.csv' and path.stem not in runs):
+            runs[path.stem] = path
+    return list(runs.values())
+
 
-# Đọc dữ liệu với Python engine để xử lý JSON trong quotes
-csv_file = 'results/benchmark_FULL_results_2026-01-05T14-17-56.csv'
-df = pd.read_csv(csv_file, engine='python', quoting=1)  # QUOTE_ALL = 1
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+        return {}
+    return cache['files']
 
-# Lọc chỉ lấy các test thành công
-df_success = df[df['Path_Found'] == 'Yes'].copy()
 
-# Tạo thư mục cho charts
-charts_dir = Path('charts')
-charts_dir.mkdir(exist_ok=True)
+def _save_cache(cache_path, files):
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'version': CACHE_VERSION, 'files': files}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+
+def aggregate_directory(results_dir, cache_path=None):
+    """Gộp thống kê của mọi file kết quả trong thư mục.
+
+    Thống kê từng file được cache theo (đường dẫn, kích thước, mtime): chỉ file
+    mới hoặc đã thay đổi mới phải đọc lại, sau đó gộp với các phần đã cache.
+    """
+    results_dir = Path(results_dir)
+    cache_path = Path(cache_path) if cache_path else results_dir / CACHE_NAME
+    cached = _load_cache(cache_path)
+    files = {}
+    aggregates = Aggregates.empty()
+    for path in find_result_files(results_dir):
+        stat = path.stat()
+        key = str(path.resolve())
+        signature = (stat.st_size, stat.st_mtime_ns)
+        entry = cached.get(key)
+        if entry is None or entry['signature'] != signature:
+            print(f"📥 Đọc file mới: {path.name}", file=sys.stderr)
+            entry = {'signature': signature, 'aggregates': aggregate_file(path)}
+        files[key] = entry
+        aggregates = aggregates.merge(entry['aggregates'])
+    if files.keys() != cached.keys() or any(files[k] is not cached[k] for k in files):
+        _save_cache(cache_path, files)
+    return aggregates
+
+
+def aggregate_results(path):
+    """Đọc một file kết quả hoặc cả thư mục kết quả (có cache)."""
+    path = Path(path)
+    return aggregate_directory(path) if path.is_dir() else aggregate_file(path)
+
+
+def finalize_moments(moments):
+    """Đổi moments thành bảng (measure, stat) với stat = count/mean/std/min/max."""
+    count = moments['count']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std = np.sqrt(moments['m2'] / (count - 1)).where(count > 1)
+    table = _moments_frame({
+        'count': count, 'mean': moments['mean'], 'std': std,
+        'min': moments['min'], 'max': moments['max'],
+    })
+    return table.swaplevel(axis=1).sort_index(axis=1, level='measure', sort_remaining=False)
+
+
+def collapse_moments(moments, level):
+    """Gộp moments theo một level của index (vd. bỏ Map_Type để có thống kê theo thuật toán)."""
+    count = moments['count'].fillna(0)
+    total = count.groupby(level=level).sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = (moments['mean'].fillna(0) * count).groupby(level=level).sum() / total
+        broadcast = mean.reindex(moments.index.get_level_values(level))
+        broadcast.index = moments.index
+        spread = moments['m2'].fillna(0) + count * (moments['mean'] - broadcast) ** 2
+        m2 = spread.fillna(0).groupby(level=level).sum()
+    return _moments_frame({
+        'count': total,
+        'mean': mean.where(total > 0),
+        'm2': m2.where(total > 0),
+        'min': moments['min'].groupby(level=level).min(),
+        'max': moments['max'].groupby(level=level).max(),
+    })
+
+
+# ============================================================================
+# ĐỘ PHỨC TẠP THEO KÍCH THƯỚC GRID - Fit log-log và điểm cắt giữa các thuật toán
+# ============================================================================
+# Chỉ báo điểm cắt tới tối đa (hệ số này × kích thước lớn nhất đã đo)
+MAX_EXTRAPOLATION = 100
+
+
+def fit_scaling(scaling, measures=SCALING_MEASURES):
+    """Fit measure ≈ coefficient · cells^exponent (hồi quy log-log) cho từng thuật toán.
+
+    `scaling` là Aggregates.scaling; fit trên giá trị trung bình mỗi kích thước,
+    chỉ thuật toán đã chạy trên ít nhất 2 kích thước grid mới được fit.
+    """
+    rows = []
+    mean = scaling['mean']
+    for algo, table in mean.groupby(level='Algorithm_Name'):
+        cells = table.index.get_level_values('Cells').to_numpy(dtype='float64')
+        for measure in measures:
+            values = table[measure].to_numpy(dtype='float64')
+            ok = np.isfinite(values) & (values > 0)
+            if np.unique(cells[ok]).size < 2:
+                continue
+            x, y = np.log(cells[ok]), np.log(values[ok])
+            exponent, intercept = np.polyfit(x, y, 1)
+            residual = ((y - (exponent * x + intercept)) ** 2).sum()
+            total = ((y - y.mean()) ** 2).sum()
+            rows.append({
+                'Algorithm_Name': algo, 'measure': measure, 'sizes': int(ok.sum()),
+                'min_cells': cells[ok].min(), 'max_cells': cells[ok].max(),
+                'exponent': exponent, 'coefficient': np.exp(intercept),
+                'r2': 1 - residual / total if total > 0 else 1.0,
+            })
+    columns = ['Algorithm_Name', 'measure', 'sizes', 'min_cells', 'max_cells',
+               'exponent', 'coefficient', 'r2']
+    return pd.DataFrame(rows, columns=columns).set_index(['Algorithm_Name', 'measure'])
+
+
+def scaling_crossovers(fits, max_extrapolation=MAX_EXTRAPOLATION):
+    """Số ô mà đường fit của hai thuật toán (cùng measure) cắt nhau.
+
+    Chỉ giữ điểm cắt nằm từ kích thước nhỏ nhất đã đo tới max_extrapolation lần
+    kích thước lớn nhất; 'better_above' là thuật toán có giá trị nhỏ hơn khi
+    grid lớn hơn điểm cắt, 'extrapolated' đánh dấu điểm cắt ngoài vùng đã đo.
+    """
+    rows = []
+    for measure, table in fits.groupby(level='measure'):
+        names = table.index.get_level_values('Algorithm_Name').to_numpy()
+        exponent = table['exponent'].to_numpy()
+        intercept = np.log(table['coefficient'].to_numpy())
+        min_cells = table['min_cells'].to_numpy()
+        max_cells = table['max_cells'].to_numpy()
+        a, b = np.triu_indices(len(names), k=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_cells = (intercept[b] - intercept[a]) / (exponent[a] - exponent[b])
+        measured = np.minimum(max_cells[a], max_cells[b])
+        keep = (np.isfinite(log_cells)
+                & (log_cells >= np.log(np.maximum(min_cells[a], min_cells[b])))
+                & (log_cells <= np.log(measured * max_extrapolation)))
+        for i, j, crossing, limit in zip(a[keep], b[keep], np.exp(log_cells[keep]), measured[keep]):
+            above, below = (i, j) if exponent[i] < exponent[j] else (j, i)
+            rows.append({
+                'measure': measure, 'crossover_cells': crossing,
+                'better_below': names[below], 'better_above': names[above],
+                'extrapolated': bool(crossing > limit),
+            })
+    columns = ['measure', 'crossover_cells', 'better_below', 'better_above', 'extrapolated']
+    return pd.DataFrame(rows, columns=columns).sort_values(['measure', 'crossover_cells'],
+                                                           ignore_index=True)
+
+
+def scaling_main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='analyze_results.py scaling',
+        description='Fit độ phức tạp theo số ô của grid (chạy benchmark với --sweep)')
+    parser.add_argument('input', nargs='?', type=Path, default=RESULTS_DIR,
+                        help='file kết quả hoặc thư mục chứa các file kết quả')
+    parser.add_argument('--measure', choices=SCALING_MEASURES, action='append',
+                        help='chỉ fit measure này (lặp lại được; mặc định: tất cả)')
+    parser.add_argument('--json', action='store_true', help='in kết quả dạng JSON')
+    args = parser.parse_args(argv)
+
+    fits = fit_scaling(aggregate_results(args.input).scaling, args.measure or SCALING_MEASURES)
+    if fits.empty:
+        print("⚠️  Cần kết quả trên ít nhất 2 kích thước grid (node runFullBenchmark.mjs --sweep)",
+              file=sys.stderr)
+        return 1
+    crossovers = scaling_crossovers(fits)
+    if args.json:
+        print(json.dumps({
+            'fits': json.loads(fits.reset_index().to_json(orient='records')),
+            'crossovers': json.loads(crossovers.to_json(orient='records')),
+        }, indent=2, ensure_ascii=False))
+        return 0
+
+    print("\n" + "="*80)
+    print("📈 SỐ MŨ FIT LOG-LOG (measure ∝ cells^exponent)")
+    print("="*80)
+    print(fits['exponent'].unstack('measure').round(3).to_string())
+    print("\nR² thấp nhất: " + ", ".join(
+        f"{measure} {value:.3f}" for measure, value in fits['r2'].groupby(level='measure').min().items()))
+    print("\n" + "="*80)
+    print(f"✂️  ĐIỂM CẮT (tới {MAX_EXTRAPOLATION}× kích thước lớn nhất đã đo)")
+    print("="*80)
+    if crossovers.empty:
+        print("Không có điểm cắt trong khoảng này")
+    else:
+        print(crossovers.to_string(index=False, formatters={'crossover_cells': '{:,.0f}'.format}))
+    return 0
 
-print(f"📊 Đọc được {len(df)} tests, {len(df_success)} tests thành công")
-print(f"🎯 Các thuật toán: {df_success['Algorithm_Name'].unique()}")
-print(f"🗺️  Các loại map: {df_success['Map_Type'].unique()}")
+
+# ============================================================================
+# CUBE THỐNG KÊ - Tính một lần, mọi biểu đồ/bảng chỉ tra cứu
+# ============================================================================
+ALL_MAPS = 'All'
+CUBE_LEVELS = ['family', 'Algorithm_Name', 'metric', 'weight', 'Map_Type']
+
+
+def algorithm_family(name):
+    """Họ thuật toán từ tên hiển thị: 'A* (w=1, manhattan)' -> 'A*'."""
+    return name.split(' (')[0]
+
+
+def build_cube(aggregates):
+    """Cube thống kê: thuật toán × loại map × metric × weight × thống kê.
+
+    Index theo CUBE_LEVELS; Map_Type == ALL_MAPS là thống kê gộp mọi loại map.
+    Cột MultiIndex (measure, stat) với stat = count/mean/std/min/max, cộng thêm
+    ('Success_Rate', 'mean') tính theo phần trăm.
+    """
+    per_map = finalize_moments(aggregates.moments)
+    overall = finalize_moments(collapse_moments(aggregates.moments, 'Algorithm_Name'))
+    overall.index = pd.MultiIndex.from_arrays(
+        [overall.index, [ALL_MAPS] * len(overall)], names=GROUP_KEYS)
+    runs = aggregates.runs
+    runs_all = runs.groupby(level='Algorithm_Name').sum()
+    runs_all.index = pd.MultiIndex.from_arrays(
+        [runs_all.index, [ALL_MAPS] * len(runs_all)], names=GROUP_KEYS)
+    runs = pd.concat([runs, runs_all])
+
+    table = pd.concat([per_map, overall]).reindex(runs.index)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table[('Success_Rate', 'mean')] = runs['successes'] / runs['tests'] * 100
+
+    algorithms = table.index.get_level_values('Algorithm_Name')
+    params = aggregates.params.reindex(algorithms)
+    table.index = pd.MultiIndex.from_arrays([
+        [algorithm_family(name) for name in algorithms],
+        algorithms,
+        params['metric'].fillna('').to_numpy(),
+        params['weight'].to_numpy(),
+        table.index.get_level_values('Map_Type'),
+    ], names=CUBE_LEVELS)
+    return table.sort_index()
+
+
+def cube_select(family=None, algorithms=None, map_type=ALL_MAPS):
+    """Lát cắt của cube theo họ thuật toán/danh sách thuật toán, index Algorithm_Name."""
+    table = cube[cube.index.get_level_values('Map_Type') == map_type]
+    if family is not None:
+        table = table[table.index.get_level_values('family') == family]
+    table = table.droplevel(['family', 'metric', 'weight', 'Map_Type'])
+    if algorithms is not None:
+        table = table.reindex([algo for algo in algorithms if algo in table.index])
+    return table
+
+
+def cube_pivot(measure, stat='mean', algorithms=None):
+    """Bảng measure/stat: index Algorithm_Name, cột Map_Type (không gồm ALL_MAPS)."""
+    table = cube[cube.index.get_level_values('Map_Type') != ALL_MAPS][(measure, stat)]
+    table = table.droplevel(['family', 'metric', 'weight']).unstack('Map_Type')
+    if algorithms is not None:
+        table = table.reindex([algo for algo in algorithms if algo in table.index])
+    return table
+
+
+# Cube và thư mục charts được gán trong main() (hoặc _init_worker ở process con)
+cube = None
+charts_dir = BENCHMARK_DIR / 'charts'
+
+# ============================================================================
+# LƯU BIỂU ĐỒ - Chế độ đầy đủ / nháp / vector
+# ============================================================================
+RENDER_MODES = {
+    'full': {'dpi': 300, 'bbox_inches': 'tight'},
+    'draft': {'dpi': 72, 'bbox_inches': None},
+}
+render_options = {'format': 'png', **RENDER_MODES['full']}
+
+
+def save_figure(name):
+    """Lưu figure hiện tại theo render_options rồi đóng lại."""
+    filename = f"{name}.{render_options['format']}"
+    plt.savefig(charts_dir / filename, format=render_options['format'],
+                dpi=render_options['dpi'], bbox_inches=render_options['bbox_inches'])
+    print(f"✅ Saved: {filename}")
+    plt.close()
 
 # ============================================================================
 # BIỂU ĐỒ 1: So sánh Nodes Visited - Trung bình theo thuật toán
@@ -36,7 +853,7 @@ def plot_average_nodes_visited():
     plt.figure(figsize=(16, 8))
     
     # Tính trung bình nodes visited cho mỗi thuật toán
-    avg_nodes = df_success.groupby('Algorithm_Name')['Nodes_Visited'].agg(['mean', 'std']).reset_index()
+    avg_nodes = cube_select()['Nodes_Visited'][['mean', 'std']].reset_index()
     avg_nodes = avg_nodes.sort_values('mean', ascending=True)
     
     # Vẽ bar chart
@@ -55,9 +872,7 @@ def plot_average_nodes_visited():
               fontsize=14, fontweight='bold', pad=20)
     plt.grid(axis='x', alpha=0.3)
     plt.tight_layout()
-    plt.savefig(charts_dir / '01_nodes_visited_comparison.png', dpi=300, bbox_inches='tight')
-    print("✅ Saved: 01_nodes_visited_comparison.png")
-    plt.close()
+    save_figure('01_nodes_visited_comparison')
 
 # ============================================================================
 # BIỂU ĐỒ 2: So sánh Execution Time
@@ -65,7 +880,7 @@ def plot_average_nodes_visited():
 def plot_execution_time():
     plt.figure(figsize=(16, 8))
     
-    avg_time = df_success.groupby('Algorithm_Name')['Execution_Time_ms'].agg(['mean', 'std']).reset_index()
+    avg_time = cube_select()['Execution_Time_ms'][['mean', 'std']].reset_index()
     avg_time = avg_time.sort_values('mean', ascending=True)
     
     colors = sns.color_palette("viridis", len(avg_time))
@@ -82,9 +897,7 @@ def plot_execution_time():
               fontsize=14, fontweight='bold', pad=20)
     plt.grid(axis='x', alpha=0.3)
     plt.tight_layout()
-    plt.savefig(charts_dir / '02_execution_time_comparison.png', dpi=300, bbox_inches='tight')
-    print("✅ Saved: 02_execution_time_comparison.png")
-    plt.close()
+    save_figure('02_execution_time_comparison')
 
 # ============================================================================
 # BIỂU ĐỒ 3: So sánh Path Length (Optimal)
@@ -93,7 +906,7 @@ def plot_path_optimality():
     plt.figure(figsize=(16, 8))
     
     # Tính path length trung bình
-    avg_path = df_success.groupby('Algorithm_Name')['Path_Length'].agg(['mean', 'std']).reset_index()
+    avg_path = cube_select()['Path_Length'][['mean', 'std']].reset_index()
     avg_path = avg_path.sort_values('mean', ascending=True)
     
     colors = sns.color_palette("coolwarm", len(avg_path))
@@ -110,9 +923,7 @@ def plot_path_optimality():
               fontsize=14, fontweight='bold', pad=20)
     plt.grid(axis='x', alpha=0.3)
     plt.tight_layout()
-    plt.savefig(charts_dir / '03_path_length_comparison.png', dpi=300, bbox_inches='tight')
-    print("✅ Saved: 03_path_length_comparison.png")
-    plt.close()
+    save_figure('03_path_length_comparison')
 
 # ============================================================================
 # BIỂU ĐỒ 4: So sánh Memory Usage
@@ -120,7 +931,7 @@ def plot_path_optimality():
 def plot_memory_usage():
     plt.figure(figsize=(16, 8))
     
-    avg_memory = df_success.groupby('Algorithm_Name')['Memory_Usage_Nodes'].agg(['mean', 'std']).reset_index()
+    avg_memory = cube_select()['Memory_Usage_Nodes'][['mean', 'std']].reset_index()
     avg_memory = avg_memory.sort_values('mean', ascending=True)
     
     colors = sns.color_palette("mako", len(avg_memory))
@@ -137,16 +948,14 @@ def plot_memory_usage():
               fontsize=14, fontweight='bold', pad=20)
     plt.grid(axis='x', alpha=0.3)
     plt.tight_layout()
-    plt.savefig(charts_dir / '04_memory_usage_comparison.png', dpi=300, bbox_inches='tight')
-    print("✅ Saved: 04_memory_usage_comparison.png")
-    plt.close()
+    save_figure('04_memory_usage_comparison')
 
 # ============================================================================
 # BIỂU ĐỒ 5: Phân tích A* theo Weight và Metric
 # ============================================================================
 def plot_astar_analysis():
     # Lọc chỉ các thuật toán A*
-    astar_df = df_success[df_success['Algorithm_Name'].str.contains('A\\*', regex=True)].copy()
+    astar_stats = cube_select(family='A*').xs('mean', axis=1, level='stat')
     
     fig, axes = plt.subplots(2, 2, figsize=(16, 12))
     fig.suptitle('Phân tích chi tiết A* - Ảnh hưởng của Weight và Metric', 
@@ -154,7 +963,7 @@ def plot_astar_analysis():
     
     # Chart 1: Nodes Visited by Weight
     ax1 = axes[0, 0]
-    astar_weight = astar_df.groupby('Algorithm_Name')['Nodes_Visited'].mean().sort_values()
+    astar_weight = astar_stats['Nodes_Visited'].sort_values()
     colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DFE6E9']
     astar_weight.plot(kind='bar', ax=ax1, color=colors, alpha=0.8)
     ax1.set_title('Nodes Visited theo Weight', fontsize=12, fontweight='bold')
@@ -165,7 +974,7 @@ def plot_astar_analysis():
     
     # Chart 2: Execution Time by Weight
     ax2 = axes[0, 1]
-    astar_time = astar_df.groupby('Algorithm_Name')['Execution_Time_ms'].mean().sort_values()
+    astar_time = astar_stats['Execution_Time_ms'].sort_values()
     astar_time.plot(kind='bar', ax=ax2, color=colors, alpha=0.8)
     ax2.set_title('Execution Time theo Weight', fontsize=12, fontweight='bold')
     ax2.set_ylabel('Time (ms, Avg)', fontsize=11)
@@ -175,7 +984,7 @@ def plot_astar_analysis():
     
     # Chart 3: Path Length by Weight
     ax3 = axes[1, 0]
-    astar_path = astar_df.groupby('Algorithm_Name')['Path_Length'].mean().sort_values()
+    astar_path = astar_stats['Path_Length'].sort_values()
     astar_path.plot(kind='bar', ax=ax3, color=colors, alpha=0.8)
     ax3.set_title('Path Length (Optimality)', fontsize=12, fontweight='bold')
     ax3.set_ylabel('Path Length (Avg)', fontsize=11)
@@ -185,7 +994,7 @@ def plot_astar_analysis():
     
     # Chart 4: Memory Usage by Weight
     ax4 = axes[1, 1]
-    astar_memory = astar_df.groupby('Algorithm_Name')['Memory_Usage_Nodes'].mean().sort_values()
+    astar_memory = astar_stats['Memory_Usage_Nodes'].sort_values()
     astar_memory.plot(kind='bar', ax=ax4, color=colors, alpha=0.8)
     ax4.set_title('Memory Usage', fontsize=12, fontweight='bold')
     ax4.set_ylabel('Memory (Nodes, Avg)', fontsize=11)
@@ -194,9 +1003,7 @@ def plot_astar_analysis():
     ax4.tick_params(axis='x', rotation=45)
     
     plt.tight_layout()
-    plt.savefig(charts_dir / '05_astar_detailed_analysis.png', dpi=300, bbox_inches='tight')
-    print("✅ Saved: 05_astar_detailed_analysis.png")
-    plt.close()
+    save_figure('05_astar_detailed_analysis')
 
 # ============================================================================
 # BIỂU ĐỒ 6: So sánh theo loại Map
@@ -206,15 +1013,11 @@ def plot_map_type_analysis():
     fig.suptitle('Phân tích theo Loại Map', fontsize=16, fontweight='bold')
     
     # Lấy top 5 thuật toán tốt nhất (ít nodes visited nhất)
-    top_algos = df_success.groupby('Algorithm_Name')['Nodes_Visited'].mean().nsmallest(8).index
-    df_top = df_success[df_success['Algorithm_Name'].isin(top_algos)]
+    top_algos = cube_select()[('Nodes_Visited', 'mean')].nsmallest(8).index
     
     # Chart 1: Nodes Visited by Map Type
     ax1 = axes[0, 0]
-    pivot1 = df_top.pivot_table(values='Nodes_Visited', 
-                                  index='Map_Type', 
-                                  columns='Algorithm_Name', 
-                                  aggfunc='mean')
+    pivot1 = cube_pivot('Nodes_Visited', algorithms=top_algos).T
     pivot1.plot(kind='bar', ax=ax1, width=0.8)
     ax1.set_title('Nodes Visited theo Map Type', fontsize=12, fontweight='bold')
     ax1.set_ylabel('Nodes Visited (Avg)', fontsize=11)
@@ -225,10 +1028,7 @@ def plot_map_type_analysis():
     
     # Chart 2: Execution Time by Map Type
     ax2 = axes[0, 1]
-    pivot2 = df_top.pivot_table(values='Execution_Time_ms', 
-                                  index='Map_Type', 
-                                  columns='Algorithm_Name', 
-                                  aggfunc='mean')
+    pivot2 = cube_pivot('Execution_Time_ms', algorithms=top_algos).T
     pivot2.plot(kind='bar', ax=ax2, width=0.8)
     ax2.set_title('Execution Time theo Map Type', fontsize=12, fontweight='bold')
     ax2.set_ylabel('Time (ms, Avg)', fontsize=11)
@@ -239,10 +1039,7 @@ def plot_map_type_analysis():
     
     # Chart 3: Path Length by Map Type
     ax3 = axes[1, 0]
-    pivot3 = df_top.pivot_table(values='Path_Length', 
-                                  index='Map_Type', 
-                                  columns='Algorithm_Name', 
-                                  aggfunc='mean')
+    pivot3 = cube_pivot('Path_Length', algorithms=top_algos).T
     pivot3.plot(kind='bar', ax=ax3, width=0.8)
     ax3.set_title('Path Length theo Map Type', fontsize=12, fontweight='bold')
     ax3.set_ylabel('Path Length (Avg)', fontsize=11)
@@ -253,9 +1050,7 @@ def plot_map_type_analysis():
     
     # Chart 4: Success Rate by Algorithm
     ax4 = axes[1, 1]
-    success_rate = df.groupby('Algorithm_Name')['Path_Found'].apply(
-        lambda x: (x == 'Yes').sum() / len(x) * 100
-    ).sort_values(ascending=False)
+    success_rate = cube_select()[('Success_Rate', 'mean')].sort_values(ascending=False)
     success_rate.plot(kind='barh', ax=ax4, color='green', alpha=0.7)
     ax4.set_title('Success Rate (%)', fontsize=12, fontweight='bold')
     ax4.set_xlabel('Success Rate (%)', fontsize=11)
@@ -263,9 +1058,7 @@ def plot_map_type_analysis():
     ax4.grid(axis='x', alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig(charts_dir / '06_map_type_analysis.png', dpi=300, bbox_inches='tight')
-    print("✅ Saved: 06_map_type_analysis.png")
-    plt.close()
+    save_figure('06_map_type_analysis')
 
 # ============================================================================
 # BIỂU ĐỒ 7: Scatter Plot - Nodes Visited vs Execution Time
@@ -278,13 +1071,16 @@ def plot_efficiency_scatter():
                   'A* (w=1, manhattan)', 'A* (w=2, manhattan)',
                   'Greedy BFS (manhattan)']
     
-    df_main = df_success[df_success['Algorithm_Name'].isin(main_algos)]
+    # Mỗi điểm là trung bình của một nhóm (thuật toán, loại map)
+    nodes = cube_pivot('Nodes_Visited')
+    times = cube_pivot('Execution_Time_ms')
     
     # Vẽ scatter plot
     for algo in main_algos:
-        algo_data = df_main[df_main['Algorithm_Name'] == algo]
-        plt.scatter(algo_data['Nodes_Visited'], 
-                   algo_data['Execution_Time_ms'],
+        if algo not in nodes.index:
+            continue
+        plt.scatter(nodes.loc[algo], 
+                   times.loc[algo],
                    label=algo, alpha=0.6, s=100)
     
     plt.xlabel('Nodes Visited', fontsize=12, fontweight='bold')
@@ -294,9 +1090,7 @@ def plot_efficiency_scatter():
     plt.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
     plt.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig(charts_dir / '07_efficiency_scatter.png', dpi=300, bbox_inches='tight')
-    print("✅ Saved: 07_efficiency_scatter.png")
-    plt.close()
+    save_figure('07_efficiency_scatter')
 
 # ============================================================================
 # BIỂU ĐỒ 8: Heatmap - Performance across Map Types
@@ -310,14 +1104,10 @@ def plot_performance_heatmap():
     top_algos = ['Dijkstra', 'BFS', 'DFS', 
                  'A* (w=0.5, manhattan)', 'A* (w=1, manhattan)', 'A* (w=2, manhattan)',
                  'Greedy BFS (manhattan)']
-    df_top = df_success[df_success['Algorithm_Name'].isin(top_algos)]
     
     # Heatmap 1: Nodes Visited
     ax1 = axes[0, 0]
-    pivot1 = df_top.pivot_table(values='Nodes_Visited', 
-                                  index='Algorithm_Name', 
-                                  columns='Map_Type', 
-                                  aggfunc='mean')
+    pivot1 = cube_pivot('Nodes_Visited', algorithms=top_algos)
     sns.heatmap(pivot1, annot=True, fmt='.0f', cmap='YlOrRd', ax=ax1, cbar_kws={'label': 'Nodes'})
     ax1.set_title('Nodes Visited', fontsize=12, fontweight='bold')
     ax1.set_ylabel('Algorithm', fontsize=10)
@@ -325,10 +1115,7 @@ def plot_performance_heatmap():
     
     # Heatmap 2: Execution Time
     ax2 = axes[0, 1]
-    pivot2 = df_top.pivot_table(values='Execution_Time_ms', 
-                                  index='Algorithm_Name', 
-                                  columns='Map_Type', 
-                                  aggfunc='mean')
+    pivot2 = cube_pivot('Execution_Time_ms', algorithms=top_algos)
     sns.heatmap(pivot2, annot=True, fmt='.3f', cmap='viridis', ax=ax2, cbar_kws={'label': 'ms'})
     ax2.set_title('Execution Time (ms)', fontsize=12, fontweight='bold')
     ax2.set_ylabel('Algorithm', fontsize=10)
@@ -336,10 +1123,7 @@ def plot_performance_heatmap():
     
     # Heatmap 3: Path Length
     ax3 = axes[1, 0]
-    pivot3 = df_top.pivot_table(values='Path_Length', 
-                                  index='Algorithm_Name', 
-                                  columns='Map_Type', 
-                                  aggfunc='mean')
+    pivot3 = cube_pivot('Path_Length', algorithms=top_algos)
     sns.heatmap(pivot3, annot=True, fmt='.1f', cmap='coolwarm', ax=ax3, cbar_kws={'label': 'Path'})
     ax3.set_title('Path Length', fontsize=12, fontweight='bold')
     ax3.set_ylabel('Algorithm', fontsize=10)
@@ -347,19 +1131,14 @@ def plot_performance_heatmap():
     
     # Heatmap 4: Memory Usage
     ax4 = axes[1, 1]
-    pivot4 = df_top.pivot_table(values='Memory_Usage_Nodes', 
-                                  index='Algorithm_Name', 
-                                  columns='Map_Type', 
-                                  aggfunc='mean')
+    pivot4 = cube_pivot('Memory_Usage_Nodes', algorithms=top_algos)
     sns.heatmap(pivot4, annot=True, fmt='.1f', cmap='mako', ax=ax4, cbar_kws={'label': 'Nodes'})
     ax4.set_title('Memory Usage', fontsize=12, fontweight='bold')
     ax4.set_ylabel('Algorithm', fontsize=10)
     ax4.set_xlabel('Map Type', fontsize=10)
     
     plt.tight_layout()
-    plt.savefig(charts_dir / '08_performance_heatmap.png', dpi=300, bbox_inches='tight')
-    print("✅ Saved: 08_performance_heatmap.png")
-    plt.close()
+    save_figure('08_performance_heatmap')
 
 # ============================================================================
 # BIỂU ĐỒ 9: Tổng quan - Radar Chart
@@ -372,7 +1151,8 @@ def plot_radar_comparison():
                  'A* (w=1, manhattan)', 'A* (w=2, manhattan)',
                  'Greedy BFS (manhattan)']
     
-    df_top = df_success[df_success['Algorithm_Name'].isin(top_algos)]
+    algo_means = cube_select(algorithms=top_algos)
+    top_algos = list(algo_means.index)
     
     # Chuẩn hóa metrics (0-1, inverse cho các metric "càng thấp càng tốt")
     metrics = ['Nodes_Visited', 'Execution_Time_ms', 'Path_Length', 'Memory_Usage_Nodes']
@@ -392,14 +1172,16 @@ def plot_radar_comparison():
     
     colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7']
     
+    top_max = algo_means.xs('max', axis=1, level='stat').max()
+    
     for i, algo in enumerate(top_algos):
-        algo_data = df_top[df_top['Algorithm_Name'] == algo]
+        algo_data = algo_means.xs('mean', axis=1, level='stat').loc[algo]
         
         # Tính điểm cho mỗi metric (inverse normalization)
-        time_score = 1 - (algo_data['Execution_Time_ms'].mean() / df_top['Execution_Time_ms'].max())
-        nodes_score = 1 - (algo_data['Nodes_Visited'].mean() / df_top['Nodes_Visited'].max())
-        path_score = 1 - (algo_data['Path_Length'].mean() / df_top['Path_Length'].max())
-        memory_score = 1 - (algo_data['Memory_Usage_Nodes'].mean() / df_top['Memory_Usage_Nodes'].max())
+        time_score = 1 - (algo_data['Execution_Time_ms'] / top_max['Execution_Time_ms'])
+        nodes_score = 1 - (algo_data['Nodes_Visited'] / top_max['Nodes_Visited'])
+        path_score = 1 - (algo_data['Path_Length'] / top_max['Path_Length'])
+        memory_score = 1 - (algo_data['Memory_Usage_Nodes'] / top_max['Memory_Usage_Nodes'])
         
         values = [time_score, nodes_score, path_score, memory_score]
         values += values[:1]
@@ -414,60 +1196,205 @@ def plot_radar_comparison():
     ax.grid(True)
     
     plt.tight_layout()
-    plt.savefig(charts_dir / '09_radar_comparison.png', dpi=300, bbox_inches='tight')
-    print("✅ Saved: 09_radar_comparison.png")
-    plt.close()
+    save_figure('09_radar_comparison')
+
+# ============================================================================
+# BIỂU ĐỒ 10: Phân rã chi phí - bộ đếm instrumentation theo loại Map
+# ============================================================================
+def plot_cost_breakdown():
+    # Chỉ các thuật toán có bộ đếm (kết quả chạy với --instrument)
+    counted = cube_select()[[(measure, 'count') for measure in COUNTER_MEASURES]].max(axis=1)
+    algorithms = counted[counted > 0].index
+    if len(algorithms) == 0:
+        print("⚠️  Bỏ qua 10_cost_breakdown: không có bộ đếm (chạy runFullBenchmark.mjs --instrument)")
+        return
+    
+    map_types = [map_type for map_type in cube.index.get_level_values('Map_Type').unique()
+                 if map_type != ALL_MAPS]
+    panels = [ALL_MAPS] + sorted(map_types)
+    ncols = 2
+    nrows = (len(panels) + ncols - 1) // ncols
+    fig, axes = plt.subplots(nrows, ncols, figsize=(18, 6 * nrows), squeeze=False)
+    fig.suptitle('Phân rã chi phí mỗi lần tìm đường (trung bình số thao tác)',
+                 fontsize=16, fontweight='bold')
+    
+    for ax, map_type in zip(axes.flat, panels):
+        means = cube_select(algorithms=algorithms, map_type=map_type)
+        breakdown = means[[(measure, 'mean') for measure in COUNTER_MEASURES]].droplevel('stat', axis=1)
+        breakdown = breakdown.loc[breakdown.sum(axis=1).sort_values().index]
+        breakdown.plot(kind='barh', stacked=True, ax=ax, width=0.8, colormap='tab10', legend=False)
+        ax.set_title('Tất cả map' if map_type == ALL_MAPS else f'Map {map_type}',
+                     fontsize=12, fontweight='bold')
+        ax.set_xlabel('Số thao tác (Avg)', fontsize=11)
+        ax.set_ylabel('')
+        ax.grid(axis='x', alpha=0.3)
+    for ax in list(axes.flat)[len(panels):]:
+        ax.set_visible(False)
+    
+    handles, labels = axes[0, 0].get_legend_handles_labels()
+    fig.legend(handles, labels, loc='upper right', fontsize=10)
+    plt.tight_layout(rect=(0, 0, 0.92, 0.97))
+    save_figure('10_cost_breakdown')
 
 # ============================================================================
 # BẢNG THỐNG KÊ
 # ============================================================================
+def summary_table():
+    """Bảng thống kê tổng hợp theo thuật toán (không cần thư viện vẽ)."""
+    summary = cube_select()[[
+        ('Nodes_Visited', 'mean'), ('Nodes_Visited', 'std'), ('Nodes_Visited', 'min'), ('Nodes_Visited', 'max'),
+        ('Execution_Time_ms', 'mean'), ('Execution_Time_ms', 'std'),
+        ('Path_Length', 'mean'), ('Path_Length', 'std'),
+        ('Memory_Usage_Nodes', 'mean'), ('Memory_Usage_Nodes', 'std'),
+    ]].sort_index().round(2)
+    summary.columns.names = [None, None]
+    return summary
+
+
+def summary_json(summary):
+    """Chuyển bảng tổng hợp thành JSON {thuật toán: {measure: {stat: giá trị}}}."""
+    result = {}
+    for algo, row in summary.iterrows():
+        entry = result.setdefault(algo, {})
+        for (measure, stat), value in row.items():
+            entry.setdefault(measure, {})[stat] = None if pd.isna(value) else float(value)
+    return json.dumps(result, ensure_ascii=False, indent=2)
+
+
+def print_summary(summary):
+    print("\n" + "="*80)
+    print("📊 BẢNG THỐNG KÊ TỔNG HỢP")
+    print("="*80)
+    print(summary.to_string())
+    print("="*80 + "\n")
+
+
 def generate_summary_table():
     # Tính toán thống kê tổng hợp
-    summary = df_success.groupby('Algorithm_Name').agg({
-        'Nodes_Visited': ['mean', 'std', 'min', 'max'],
-        'Execution_Time_ms': ['mean', 'std'],
-        'Path_Length': ['mean', 'std'],
-        'Memory_Usage_Nodes': ['mean', 'std']
-    }).round(2)
+    summary = summary_table()
     
     # Lưu ra CSV
     summary.to_csv(charts_dir / 'summary_statistics.csv')
     print("✅ Saved: summary_statistics.csv")
     
     # In ra console
-    print("\n" + "="*80)
-    print("📊 BẢNG THỐNG KÊ TỔNG HỢP")
-    print("="*80)
-    print(summary.to_string())
-    print("="*80 + "\n")
+    print_summary(summary)
+
+# ============================================================================
+# RENDER SONG SONG - Mỗi biểu đồ một task trong process pool
+# ============================================================================
+CHARTS = {
+    'nodes': plot_average_nodes_visited,
+    'time': plot_execution_time,
+    'path': plot_path_optimality,
+    'memory': plot_memory_usage,
+    'astar': plot_astar_analysis,
+    'map_type': plot_map_type_analysis,
+    'scatter': plot_efficiency_scatter,
+    'heatmap': plot_performance_heatmap,
+    'radar': plot_radar_comparison,
+    'costs': plot_cost_breakdown,
+}
+
+
+def _init_worker(shared_cube, output_dir, options):
+    # Process con: backend không cần màn hình, nhận cube (nhỏ) một lần khi khởi tạo
+    global cube, charts_dir
+    setup_plotting()
+    cube = shared_cube
+    charts_dir = output_dir
+    render_options.update(options)
+
+
+def _render_chart(name):
+    CHARTS[name]()
+    return name
+
+
+def render_charts(names, jobs):
+    """Vẽ các biểu đồ được chọn; jobs > 1 thì vẽ song song trên nhiều process."""
+    jobs = max(1, min(jobs, len(names)))
+    if jobs == 1:
+        setup_plotting()
+        for name in names:
+            _render_chart(name)
+        return
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(cube, charts_dir, dict(render_options))) as pool:
+        for _ in pool.map(_render_chart, names):
+            pass
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Phân tích và vẽ biểu đồ kết quả benchmark')
+    parser.add_argument('input', nargs='?', type=Path, default=RESULTS_DIR,
+                        help='thư mục kết quả hoặc một file .csv/.pfcol (mặc định: benchmark/results)')
+    parser.add_argument('--output', '-o', type=Path, default=charts_dir,
+                        help='thư mục lưu biểu đồ và summary_statistics.csv (mặc định: benchmark/charts)')
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--headless', action='store_true',
+                        help='chỉ in bảng thống kê, không import matplotlib, không vẽ')
+    output.add_argument('--json', action='store_true',
+                        help='chỉ in bảng thống kê dạng JSON ra stdout (ngụ ý --headless)')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='số process vẽ biểu đồ song song (mặc định: số CPU)')
+    parser.add_argument('--draft', action='store_true',
+                        help='chế độ nháp: DPI thấp, không tính bbox tight (xem nhanh trên CI)')
+    parser.add_argument('--format', choices=['png', 'svg', 'pdf'], default='png',
+                        help='định dạng file; svg/pdf là vector, không rasterize')
+    parser.add_argument('--charts', nargs='+', choices=list(CHARTS), default=list(CHARTS),
+                        metavar='CHART', help=f"chỉ vẽ các biểu đồ này: {', '.join(CHARTS)}")
+    return parser.parse_args(argv)
+
 
 # ============================================================================
 # MAIN - Chạy tất cả các biểu đồ
 # ============================================================================
-def main():
+def main(argv=None):
+    global cube, charts_dir
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'compare':
+        return compare_main(argv[1:])
+    if argv and argv[0] == 'validate':
+        return validate_main(argv[1:])
+    if argv and argv[0] == 'scaling':
+        return scaling_main(argv[1:])
+    args = parse_args(argv)
+    render_options.update(format=args.format, **RENDER_MODES['draft' if args.draft else 'full'])
+
+    aggregates = aggregate_results(args.input)
+    cube = build_cube(aggregates)
+
+    if args.json:
+        print(summary_json(summary_table()))
+        return
+    if args.headless:
+        print_summary(summary_table())
+        return
+
+    charts_dir = args.output
+    charts_dir.mkdir(parents=True, exist_ok=True)
+
+    totals = aggregates.runs.sum()
+    print(f"📊 Đọc được {int(totals['tests'])} tests, {int(totals['successes'])} tests thành công")
+    print(f"🎯 Các thuật toán: {aggregates.runs.index.unique('Algorithm_Name').to_numpy()}")
+    print(f"🗺️  Các loại map: {aggregates.runs.index.unique('Map_Type').to_numpy()}")
+
     print("\n" + "="*80)
     print("🎨 BẮT ĐẦU TẠO BIỂU ĐỒ SO SÁNH")
     print("="*80 + "\n")
     
-    plot_average_nodes_visited()
-    plot_execution_time()
-    plot_path_optimality()
-    plot_memory_usage()
-    plot_astar_analysis()
-    plot_map_type_analysis()
-    plot_efficiency_scatter()
-    plot_performance_heatmap()
-    plot_radar_comparison()
+    render_charts(args.charts, args.jobs)
     generate_summary_table()
     
     print("\n" + "="*80)
-    print("🎉 HOÀN THÀNH! Tất cả biểu đồ đã được lưu trong thư mục 'charts/'")
+    print(f"🎉 HOÀN THÀNH! Tất cả biểu đồ đã được lưu trong thư mục '{charts_dir}'")
     print("="*80 + "\n")
     
     print("📁 Danh sách file đã tạo:")
-    for file in sorted(charts_dir.glob('*.png')):
+    for file in sorted(charts_dir.glob(f"*.{render_options['format']}")):
         print(f"   - {file.name}")
     print(f"   - summary_statistics.csv")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
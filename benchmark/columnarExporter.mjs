@@ -0,0 +1,124 @@
+/**
+ * Columnar binary export (.pfcol)
+ *
+ * Layout (all integers little-endian):
+ *   bytes 0-7   magic "PFCOLV1\n"
+ *   bytes 8-11  uint32 length of the JSON header
+ *   JSON header { rows, columns: [{ name, dtype, offset, dictionary? }], dictionaries }
+ *   column data, each column starting on an 8-byte boundary
+ *
+ * dtype uses NumPy notation ('<i4', '<f8', '|u1') so the Python analyzer can
+ * memory-map every column without copying. String columns are stored as
+ * '<i4' codes into header.dictionaries[column]. Columns with a `width`
+ * hold `width` values per row (row-major, shape [rows, width]).
+ */
+
+import { endianness } from 'os';
+
+const MAGIC = 'PFCOLV1\n';
+const ALIGNMENT = 8;
+
+const TYPED_ARRAYS = {
+  '<i4': Int32Array,
+  '<f8': Float64Array,
+  '|u1': Uint8Array,
+};
+
+function alignUp(offset) {
+  return Math.ceil(offset / ALIGNMENT) * ALIGNMENT;
+}
+
+/**
+ * Map string values to dense integer codes, in order of first appearance
+ */
+export function dictionaryEncode(values) {
+  const dictionary = [];
+  const index = new Map();
+  const codes = new Int32Array(values.length);
+  for (let i = 0; i < values.length; i++) {
+    const value = String(values[i]);
+    let code = index.get(value);
+    if (code === undefined) {
+      code = dictionary.length;
+      dictionary.push(value);
+      index.set(value, code);
+    }
+    codes[i] = code;
+  }
+  return { codes, dictionary };
+}
+
+/**
+ * Encode rows into a columnar buffer
+ * @param {Array<Object>} rows - records to encode
+ * @param {Array<{name: string, dtype: string, width?: number, get: Function}>} schema -
+ *   dtype is '<i4', '<f8', '|u1' or 'dict' for dictionary-encoded strings;
+ *   with `width`, get() returns an array of exactly `width` numbers
+ * @returns {Buffer}
+ */
+export function encodeColumnar(rows, schema) {
+  if (endianness() !== 'LE') {
+    throw new Error('Columnar export assumes a little-endian platform');
+  }
+  const columns = [];
+  const dictionaries = {};
+
+  for (const column of schema) {
+    const values = rows.map(column.get);
+    if (column.dtype === 'dict') {
+      const { codes, dictionary } = dictionaryEncode(values);
+      dictionaries[column.name] = dictionary;
+      columns.push({ name: column.name, dtype: '<i4', dictionary: column.name, data: codes });
+    } else {
+      const TypedArray = TYPED_ARRAYS[column.dtype];
+      if (!TypedArray) {
+        throw new Error(`Unsupported column dtype: ${column.dtype}`);
+      }
+      if (column.width) {
+        const data = new TypedArray(values.length * column.width);
+        values.forEach((row, i) => {
+          if (row.length !== column.width) {
+            throw new Error(`Column ${column.name} expects ${column.width} values per row`);
+          }
+          data.set(row, i * column.width);
+        });
+        columns.push({ name: column.name, dtype: column.dtype, width: column.width, data });
+      } else {
+        columns.push({ name: column.name, dtype: column.dtype, data: TypedArray.from(values) });
+      }
+    }
+  }
+
+  // Offsets depend on the header length, and the header contains the
+  // offsets, so lay out with a provisional header until the size settles.
+  let headerLength = 0;
+  let header;
+  for (;;) {
+    let offset = alignUp(MAGIC.length + 4 + headerLength);
+    const layout = columns.map(({ name, dtype, dictionary, width, data }) => {
+      const entry = { name, dtype, offset };
+      if (dictionary) entry.dictionary = dictionary;
+      if (width) entry.width = width;
+      offset = alignUp(offset + data.byteLength);
+      return entry;
+    });
+    header = Buffer.from(JSON.stringify({ rows: rows.length, columns: layout, dictionaries }), 'utf8');
+    if (header.length <= headerLength) break;
+    headerLength = header.length;
+  }
+  header = Buffer.concat([header, Buffer.alloc(headerLength - header.length, ' ')]);
+
+  const prefix = Buffer.alloc(MAGIC.length + 4);
+  prefix.write(MAGIC, 0, 'latin1');
+  prefix.writeUInt32LE(headerLength, MAGIC.length);
+
+  const chunks = [prefix, header];
+  let position = prefix.length + header.length;
+  for (const { data } of columns) {
+    const padding = alignUp(position) - position;
+    if (padding > 0) chunks.push(Buffer.alloc(padding));
+    chunks.push(Buffer.from(data.buffer, data.byteOffset, data.byteLength));
+    position += padding + data.byteLength;
+  }
+  return Buffer.concat(chunks);
+}
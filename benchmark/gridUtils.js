@@ -2,6 +2,8 @@
  * Grid utilities for benchmark testing
  */
 
+import { setCompactWall } from '../src/pathfindingAlgorithms/compactGrid.js';
+
 // Create a fresh grid
 export function createGrid(rows, cols) {
   const grid = [];
@@ -55,6 +57,7 @@ export function applyWalls(grid, walls) {
   for (const [row, col] of walls) {
     if (grid[row] && grid[row][col]) {
       grid[row][col].isWall = true;
+      setCompactWall(grid, row, col, true);
     }
   }
 }
@@ -75,6 +78,8 @@ export function getStartFinishNodes(grid, rows, cols) {
   // Ensure start/finish are not walls
   startNode.isWall = false;
   finishNode.isWall = false;
+  setCompactWall(grid, startRow, startCol, false);
+  setCompactWall(grid, finishRow, finishCol, false);
   
   return { startNode, finishNode };
 }
@@ -0,0 +1,464 @@
+"""
+Engine tìm đường tham chiếu bằng NumPy cho grid lớn
+
+Grid lưu dưới dạng mảng tường uint8 phẳng, node là chỉ số nguyên row*cols+col.
+- BFS: mở rộng cả wavefront (frontier) một lúc bằng thao tác vector
+- Dijkstra / A* / Greedy: binary heap giống hệt TinyQueue của bản JS, cùng
+  heuristic Manhattan/Euclidean và weight như metricSpace/index.js
+
+Thứ tự duyệt hàng xóm và cách xử lý phần tử trùng trong heap giống bản JS, nên
+Path_Length, Nodes_Visited và Memory_Usage_Nodes khớp với runFullBenchmark.mjs
+trên cùng một map. Kết quả ghi ra cùng schema CSV để analyze_results.py đọc.
+
+Chạy:
+    python grid_engine.py --rows 1000 --cols 2000 --density 0.3 --seed 1 -o results/engine.csv
+    python grid_engine.py --corpus corpus --rows 25 --cols 50 -o results/engine.csv
+"""
+
+import argparse
+import csv
+import json
+import math
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+# Hướng đi (drow, dcol) và thứ tự duyệt hàng xóm của từng file JS
+UP, RIGHT, DOWN, LEFT = (-1, 0), (0, 1), (1, 0), (0, -1)
+ORDER_URDL = (UP, RIGHT, DOWN, LEFT)   # dijkstra.js, breadthFirstSearch.js, greedyBestFirstSearch.js
+ORDER_RDLU = (RIGHT, DOWN, LEFT, UP)   # astar.js
+
+MANHATTAN = 'manhattan'
+EUCLIDEAN = 'euclidean'
+
+CSV_HEADERS = [
+    'Map_Type', 'Map_Number', 'Map_ID', 'Rows', 'Cols',
+    'Start_Row', 'Start_Col', 'Finish_Row', 'Finish_Col',
+    'Algorithm_Name', 'Parameters',
+    'Path_Found', 'Path_Length', 'Nodes_Visited', 'Memory_Usage_Nodes', 'Execution_Time_ms',
+]
+
+
+@dataclass
+class Grid:
+    """Grid phẳng: walls[row * cols + col] = 1 nếu là tường."""
+    rows: int
+    cols: int
+    walls: np.ndarray
+
+    @property
+    def size(self):
+        return self.rows * self.cols
+
+    def index(self, row, col):
+        return row * self.cols + col
+
+    @classmethod
+    def from_strings(cls, lines, wall='#'):
+        """Tạo grid từ các dòng text, ký tự `wall` là tường."""
+        data = np.array([[ch == wall for ch in line] for line in lines], dtype=np.uint8)
+        return cls(data.shape[0], data.shape[1], data.ravel())
+
+
+@dataclass
+class SearchResult:
+    found: bool
+    path_length: int
+    nodes_visited: int
+    memory_usage: int
+    parent: np.ndarray
+
+
+def random_grid(rows, cols, density=0.33, rng=None, keep=()):
+    """Grid tường ngẫu nhiên như randomMaze.js (mỗi ô là tường với xác suất density)."""
+    rng = rng if rng is not None else np.random.default_rng()
+    walls = (rng.random(rows * cols) < density).astype(np.uint8)
+    walls[list(keep)] = 0
+    return Grid(rows, cols, walls)
+
+
+def start_finish_positions(rows, cols, map_number=1):
+    """Vị trí start/finish giống getStartFinishNodes trong runFullBenchmark.mjs."""
+    positions = [
+        (rows // 2, cols // 4, rows // 2, (3 * cols) // 4),
+        (rows // 4, cols // 4, (3 * rows) // 4, (3 * cols) // 4),
+        ((3 * rows) // 4, cols // 5, rows // 5, (4 * cols) // 5),
+        (rows // 5, cols // 2, (4 * rows) // 5, cols // 2),
+        (rows // 6, cols // 6, (5 * rows) // 6, (5 * cols) // 6),
+    ]
+    return positions[map_number - 1] if 1 <= map_number <= len(positions) else positions[0]
+
+
+def _path_length(parent, start, finish):
+    length = 1
+    node = finish
+    while node != start:
+        node = parent[node]
+        length += 1
+    return length
+
+
+# ============================================================================
+# BFS - Mở rộng cả wavefront bằng NumPy
+# ============================================================================
+def _frontier_neighbours(grid, frontier, order):
+    """Hàng xóm của mọi node trong frontier, shape (len, 4), -1 nếu ra ngoài grid."""
+    row, col = np.divmod(frontier, grid.cols)
+    out = np.empty((len(frontier), len(order)), dtype=np.int64)
+    for k, (dr, dc) in enumerate(order):
+        inside = (row + dr >= 0) & (row + dr < grid.rows) & (col + dc >= 0) & (col + dc < grid.cols)
+        out[:, k] = np.where(inside, frontier + dr * grid.cols + dc, -1)
+    return out
+
+
+def bfs(grid, start, finish):
+    """BFS theo từng level; kết quả khớp breadthFirstSearch.js.
+
+    Hàng đợi FIFO của bản JS chính là các level nối tiếp nhau, mỗi level theo
+    thứ tự phát hiện. Vì vậy chỉ cần giữ thứ tự xuất hiện đầu tiên khi khử trùng
+    là tính lại được chính xác số node đã thăm và kích thước hàng đợi lớn nhất.
+    """
+    walls = grid.walls.astype(bool)
+    visited = np.zeros(grid.size, dtype=bool)
+    parent = np.full(grid.size, -1, dtype=np.int64)
+    visited[start] = True
+    level = np.array([start], dtype=np.int64)
+    nodes_visited = 0
+    max_memory = 0
+    depth = 0
+
+    while len(level):
+        hit = np.flatnonzero(level == finish)
+        candidates = _frontier_neighbours(grid, level, ORDER_URDL).ravel()
+        valid = candidates >= 0
+        inside = candidates[valid]
+        valid[valid] = ~walls[inside] & ~visited[inside]
+        positions = np.flatnonzero(valid)
+        _, first = np.unique(candidates[positions], return_index=True)
+        first.sort()
+        discovered = candidates[positions[first]]
+        owner = positions[first] // len(ORDER_URDL)
+
+        # Kích thước hàng đợi sau khi mở rộng node thứ i của level:
+        # phần còn lại của level + số node mới đã phát hiện tới lúc đó
+        expanded = int(hit[0]) if len(hit) else len(level)
+        if expanded:
+            found_so_far = np.bincount(owner, minlength=len(level)).cumsum()[:expanded]
+            remaining = len(level) - np.arange(1, expanded + 1)
+            max_memory = max(max_memory, int((remaining + found_so_far).max()))
+        nodes_visited += expanded
+
+        if len(hit):
+            return SearchResult(True, depth + 1, nodes_visited, max_memory, parent)
+
+        visited[discovered] = True
+        parent[discovered] = level[owner]
+        level = discovered
+        depth += 1
+
+    return SearchResult(False, 0, nodes_visited, max_memory, parent)
+
+
+# ============================================================================
+# DIJKSTRA / A* / GREEDY - Binary heap giống TinyQueue
+# ============================================================================
+class _TinyQueue:
+    """Binary heap cùng thuật toán với TinyQueue (JS), so sánh theo keys[node].
+
+    Bản JS so sánh thuộc tính của node tại thời điểm so sánh (distance có thể
+    giảm khi node vẫn còn trong heap), nên keys được đọc trực tiếp mỗi lần so sánh
+    để thứ tự pop giống hệt.
+    """
+
+    __slots__ = ('data', 'keys')
+
+    def __init__(self, keys):
+        self.data = []
+        self.keys = keys
+
+    def __len__(self):
+        return len(self.data)
+
+    def push(self, item):
+        data, keys = self.data, self.keys
+        data.append(item)
+        pos = len(data) - 1
+        key = keys[item]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            current = data[parent]
+            if key >= keys[current]:
+                break
+            data[pos] = current
+            pos = parent
+        data[pos] = item
+
+    def pop(self):
+        data, keys = self.data, self.keys
+        top = data[0]
+        bottom = data.pop()
+        length = len(data)
+        if length:
+            pos = 0
+            half = length >> 1
+            key = keys[bottom]
+            while pos < half:
+                left = (pos << 1) + 1
+                best = data[left]
+                right = left + 1
+                if right < length and keys[data[right]] < keys[best]:
+                    left = right
+                    best = data[right]
+                if keys[best] >= key:
+                    break
+                data[pos] = best
+                pos = left
+            data[pos] = bottom
+        return top
+
+
+def heuristic_function(grid, finish, metric=MANHATTAN, weight=1):
+    """Heuristic giống getHeuristicFunction: weight * khoảng cách tới finish."""
+    finish_row, finish_col = divmod(finish, grid.cols)
+    cols = grid.cols
+    if metric == EUCLIDEAN:
+        def heuristic(node):
+            dx = node // cols - finish_row
+            dy = node % cols - finish_col
+            return weight * math.sqrt(dx * dx + dy * dy)
+    else:
+        def heuristic(node):
+            return weight * (abs(node // cols - finish_row) + abs(node % cols - finish_col))
+    return heuristic
+
+
+def _heap_search(grid, start, finish, order, heuristic=None, greedy=False):
+    rows, cols = grid.rows, grid.cols
+    walls = grid.walls.tolist()
+    distance = [math.inf] * grid.size
+    visited = bytearray(grid.size)
+    parent = np.full(grid.size, -1, dtype=np.int64)
+    # Dijkstra so sánh theo distance, A*/Greedy theo totalDistance
+    key = distance if heuristic is None else [math.inf] * grid.size
+    steps = [(dr, dc, dr * cols + dc) for dr, dc in order]
+
+    distance[start] = 0
+    if heuristic is not None:
+        key[start] = heuristic(start)
+    queue = _TinyQueue(key)
+    queue.push(start)
+    max_memory = len(queue)
+    nodes_visited = 0
+
+    while len(queue):
+        node = queue.pop()
+        if visited[node]:
+            continue
+        if node == finish:
+            return SearchResult(True, _path_length(parent, start, finish), nodes_visited,
+                                max_memory, parent)
+        visited[node] = 1
+        nodes_visited += 1
+
+        row, col = divmod(node, cols)
+        next_distance = distance[node] + 1
+        for dr, dc, step in steps:
+            r, c = row + dr, col + dc
+            if r < 0 or r >= rows or c < 0 or c >= cols:
+                continue
+            neighbour = node + step
+            if walls[neighbour] or visited[neighbour]:
+                continue
+            if next_distance < distance[neighbour]:
+                distance[neighbour] = next_distance
+                if heuristic is not None:
+                    h = heuristic(neighbour)
+                    key[neighbour] = h if greedy else next_distance + h
+                parent[neighbour] = node
+                queue.push(neighbour)
+        max_memory = max(max_memory, len(queue))
+
+    return SearchResult(False, 0, nodes_visited, max_memory, parent)
+
+
+def dijkstra(grid, start, finish):
+    return _heap_search(grid, start, finish, ORDER_URDL)
+
+
+def astar(grid, start, finish, metric=MANHATTAN, weight=1):
+    heuristic = heuristic_function(grid, finish, metric, weight)
+    return _heap_search(grid, start, finish, ORDER_RDLU, heuristic)
+
+
+def greedy_bfs(grid, start, finish, metric=MANHATTAN, weight=1):
+    heuristic = heuristic_function(grid, finish, metric, weight)
+    return _heap_search(grid, start, finish, ORDER_URDL, heuristic, greedy=True)
+
+
+# ============================================================================
+# CẤU HÌNH & XUẤT KẾT QUẢ - Cùng tên/Parameters với getAlgorithmConfigs()
+# ============================================================================
+def _js_number(value):
+    # JSON.stringify / template string của JS in 1.0 thành "1"
+    return int(value) if float(value).is_integer() else value
+
+
+def algorithm_configs(weights=(0.5, 1.0, 2.0), metrics=(MANHATTAN, EUCLIDEAN)):
+    """Danh sách (tên, hàm, params) tương ứng các thuật toán engine hỗ trợ."""
+    configs = [('Dijkstra', dijkstra, {}), ('BFS', bfs, {})]
+    for weight in weights:
+        for metric in metrics:
+            configs.append((f'A* (w={_js_number(weight)}, {metric})', astar,
+                            {'metric': metric, 'weight': _js_number(weight)}))
+    for metric in metrics:
+        configs.append((f'Greedy BFS ({metric})', greedy_bfs, {'metric': metric, 'weight': 1}))
+    return configs
+
+
+def run_map(grid, start, finish, map_info, configs=None):
+    """Chạy mọi cấu hình trên một map, trả về các dòng theo schema CSV của benchmark."""
+    configs = configs if configs is not None else algorithm_configs()
+    start_row, start_col = divmod(start, grid.cols)
+    finish_row, finish_col = divmod(finish, grid.cols)
+    rows = []
+    for name, algorithm, params in configs:
+        begin = time.perf_counter()
+        result = algorithm(grid, start, finish, **params)
+        elapsed = (time.perf_counter() - begin) * 1000
+        rows.append({
+            'Map_Type': map_info.get('type', 'Random'),
+            'Map_Number': map_info.get('number', 1),
+            'Map_ID': map_info.get('id', 'Random_1'),
+            'Rows': grid.rows, 'Cols': grid.cols,
+            'Start_Row': start_row, 'Start_Col': start_col,
+            'Finish_Row': finish_row, 'Finish_Col': finish_col,
+            'Algorithm_Name': name,
+            'Parameters': json.dumps(params, separators=(',', ':')),
+            'Path_Found': 'Yes' if result.found else 'No',
+            'Path_Length': result.path_length,
+            'Nodes_Visited': result.nodes_visited,
+            'Memory_Usage_Nodes': result.memory_usage,
+            'Execution_Time_ms': round(elapsed, 3),
+        })
+    return rows
+
+
+def write_csv(rows, path):
+    """Ghi các dòng ra CSV cùng định dạng với runFullBenchmark.mjs (quote mọi ô)."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS, quoting=csv.QUOTE_ALL,
+                                extrasaction='ignore', lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+# ============================================================================
+# MAP TỪ JS - File benchmark_FULL_maps_*.json do runFullBenchmark.mjs ghi
+# ============================================================================
+def load_maps(path):
+    """Đọc các map đã dùng trong một lần chạy JS.
+
+    Trả về list (map_info, grid, start, finish); walls trong file là chuỗi
+    '0'/'1' độ dài rows*cols theo thứ tự row-major.
+    """
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+    maps = []
+    for entry in entries:
+        rows, cols = entry['rows'], entry['cols']
+        walls = (np.frombuffer(entry['walls'].encode('ascii'), dtype=np.uint8) - ord('0'))
+        grid = Grid(rows, cols, walls.astype(np.uint8))
+        start = grid.index(entry['startRow'], entry['startCol'])
+        finish = grid.index(entry['finishRow'], entry['finishCol'])
+        maps.append(({'id': entry['id'], 'type': entry['type'], 'number': entry['number']},
+                     grid, start, finish))
+    return maps
+
+
+# Corpus map do runFullBenchmark.mjs ghi (xem mapCorpus.mjs): magic, độ dài header
+# (u32 little-endian), header JSON, rồi tường bit-packed row-major (bit thấp trước)
+CORPUS_MAGIC = b'PFMAPV1\n'
+CORPUS_SUFFIX = '.pfmap'
+
+
+def read_corpus_map(path):
+    """Đọc một file .pfmap, trả về (map_info, grid, start, finish) như load_maps."""
+    data = Path(path).read_bytes()
+    if not data.startswith(CORPUS_MAGIC):
+        raise ValueError(f"{path} không phải file corpus map ({CORPUS_SUFFIX})")
+    start = len(CORPUS_MAGIC)
+    header_length = int.from_bytes(data[start:start + 4], 'little')
+    entry = json.loads(data[start + 4:start + 4 + header_length])
+    rows, cols = entry['rows'], entry['cols']
+    packed = np.frombuffer(data, dtype=np.uint8, offset=start + 4 + header_length)
+    walls = np.unpackbits(packed, count=rows * cols, bitorder='little')
+    grid = Grid(rows, cols, walls)
+    map_info = {'id': Path(path).stem, 'type': entry['type'], 'number': entry['position']}
+    return (map_info, grid, grid.index(entry['startRow'], entry['startCol']),
+            grid.index(entry['finishRow'], entry['finishCol']))
+
+
+def load_corpus(directory, rows=None, cols=None, seed=None):
+    """Đọc mọi map trong thư mục corpus, lọc theo kích thước/seed nếu có."""
+    maps = []
+    for path in sorted(Path(directory).glob(f'*{CORPUS_SUFFIX}')):
+        map_info, grid, start, finish = read_corpus_map(path)
+        if rows is not None and grid.rows != rows or cols is not None and grid.cols != cols:
+            continue
+        if seed is not None and not path.stem.endswith(f'_s{seed}_p{map_info["number"]}'):
+            continue
+        maps.append((map_info, grid, start, finish))
+    return maps
+
+
+def run_maps(maps, configs=None):
+    rows = []
+    for map_info, grid, start, finish in maps:
+        rows.extend(run_map(grid, start, finish, map_info, configs))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Engine tìm đường NumPy cho grid lớn')
+    parser.add_argument('--maps', type=Path, help='file benchmark_FULL_maps_*.json do bản JS ghi')
+    parser.add_argument('--corpus', type=Path,
+                        help='thư mục corpus .pfmap (lọc theo --rows/--cols nếu truyền, theo --seed nếu có)')
+    parser.add_argument('--rows', type=int, help='số hàng (mặc định 25; với --corpus: mọi kích thước)')
+    parser.add_argument('--cols', type=int, help='số cột (mặc định 50; với --corpus: mọi kích thước)')
+    parser.add_argument('--density', type=float, default=0.33, help='tỉ lệ tường của map ngẫu nhiên')
+    parser.add_argument('--maps-per-size', type=int, default=5, help='số map ngẫu nhiên (vị trí 1-5)')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--output', '-o', type=Path, help='file CSV kết quả (mặc định: stdout)')
+    args = parser.parse_args(argv)
+
+    if args.maps:
+        maps = load_maps(args.maps)
+    elif args.corpus:
+        maps = load_corpus(args.corpus, args.rows, args.cols, args.seed)
+    else:
+        rows, cols = args.rows or 25, args.cols or 50
+        rng = np.random.default_rng(args.seed)
+        maps = []
+        for number in range(1, args.maps_per_size + 1):
+            sr, sc, fr, fc = start_finish_positions(rows, cols, number)
+            start, finish = sr * cols + sc, fr * cols + fc
+            grid = random_grid(rows, cols, args.density, rng, keep=(start, finish))
+            maps.append(({'id': f'Random_{number}', 'type': 'Random', 'number': number},
+                         grid, start, finish))
+
+    rows = run_maps(maps)
+    if args.output:
+        write_csv(rows, args.output)
+        print(f"✓ Saved {len(rows)} rows to: {args.output}", file=sys.stderr)
+    else:
+        writer = csv.DictWriter(sys.stdout, fieldnames=CSV_HEADERS, quoting=csv.QUOTE_ALL,
+                                lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == '__main__':
+    main()
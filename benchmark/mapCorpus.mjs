@@ -0,0 +1,92 @@
+// Map corpus: generated benchmark maps stored on disk so that every run (and
+// grid_engine.py) uses exactly the same grids. One file per map, keyed by
+// (type, rows, cols, seed, position):
+//
+//   corpus/<type>_<rows>x<cols>_s<seed>_p<position>.pfmap
+//
+// File layout (little-endian):
+//   b'PFMAPV1\n' | u32 header length | JSON header | walls bit-packed row-major,
+//   cell i in byte i >> 3, bit i & 7 (numpy.unpackbits(bitorder='little'))
+// The header holds type, rows, cols, seed, position, start/finish and the
+// generation attempt that produced a connected map.
+
+import { existsSync, mkdirSync, readFileSync, writeFileSync } from 'fs';
+import { join } from 'path';
+
+const MAGIC = Buffer.from('PFMAPV1\n', 'latin1');
+
+export function corpusKey(type, rows, cols, seed, position) {
+  return `${type}_${rows}x${cols}_s${seed}_p${position}`;
+}
+
+export function corpusPath(dir, key) {
+  return join(dir, `${key}.pfmap`);
+}
+
+export function packWalls(walls) {
+  const packed = new Uint8Array((walls.length + 7) >> 3);
+  for (let i = 0; i < walls.length; i++) {
+    if (walls[i]) packed[i >> 3] |= 1 << (i & 7);
+  }
+  return packed;
+}
+
+export function unpackWalls(packed, size) {
+  const walls = new Uint8Array(size);
+  for (let i = 0; i < size; i++) {
+    walls[i] = (packed[i >> 3] >> (i & 7)) & 1;
+  }
+  return walls;
+}
+
+export function writeCorpusMap(dir, entry, walls) {
+  mkdirSync(dir, { recursive: true });
+  const header = Buffer.from(JSON.stringify(entry), 'utf8');
+  const length = Buffer.alloc(4);
+  length.writeUInt32LE(header.length, 0);
+  const key = corpusKey(entry.type, entry.rows, entry.cols, entry.seed, entry.position);
+  writeFileSync(corpusPath(dir, key), Buffer.concat([MAGIC, length, header, packWalls(walls)]));
+}
+
+// { entry, walls } or null if the map is not in the corpus
+export function readCorpusMap(dir, key) {
+  const path = corpusPath(dir, key);
+  if (!existsSync(path)) return null;
+  const data = readFileSync(path);
+  if (!data.subarray(0, MAGIC.length).equals(MAGIC)) {
+    throw new Error(`${path} is not a map corpus file`);
+  }
+  const headerLength = data.readUInt32LE(MAGIC.length);
+  const headerStart = MAGIC.length + 4;
+  const entry = JSON.parse(data.toString('utf8', headerStart, headerStart + headerLength));
+  const walls = unpackWalls(data.subarray(headerStart + headerLength), entry.rows * entry.cols);
+  return { entry, walls };
+}
+
+// Union-find over open cells (4-connected): are cells a and b in the same component?
+export function isConnected(walls, rows, cols, a, b) {
+  if (walls[a] || walls[b]) return false;
+  const parent = new Int32Array(rows * cols);
+  for (let i = 0; i < parent.length; i++) parent[i] = i;
+  const find = (i) => {
+    while (parent[i] !== i) {
+      parent[i] = parent[parent[i]];
+      i = parent[i];
+    }
+    return i;
+  };
+  const union = (i, j) => {
+    const rootI = find(i);
+    const rootJ = find(j);
+    if (rootI !== rootJ) parent[rootI] = rootJ;
+  };
+  for (let row = 0; row < rows; row++) {
+    for (let col = 0; col < cols; col++) {
+      const i = row * cols + col;
+      if (walls[i]) continue;
+      if (col + 1 < cols && !walls[i + 1]) union(i, i + 1);
+      if (row + 1 < rows && !walls[i + cols]) union(i, i + cols);
+    }
+  }
+  return find(a) === find(b);
+}
@@ -1,10 +1,17 @@
 /**
  * Complete Benchmark with ALL algorithms
  * Run: node runFullBenchmark.mjs
+ *      node runFullBenchmark.mjs --sweep [--max-cells 2000000] [--algorithms "A*,BFS"]
+ *      node runFullBenchmark.mjs --dynamic 50 [--edits 3]
+ *
+ * --sweep runs the same map types and start/finish layouts over a geometric
+ * series of grid sizes (both sides doubled each step, starting at
+ * CONFIG.gridSize) up to --max-cells cells.
  */
 
 import { performance } from 'perf_hooks';
-import { writeFileSync, mkdirSync } from 'fs';
+import { parseArgs } from 'util';
+import { writeFileSync, mkdirSync, openSync, writeSync, closeSync } from 'fs';
 import { join, dirname } from 'path';
 import { fileURLToPath } from 'url';
 
@@ -17,21 +24,78 @@ import { breadthFirstSearch } from '../src/pathfindingAlgorithms/breadthFirstSea
 import { depthFirstSearch } from '../src/pathfindingAlgorithms/depthFirstSearch.js';
 import { astar } from '../src/pathfindingAlgorithms/astar.js';
 import { greedyBFS } from '../src/pathfindingAlgorithms/greedyBestFirstSearch.js';
-import { bidirectionalGreedySearch, getNodesInShortestPathOrderBidirectionalGreedySearch } from '../src/pathfindingAlgorithms/bidirectionalGreedySearch.js';
-import { METRIC_TYPES } from '../src/pathfindingAlgorithms/metricSpace/index.js';
+import { jumpPointSearch } from '../src/pathfindingAlgorithms/jumpPointSearch.js';
+import { bidirectionalGreedySearch } from '../src/pathfindingAlgorithms/bidirectionalGreedySearch.js';
+import { bidirectionalAstar, getNodesInShortestPathOrderBidirectional } from '../src/pathfindingAlgorithms/bidirectionalSearch.js';
+import { batchShortestPaths, clearDistanceFieldCache } from '../src/pathfindingAlgorithms/batchQuery.js';
+import { DStarLite } from '../src/pathfindingAlgorithms/dStarLite.js';
+import { compactGridFor, setCompactWall } from '../src/pathfindingAlgorithms/compactGrid.js';
+import {
+  enableInstrumentation, disableInstrumentation, lastRunCounters
+} from '../src/pathfindingAlgorithms/instrumentation.js';
+import { METRIC_TYPES, landmarkTableFor } from '../src/pathfindingAlgorithms/metricSpace/index.js';
 import { randomMaze } from '../src/mazeAlgorithms/randomMaze.js';
 import { horizontalMaze } from '../src/mazeAlgorithms/horizontalMaze.js';
 import { verticalMaze } from '../src/mazeAlgorithms/verticalMaze.js';
 import { recursiveDivisionMaze } from '../src/mazeAlgorithms/recursiveDivision.js';
+import { mulberry32, hashSeed } from '../src/mazeAlgorithms/seededRandom.js';
+import { corpusKey, readCorpusMap, writeCorpusMap, isConnected } from './mapCorpus.mjs';
+import { encodeColumnar } from './columnarExporter.mjs';
 
 // Configuration
 const CONFIG = {
   gridSize: { rows: 25, cols: 50 },
   mapsPerType: 5,
   astarWeights: [0.5, 1.0, 2.0],
-  metrics: [METRIC_TYPES.MANHATTAN, METRIC_TYPES.EUCLIDEAN]
+  metrics: [METRIC_TYPES.MANHATTAN, METRIC_TYPES.EUCLIDEAN, METRIC_TYPES.LANDMARK],
+  warmupRuns: 2,
+  timingSamples: 15  // timed runs per (map, algorithm); Execution_Time_ms is their median
 };
 
+const { values: args } = parseArgs({
+  options: {
+    sweep: { type: 'boolean', default: false },
+    'max-cells': { type: 'string', default: '2000000' },
+    'maps-per-type': { type: 'string' },
+    warmup: { type: 'string' },
+    samples: { type: 'string' },
+    algorithms: { type: 'string' },  // comma-separated name prefixes, e.g. "A*,BFS"
+    'multi-query': { type: 'string' },  // queries per map; switches to the throughput benchmark
+    goals: { type: 'string', default: '4' },  // distinct finish cells shared by those queries
+    dynamic: { type: 'string' },  // wall-edit rounds per map; switches to the replanning benchmark
+    edits: { type: 'string', default: '3' },  // cells toggled per round
+    instrument: { type: 'boolean', default: false },  // one extra counted run per test (not timed)
+    seed: { type: 'string', default: '1' },  // base seed of the map corpus and the query pairs
+    corpus: { type: 'string' },  // corpus directory (default: benchmark/corpus)
+    regenerate: { type: 'boolean', default: false },  // rebuild maps even if they are in the corpus
+  },
+});
+
+// Large grids take seconds per run, so a sweep defaults to fewer timed runs
+if (args.sweep) {
+  CONFIG.warmupRuns = 1;
+  CONFIG.timingSamples = 3;
+}
+if (args['maps-per-type']) CONFIG.mapsPerType = Number(args['maps-per-type']);
+if (args.warmup) CONFIG.warmupRuns = Number(args.warmup);
+if (args.samples) CONFIG.timingSamples = Number(args.samples);
+CONFIG.seed = Number(args.seed);
+
+const CORPUS_DIR = args.corpus || join(__dirname, 'corpus');
+
+// Geometric series of grid sizes: both sides doubled until the cell budget is exceeded
+function gridSizeSeries(base, maxCells) {
+  const sizes = [];
+  for (let scale = 1; base.rows * base.cols * scale * scale <= maxCells; scale *= 2) {
+    sizes.push({ rows: base.rows * scale, cols: base.cols * scale });
+  }
+  return sizes;
+}
+
+const GRID_SIZES = args.sweep
+  ? gridSizeSeries(CONFIG.gridSize, Number(args['max-cells']))
+  : [CONFIG.gridSize];
+
 // Grid utilities
 function createNode(row, col) {
   return {
@@ -69,14 +133,6 @@ function resetGrid(grid) {
   }
 }
 
-function applyWalls(grid, walls) {
-  for (const [row, col] of walls) {
-    if (grid[row] && grid[row][col]) {
-      grid[row][col].isWall = true;
-    }
-  }
-}
-
 function getStartFinishNodes(grid, rows, cols, mapNumber = 1) {
   // Tạo các vị trí khác nhau cho mỗi testcase
   const positions = [
@@ -132,65 +188,86 @@ const MAP_TYPES = {
   RECURSIVE: 'Recursive',
 };
 
+// Maps come from the corpus when present; otherwise they are generated with a
+// PRNG seeded from (seed, type, size, position), checked for start-finish
+// connectivity with union-find, and stored. A rejected candidate is followed by
+// the next one from the same PRNG stream, so the result is still reproducible.
 function generateMap(mapType, rows, cols, mapNumber = 1, maxAttempts = 50) {
-  let attempts = 0;
+  const key = corpusKey(mapType, rows, cols, CONFIG.seed, mapNumber);
+  const stored = args.regenerate ? null : readCorpusMap(CORPUS_DIR, key);
+  if (stored) {
+    console.log(`  ✓ Loaded ${mapType} map from corpus (${key})`);
+    return gridFromWalls(stored.walls, rows, cols, mapNumber);
+  }
   
-  while (attempts < maxAttempts) {
-    attempts++;
+  const random = mulberry32(hashSeed(CONFIG.seed, mapType, rows, cols, mapNumber));
+  const generators = {
+    [MAP_TYPES.RANDOM]: randomMaze,
+    [MAP_TYPES.HORIZONTAL]: horizontalMaze,
+    [MAP_TYPES.VERTICAL]: verticalMaze,
+    [MAP_TYPES.RECURSIVE]: recursiveDivisionMaze,
+  };
+  
+  for (let attempt = 1; attempt <= maxAttempts; attempt++) {
     const grid = createGrid(rows, cols);
     const { startNode, finishNode } = getStartFinishNodes(grid, rows, cols, mapNumber);
-    
-    let walls = [];
-    switch (mapType) {
-      case MAP_TYPES.RANDOM:
-        walls = randomMaze(grid, startNode, finishNode);
-        break;
-      case MAP_TYPES.HORIZONTAL:
-        walls = horizontalMaze(grid, startNode, finishNode);
-        break;
-      case MAP_TYPES.VERTICAL:
-        walls = verticalMaze(grid, startNode, finishNode);
-        break;
-      case MAP_TYPES.RECURSIVE:
-        walls = recursiveDivisionMaze(grid, startNode, finishNode);
-        break;
+    const walls = new Uint8Array(rows * cols);
+    for (const [row, col] of generators[mapType](grid, startNode, finishNode, random)) {
+      if (row >= 0 && row < rows && col >= 0 && col < cols) walls[row * cols + col] = 1;
     }
     
-    applyWalls(grid, walls);
-    resetGrid(grid);
-    const result = breadthFirstSearch(grid, startNode, finishNode);
-    
-    if (result && result.length > 0 && finishNode.previousNode !== null) {
-      console.log(`  ✓ Generated valid ${mapType} map (attempt ${attempts})`);
-      resetGrid(grid);
-      return { grid, startNode, finishNode };
+    const start = startNode.row * cols + startNode.col;
+    const finish = finishNode.row * cols + finishNode.col;
+    if (isConnected(walls, rows, cols, start, finish)) {
+      writeCorpusMap(CORPUS_DIR, {
+        type: mapType, rows, cols, seed: CONFIG.seed, position: mapNumber, attempt,
+        startRow: startNode.row, startCol: startNode.col,
+        finishRow: finishNode.row, finishCol: finishNode.col,
+      }, walls);
+      console.log(`  ✓ Generated valid ${mapType} map (attempt ${attempt}), saved to corpus`);
+      return gridFromWalls(walls, rows, cols, mapNumber);
     }
   }
   
   throw new Error(`Failed to generate valid ${mapType} map after ${maxAttempts} attempts`);
 }
 
-function generateAllMaps(rows, cols, mapsPerType) {
-  const maps = [];
+function gridFromWalls(walls, rows, cols, mapNumber) {
+  const grid = createGrid(rows, cols);
+  for (let row = 0; row < rows; row++) {
+    for (let col = 0; col < cols; col++) {
+      grid[row][col].isWall = walls[row * cols + col] === 1;
+    }
+  }
+  const { startNode, finishNode } = getStartFinishNodes(grid, rows, cols, mapNumber);
+  return { grid, startNode, finishNode };
+}
+
+// Maps are generated one at a time so that only one large grid is alive at once.
+// In a sweep the size is part of the Map_ID, which must stay unique per run.
+function* generateAllMaps(rows, cols, mapsPerType, withSize = false) {
   const types = Object.values(MAP_TYPES);
   
-  console.log(`\n🗺️  Generating ${types.length} map types × ${mapsPerType} maps...\n`);
+  console.log(`\n🗺️  Generating ${types.length} map types × ${mapsPerType} maps (${rows} × ${cols})...\n`);
   
   for (const mapType of types) {
     console.log(`Generating ${mapType} maps...`);
     for (let i = 0; i < mapsPerType; i++) {
       const mapData = generateMap(mapType, rows, cols, i + 1);
-      maps.push({
-        id: `${mapType}_${i + 1}`,
+      // Build the map's CompactGrid (and landmark fields) here so no timed run pays for them
+      const compact = compactGridFor(mapData.grid);
+      if (CONFIG.metrics.includes(METRIC_TYPES.LANDMARK)) landmarkTableFor(compact);
+      yield {
+        id: withSize ? `${mapType}_${i + 1}_${rows}x${cols}` : `${mapType}_${i + 1}`,
         type: mapType,
         number: i + 1,
+        rows,
+        cols,
         ...mapData
-      });
+      };
     }
     console.log(`✓ Completed ${mapsPerType} ${mapType} maps\n`);
   }
-  
-  return maps;
 }
 
 // Benchmark runner
@@ -198,23 +275,40 @@ function runAlgorithm(algorithm, grid, startNode, finishNode, algorithmName, par
   resetGrid(grid);
   
   // Warm-up
-  for (let i = 0; i < 2; i++) {
+  for (let i = 0; i < CONFIG.warmupRuns; i++) {
     resetGrid(grid);
     algorithm(grid, startNode, finishNode, ...Object.values(params));
   }
   
-  // Actual measurement
-  resetGrid(grid);
-  const start = performance.now();
-  const visitedNodes = algorithm(grid, startNode, finishNode, ...Object.values(params));
-  const executionTime = performance.now() - start;
+  // Cost counters come from one separate run, so the timed runs stay uninstrumented
+  let counters = null;
+  if (args.instrument) {
+    resetGrid(grid);
+    enableInstrumentation();
+    algorithm(grid, startNode, finishNode, ...Object.values(params));
+    disableInstrumentation();
+    counters = lastRunCounters();
+  }
+  
+  // Actual measurement: repeated timed runs, grid reset outside the timed region.
+  // Node counts are deterministic, so the last run's output is kept.
+  const timingSamples = [];
+  let visitedNodes;
+  for (let i = 0; i < CONFIG.timingSamples; i++) {
+    resetGrid(grid);
+    const start = performance.now();
+    visitedNodes = algorithm(grid, startNode, finishNode, ...Object.values(params));
+    timingSamples.push(parseFloat((performance.now() - start).toFixed(4)));
+  }
+  const executionTime = median(timingSamples);
   
   let pathLength = 0;
   let nodesVisited = 0;
   let memoryUsage = 0;
   
   // Handle bidirectional search differently
-  if (Array.isArray(visitedNodes) && visitedNodes.length === 3) {
+  // (checked by shape: any search can legitimately visit exactly 3 nodes)
+  if (Array.isArray(visitedNodes) && visitedNodes.length === 3 && typeof visitedNodes[2] === 'boolean') {
     // Bidirectional returns [visitedStart, visitedFinish, found]
     const [visitedStart, visitedFinish, found] = visitedNodes;
     nodesVisited = visitedStart.length + visitedFinish.length;
@@ -222,7 +316,7 @@ function runAlgorithm(algorithm, grid, startNode, finishNode, algorithmName, par
     
     // Calculate actual path length using the same method as visualizer
     if (found) {
-      const shortestPath = getNodesInShortestPathOrderBidirectionalGreedySearch(visitedStart, visitedFinish);
+      const shortestPath = getNodesInShortestPathOrderBidirectional(visitedStart);
       pathLength = shortestPath.length;
     } else {
       pathLength = 0;
@@ -235,6 +329,8 @@ function runAlgorithm(algorithm, grid, startNode, finishNode, algorithmName, par
       nodesVisited,
       memoryUsage,
       executionTime: parseFloat(executionTime.toFixed(3)),
+      timingSamples,
+      counters,
       pathFound: found
     };
   } else if (visitedNodes) {
@@ -250,10 +346,18 @@ function runAlgorithm(algorithm, grid, startNode, finishNode, algorithmName, par
     nodesVisited,
     memoryUsage,
     executionTime: parseFloat(executionTime.toFixed(3)),
+    timingSamples,
+    counters,
     pathFound: pathExists(finishNode)
   };
 }
 
+function median(values) {
+  const sorted = [...values].sort((a, b) => a - b);
+  const mid = Math.floor(sorted.length / 2);
+  return sorted.length % 2 ? sorted[mid] : (sorted[mid - 1] + sorted[mid]) / 2;
+}
+
 // Algorithm configurations
 function getAlgorithmConfigs() {
   const configs = [];
@@ -274,6 +378,15 @@ function getAlgorithmConfigs() {
     }
   }
   
+  // Jump Point Search (4-connected, optimal; only jump points are expanded)
+  for (const metric of CONFIG.metrics) {
+    configs.push({
+      name: `JPS (${metric})`,
+      algorithm: jumpPointSearch,
+      params: { metric, weight: 1 }
+    });
+  }
+  
   // Greedy Best-First Search
   for (const metric of CONFIG.metrics) {
     configs.push({
@@ -292,70 +405,88 @@ function getAlgorithmConfigs() {
     });
   }
   
+  // Bidirectional A* (optimal: stops once min f on either side >= best meeting cost)
+  for (const metric of CONFIG.metrics) {
+    configs.push({
+      name: `Bidirectional A* (${metric})`,
+      algorithm: bidirectionalAstar,
+      params: { metric, weight: 1 }
+    });
+  }
+  
   return configs;
 }
 
-// Main benchmark
-function runBenchmark() {
+// Main benchmark; each map is written to mapDump as soon as it is generated
+function runBenchmark(mapDump) {
   console.log('═'.repeat(80));
   console.log('🚀 PATHFINDING ALGORITHMS BENCHMARK - COMPLETE VERSION');
   console.log('═'.repeat(80));
-  console.log(`Grid Size: ${CONFIG.gridSize.rows} × ${CONFIG.gridSize.cols}`);
+  console.log(`Grid Sizes: ${GRID_SIZES.map(size => `${size.rows} × ${size.cols}`).join(', ')}`);
   console.log(`Maps per type: ${CONFIG.mapsPerType}`);
   console.log(`A* weights: ${CONFIG.astarWeights.join(', ')}`);
   console.log(`Metrics: ${CONFIG.metrics.join(', ')}`);
+  console.log(`Timing: ${CONFIG.warmupRuns} warm-up + ${CONFIG.timingSamples} timed runs per test (median)`);
+  console.log(`Map corpus: ${CORPUS_DIR} (seed ${CONFIG.seed})`);
   console.log('═'.repeat(80));
   
-  const maps = generateAllMaps(CONFIG.gridSize.rows, CONFIG.gridSize.cols, CONFIG.mapsPerType);
-  const algorithmConfigs = getAlgorithmConfigs();
+  const prefixes = args.algorithms ? args.algorithms.split(',').map(prefix => prefix.trim()) : null;
+  const algorithmConfigs = getAlgorithmConfigs()
+    .filter(config => !prefixes || prefixes.some(prefix => config.name.startsWith(prefix)));
   
   console.log(`📊 Total algorithms to test: ${algorithmConfigs.length}\n`);
   
   const results = [];
   let testCount = 0;
-  const totalTests = maps.length * algorithmConfigs.length;
+  const mapsPerSize = Object.values(MAP_TYPES).length * CONFIG.mapsPerType;
+  const totalTests = GRID_SIZES.length * mapsPerSize * algorithmConfigs.length;
   
   console.log(`🔬 Running ${totalTests} tests...\n`);
   
-  for (const map of maps) {
-    console.log(`\n${'─'.repeat(80)}`);
-    console.log(`📍 Testing Map: ${map.id} (${map.type})`);
-    console.log('─'.repeat(80));
+  for (const { rows, cols } of GRID_SIZES) {
+    for (const map of generateAllMaps(rows, cols, CONFIG.mapsPerType, args.sweep)) {
+      mapDump.write(map);
+      console.log(`\n${'─'.repeat(80)}`);
+      console.log(`📍 Testing Map: ${map.id} (${map.type})`);
+      console.log('─'.repeat(80));
     
-    for (const config of algorithmConfigs) {
-      testCount++;
+      for (const config of algorithmConfigs) {
+        testCount++;
       
-      try {
-        const result = runAlgorithm(
-          config.algorithm,
-          map.grid,
-          map.startNode,
-          map.finishNode,
-          config.name,
-          config.params
-        );
+        try {
+          const result = runAlgorithm(
+            config.algorithm,
+            map.grid,
+            map.startNode,
+            map.finishNode,
+            config.name,
+            config.params
+          );
         
-        result.mapId = map.id;
-        result.mapType = map.type;
-        result.mapNumber = map.number;
-        result.startRow = map.startNode.row;
-        result.startCol = map.startNode.col;
-        result.finishRow = map.finishNode.row;
-        result.finishCol = map.finishNode.col;
+          result.mapId = map.id;
+          result.mapType = map.type;
+          result.mapNumber = map.number;
+          result.rows = map.rows;
+          result.cols = map.cols;
+          result.startRow = map.startNode.row;
+          result.startCol = map.startNode.col;
+          result.finishRow = map.finishNode.row;
+          result.finishCol = map.finishNode.col;
         
-        results.push(result);
+          results.push(result);
         
-        const status = result.pathFound ? '✓' : '✗';
-        console.log(
-          `  [${testCount}/${totalTests}] ${status} ${config.name.padEnd(40)} | ` +
-          `Path: ${String(result.pathLength).padStart(4)} | ` +
-          `Visited: ${String(result.nodesVisited).padStart(5)} | ` +
-          `Memory: ${String(result.memoryUsage).padStart(4)} | ` +
-          `Time: ${result.executionTime.toFixed(2)}ms`
-        );
+          const status = result.pathFound ? '✓' : '✗';
+          console.log(
+            `  [${testCount}/${totalTests}] ${status} ${config.name.padEnd(40)} | ` +
+            `Path: ${String(result.pathLength).padStart(4)} | ` +
+            `Visited: ${String(result.nodesVisited).padStart(5)} | ` +
+            `Memory: ${String(result.memoryUsage).padStart(4)} | ` +
+            `Time: ${result.executionTime.toFixed(2)}ms`
+          );
         
-      } catch (error) {
-        console.error(`  ✗ ERROR in ${config.name}: ${error.message}`);
+        } catch (error) {
+          console.error(`  ✗ ERROR in ${config.name}: ${error.message}`);
+        }
       }
     }
   }
@@ -364,31 +495,114 @@ function runBenchmark() {
   console.log(`✅ Benchmark completed: ${testCount} tests run`);
   console.log('═'.repeat(80) + '\n');
   
-  return results;
+  return { results, algorithmCount: algorithmConfigs.length };
 }
 
+// Instrumentation counter -> result column; empty (CSV) or NaN (columnar) without --instrument
+const COUNTER_COLUMNS = {
+  heapPushes: 'Heap_Pushes',
+  heapPops: 'Heap_Pops',
+  stalePops: 'Stale_Pops',
+  heuristicCalls: 'Heuristic_Calls',
+  neighbourArrays: 'Neighbour_Arrays',
+  relaxations: 'Relaxations',
+};
+
 // CSV Export
 function exportToCSV(results) {
   const headers = [
-    'Map_Type', 'Map_Number', 'Map_ID', 
+    'Map_Type', 'Map_Number', 'Map_ID', 'Rows', 'Cols',
     'Start_Row', 'Start_Col', 'Finish_Row', 'Finish_Col',
     'Algorithm_Name', 'Parameters',
-    'Path_Found', 'Path_Length', 'Nodes_Visited', 'Memory_Usage_Nodes', 'Execution_Time_ms'
+    'Path_Found', 'Path_Length', 'Nodes_Visited', 'Memory_Usage_Nodes', 'Execution_Time_ms',
+    'Execution_Time_Samples_ms',
+    ...Object.values(COUNTER_COLUMNS)
   ];
   
   const rows = results.map(r => [
-    r.mapType, r.mapNumber, r.mapId, 
+    r.mapType, r.mapNumber, r.mapId, r.rows, r.cols,
     r.startRow, r.startCol, r.finishRow, r.finishCol,
     r.algorithmName, r.params,
-    r.pathFound ? 'Yes' : 'No', r.pathLength, r.nodesVisited, r.memoryUsage, r.executionTime
+    r.pathFound ? 'Yes' : 'No', r.pathLength, r.nodesVisited, r.memoryUsage, r.executionTime,
+    r.timingSamples.join(';'),
+    ...Object.keys(COUNTER_COLUMNS).map(name => (r.counters ? r.counters[name] : ''))
   ]);
   
   return [
     headers.join(','),
-    ...rows.map(row => row.map(cell => `"${cell}"`).join(','))
+    ...rows.map(row => row.map(csvCell).join(','))
   ].join('\n');
 }
 
+// Columnar binary export: same columns as the CSV, numbers stored as fixed-width
+// values, strings dictionary-encoded, Parameters also split into metric/weight
+const COLUMNAR_SCHEMA = [
+  { name: 'Map_Type', dtype: 'dict', get: r => r.mapType },
+  { name: 'Map_Number', dtype: '<i4', get: r => r.mapNumber },
+  { name: 'Map_ID', dtype: 'dict', get: r => r.mapId },
+  { name: 'Rows', dtype: '<i4', get: r => r.rows },
+  { name: 'Cols', dtype: '<i4', get: r => r.cols },
+  { name: 'Start_Row', dtype: '<i4', get: r => r.startRow },
+  { name: 'Start_Col', dtype: '<i4', get: r => r.startCol },
+  { name: 'Finish_Row', dtype: '<i4', get: r => r.finishRow },
+  { name: 'Finish_Col', dtype: '<i4', get: r => r.finishCol },
+  { name: 'Algorithm_Name', dtype: 'dict', get: r => r.algorithmName },
+  { name: 'Parameters', dtype: 'dict', get: r => r.params },
+  { name: 'metric', dtype: 'dict', get: r => JSON.parse(r.params).metric || '' },
+  { name: 'weight', dtype: '<f8', get: r => JSON.parse(r.params).weight ?? NaN },
+  { name: 'Path_Found', dtype: '|u1', get: r => (r.pathFound ? 1 : 0) },
+  { name: 'Path_Length', dtype: '<i4', get: r => r.pathLength },
+  { name: 'Nodes_Visited', dtype: '<i4', get: r => r.nodesVisited },
+  { name: 'Memory_Usage_Nodes', dtype: '<i4', get: r => r.memoryUsage },
+  { name: 'Execution_Time_ms', dtype: '<f8', get: r => r.executionTime },
+  { name: 'Execution_Time_Samples_ms', dtype: '<f8', width: CONFIG.timingSamples, get: r => r.timingSamples },
+  ...Object.entries(COUNTER_COLUMNS).map(([counter, name]) => (
+    { name, dtype: '<f8', get: r => (r.counters ? r.counters[counter] : NaN) }
+  )),
+];
+
+function exportToColumnar(results) {
+  return encodeColumnar(results, COLUMNAR_SCHEMA);
+}
+
+// Map dump: walls as a row-major '0'/'1' string, read by grid_engine.load_maps
+// to replay the same maps in the Python reference engine
+function dumpMap(map) {
+  return {
+    id: map.id,
+    type: map.type,
+    number: map.number,
+    rows: map.rows,
+    cols: map.cols,
+    startRow: map.startNode.row,
+    startCol: map.startNode.col,
+    finishRow: map.finishNode.row,
+    finishCol: map.finishNode.col,
+    walls: map.grid.map(row => row.map(node => (node.isWall ? '1' : '0')).join('')).join(''),
+  };
+}
+
+// JSON array of map dumps written one map at a time, so a sweep never holds
+// the wall strings of every size in memory
+function openMapDump(path) {
+  const fd = openSync(path, 'w');
+  let count = 0;
+  return {
+    write(map) {
+      writeSync(fd, (count++ === 0 ? '[' : ',') + JSON.stringify(dumpMap(map)));
+    },
+    close() {
+      writeSync(fd, count === 0 ? '[]' : ']');
+      closeSync(fd);
+    },
+  };
+}
+
+// Quote a CSV cell, escaping embedded quotes (the Parameters column holds JSON)
+function csvCell(cell) {
+  return `"${String(cell).replace(/"/g, '""')}"`;
+}
+
 function generateSummaryCSV(results) {
   const grouped = {};
   
@@ -430,12 +644,252 @@ function generateSummaryCSV(results) {
   ].join('\n');
 }
 
-// Run and save
-console.log('Starting COMPLETE benchmark with ALL algorithms...\n');
+// Multi-query throughput: many (start, finish) pairs per map toward a few
+// shared goals, answered one search at a time (resetGrid + search per pair)
+// versus one batchShortestPaths call, with a cold and a warm field cache.
+// Pairs are drawn from a PRNG seeded like the maps, so runs are repeatable.
+function randomOpenCells(grid, count, random) {
+  const open = [];
+  for (const row of grid) {
+    for (const node of row) {
+      if (!node.isWall) open.push(node);
+    }
+  }
+  return Array.from({ length: count }, () => open[Math.floor(random() * open.length)]);
+}
 
-const results = runBenchmark();
+function makeQueries(grid, queryCount, goalCount, random) {
+  const goals = randomOpenCells(grid, goalCount, random);
+  const starts = randomOpenCells(grid, queryCount, random);
+  return starts
+    .map((start, i) => [start, goals[i % goalCount]])
+    .filter(([start, finish]) => start !== finish);
+}
 
-// Save results
+function timeMedian(run, before = () => {}) {
+  for (let i = 0; i < CONFIG.warmupRuns; i++) {
+    before();
+    run();
+  }
+  const samples = [];
+  let output;
+  for (let i = 0; i < CONFIG.timingSamples; i++) {
+    before();
+    const start = performance.now();
+    output = run();
+    samples.push(performance.now() - start);
+  }
+  return { time: median(samples), output };
+}
+
+function perQueryLengths(algorithm, grid, queries, params = []) {
+  return queries.map(([startNode, finishNode]) => {
+    resetGrid(grid);
+    startNode.isStart = true;
+    algorithm(grid, startNode, finishNode, ...params);
+    const length = pathExists(finishNode) ? getPathLength(finishNode) : 0;
+    startNode.isStart = false;
+    return length;
+  });
+}
+
+function runMultiQueryBenchmark(queryCount, goalCount) {
+  console.log('═'.repeat(80));
+  console.log('🚀 MULTI-QUERY THROUGHPUT BENCHMARK');
+  console.log('═'.repeat(80));
+  console.log(`Grid Sizes: ${GRID_SIZES.map(size => `${size.rows} × ${size.cols}`).join(', ')}`);
+  console.log(`Queries per map: ${queryCount}, distinct goals: ${goalCount}`);
+  console.log(`Timing: ${CONFIG.warmupRuns} warm-up + ${CONFIG.timingSamples} timed runs per method (median)`);
+  console.log('═'.repeat(80));
+
+  const results = [];
+  for (const { rows, cols } of GRID_SIZES) {
+    for (const map of generateAllMaps(rows, cols, CONFIG.mapsPerType, args.sweep)) {
+      map.startNode.isStart = false;
+      const random = mulberry32(hashSeed(CONFIG.seed, 'multi-query', map.id, queryCount, goalCount));
+      const queries = makeQueries(map.grid, queryCount, goalCount, random);
+      const methods = [
+        { name: 'BFS per query', run: () => perQueryLengths(breadthFirstSearch, map.grid, queries) },
+        { name: 'A* per query (w=1, manhattan)', run: () => perQueryLengths(astar, map.grid, queries, [METRIC_TYPES.MANHATTAN, 1]) },
+        { name: 'Batch (cold cache)', run: () => batchShortestPaths(map.grid, queries), before: () => clearDistanceFieldCache(map.grid) },
+        { name: 'Batch (warm cache)', run: () => batchShortestPaths(map.grid, queries) },
+      ];
+
+      console.log(`\n📍 ${map.id}: ${queries.length} queries`);
+      let reference = null;
+      for (const method of methods) {
+        const { time, output } = timeMedian(method.run, method.before);
+        const lengths = Array.isArray(output)
+          ? output
+          : output.results.map(r => (r.distance === Infinity ? 0 : r.distance + 1));
+        if (!reference) reference = lengths;
+        const mismatches = lengths.filter((length, i) => length !== reference[i]).length;
+        const result = {
+          mapType: map.type, mapId: map.id, rows: map.rows, cols: map.cols,
+          queries: queries.length, goals: goalCount, method: method.name,
+          totalTime: time, qps: queries.length / (time / 1000),
+          fieldsComputed: output.fieldsComputed ?? '', fieldsReused: output.fieldsReused ?? '',
+          mismatches,
+        };
+        results.push(result);
+        console.log(
+          `  ${method.name.padEnd(32)} | Time: ${time.toFixed(2).padStart(9)}ms | ` +
+          `QPS: ${result.qps.toFixed(0).padStart(9)}` +
+          (mismatches ? ` | ✗ ${mismatches} path lengths differ from BFS` : '')
+        );
+      }
+      map.startNode.isStart = true;
+    }
+  }
+  return results;
+}
+
+function exportMultiQueryCSV(results) {
+  const headers = [
+    'Map_Type', 'Map_ID', 'Rows', 'Cols', 'Queries', 'Distinct_Goals', 'Method',
+    'Total_Time_ms', 'Queries_Per_Second', 'Fields_Computed', 'Fields_Reused', 'Path_Length_Mismatches'
+  ];
+  const rows = results.map(r => [
+    r.mapType, r.mapId, r.rows, r.cols, r.queries, r.goals, r.method,
+    r.totalTime.toFixed(4), r.qps.toFixed(1), r.fieldsComputed, r.fieldsReused, r.mismatches
+  ]);
+  return [headers.join(','), ...rows.map(row => row.map(csvCell).join(','))].join('\n');
+}
+
+// Dynamic obstacles: each round toggles a few cells (half of them on the
+// current shortest path, so most rounds force a detour), then every method
+// answers the same start/finish query. D* Lite repairs its previous search;
+// the other methods start over. One timed run per round, since an incremental
+// replan cannot be repeated on the same state.
+function pickEdits(random, walls, path, start, finish, count) {
+  const edits = [];
+  for (let i = 0; i < count; i++) {
+    let index;
+    if (random() < 0.5 && path.length > 2) {
+      index = path[1 + Math.floor(random() * (path.length - 2))];
+    } else {
+      index = Math.floor(random() * walls.length);
+    }
+    if (index !== start && index !== finish && !edits.includes(index)) edits.push(index);
+  }
+  return edits;
+}
+
+function timeOnce(run) {
+  const begin = performance.now();
+  const output = run();
+  return { time: performance.now() - begin, output };
+}
+
+function percentile(values, p) {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))];
+}
+
+function runDynamicBenchmark(rounds, editsPerRound) {
+  console.log('═'.repeat(80));
+  console.log('🚧 DYNAMIC OBSTACLES REPLANNING BENCHMARK');
+  console.log('═'.repeat(80));
+  console.log(`Grid Sizes: ${GRID_SIZES.map(size => `${size.rows} × ${size.cols}`).join(', ')}`);
+  console.log(`Rounds per map: ${rounds}, cells toggled per round: ${editsPerRound}`);
+  console.log('═'.repeat(80));
+
+  const results = [];
+  for (const { rows, cols } of GRID_SIZES) {
+    for (const map of generateAllMaps(rows, cols, CONFIG.mapsPerType, args.sweep)) {
+      const { grid, startNode, finishNode } = map;
+      const start = startNode.row * cols + startNode.col;
+      const finish = finishNode.row * cols + finishNode.col;
+      const walls = new Uint8Array(rows * cols);
+      for (const row of grid) {
+        for (const node of row) walls[node.row * cols + node.col] = node.isWall ? 1 : 0;
+      }
+
+      const planner = new DStarLite(rows, cols, walls, start, finish);
+      let path = planner.plan().path;  // initial full plan, not timed
+      const fromScratch = (algorithm, params = []) => () => {
+        resetGrid(grid);
+        const visited = algorithm(grid, startNode, finishNode, ...params) || [];
+        const distance = pathExists(finishNode) ? getPathLength(finishNode) - 1 : Infinity;
+        return { distance, expanded: visited.length };
+      };
+      const methods = [
+        { name: 'BFS (from scratch)', run: fromScratch(breadthFirstSearch) },
+        { name: 'A* (from scratch, w=1, manhattan)', run: fromScratch(astar, [METRIC_TYPES.MANHATTAN, 1]) },
+        {
+          name: 'D* Lite (from scratch)',
+          run: () => {
+            const result = new DStarLite(rows, cols, walls, start, finish).plan();
+            return { distance: result.distance, expanded: result.expanded.length };
+          },
+        },
+        {
+          name: 'D* Lite (incremental)',
+          run: () => {
+            const result = planner.plan();
+            path = result.path;
+            return { distance: result.distance, expanded: result.expanded.length };
+          },
+        },
+      ];
+      for (let i = 0; i < CONFIG.warmupRuns; i++) {
+        for (const method of methods.slice(0, 3)) method.run();
+      }
+
+      const samples = methods.map(() => ({ times: [], expanded: 0, mismatches: 0 }));
+      const random = mulberry32(hashSeed(CONFIG.seed, 'dynamic', map.id));
+      for (let round = 0; round < rounds; round++) {
+        for (const index of pickEdits(random, walls, path, start, finish, editsPerRound)) {
+          walls[index] ^= 1;
+          grid[(index / cols) | 0][index % cols].isWall = walls[index] === 1;
+          setCompactWall(grid, (index / cols) | 0, index % cols, walls[index] === 1);
+          planner.setWall(index, walls[index] === 1);
+        }
+        let reference = null;
+        methods.forEach((method, m) => {
+          const { time, output } = timeOnce(method.run);
+          if (reference === null) reference = output.distance;
+          samples[m].times.push(time);
+          samples[m].expanded += output.expanded;
+          if (output.distance !== reference) samples[m].mismatches++;
+        });
+      }
+
+      console.log(`\n📍 ${map.id}: ${rounds} rounds × ${editsPerRound} edits`);
+      methods.forEach((method, m) => {
+        const { times, expanded, mismatches } = samples[m];
+        const result = {
+          mapType: map.type, mapId: map.id, rows: map.rows, cols: map.cols,
+          rounds, edits: editsPerRound, method: method.name,
+          medianTime: median(times), p95Time: percentile(times, 0.95),
+          meanTime: times.reduce((a, b) => a + b, 0) / times.length,
+          meanExpanded: expanded / rounds, mismatches,
+        };
+        results.push(result);
+        console.log(
+          `  ${method.name.padEnd(36)} | Median: ${result.medianTime.toFixed(3).padStart(8)}ms | ` +
+          `p95: ${result.p95Time.toFixed(3).padStart(8)}ms | Expanded: ${result.meanExpanded.toFixed(0).padStart(7)}` +
+          (mismatches ? ` | ✗ ${mismatches} rounds with a path length different from BFS` : '')
+        );
+      });
+    }
+  }
+  return results;
+}
+
+function exportDynamicCSV(results) {
+  const headers = [
+    'Map_Type', 'Map_ID', 'Rows', 'Cols', 'Rounds', 'Edits_Per_Round', 'Method',
+    'Median_Replan_ms', 'P95_Replan_ms', 'Mean_Replan_ms', 'Mean_Expanded', 'Path_Length_Mismatches'
+  ];
+  const rows = results.map(r => [
+    r.mapType, r.mapId, r.rows, r.cols, r.rounds, r.edits, r.method,
+    r.medianTime.toFixed(4), r.p95Time.toFixed(4), r.meanTime.toFixed(4), r.meanExpanded.toFixed(1), r.mismatches
+  ]);
+  return [headers.join(','), ...rows.map(row => row.map(csvCell).join(','))].join('\n');
+}
+
+// Run and save
 const timestamp = new Date().toISOString().replace(/[:.]/g, '-').slice(0, -5);
 const outputDir = join(__dirname, 'results');
 
@@ -443,14 +897,43 @@ try {
   mkdirSync(outputDir, { recursive: true });
 } catch (e) {}
 
-const fullCSV = exportToCSV(results);
-const fullPath = join(outputDir, `benchmark_FULL_results_${timestamp}.csv`);
-writeFileSync(fullPath, fullCSV, 'utf8');
-console.log(`\n✓ Saved full results to: ${fullPath}`);
+if (args.dynamic) {
+  const dynamicResults = runDynamicBenchmark(Number(args.dynamic), Number(args.edits));
+  const dynamicPath = join(outputDir, `benchmark_DYNAMIC_results_${timestamp}.csv`);
+  writeFileSync(dynamicPath, exportDynamicCSV(dynamicResults), 'utf8');
+  console.log(`\n✓ Saved dynamic obstacles results to: ${dynamicPath}\n`);
+} else if (args['multi-query']) {
+  const multiResults = runMultiQueryBenchmark(Number(args['multi-query']), Number(args.goals));
+  const multiPath = join(outputDir, `benchmark_MULTI_results_${timestamp}.csv`);
+  writeFileSync(multiPath, exportMultiQueryCSV(multiResults), 'utf8');
+  console.log(`\n✓ Saved multi-query results to: ${multiPath}\n`);
+} else {
+  runFullBenchmark();
+}
+
+function runFullBenchmark() {
+  console.log('Starting COMPLETE benchmark with ALL algorithms...\n');
+
+  const mapsPath = join(outputDir, `benchmark_FULL_maps_${timestamp}.json`);
+  const mapDump = openMapDump(mapsPath);
+  const { results, algorithmCount } = runBenchmark(mapDump);
+  mapDump.close();
 
-const summaryCSV = generateSummaryCSV(results);
-const summaryPath = join(outputDir, `benchmark_FULL_summary_${timestamp}.csv`);
-writeFileSync(summaryPath, summaryCSV, 'utf8');
-console.log(`✓ Saved summary to: ${summaryPath}`);
+  const fullCSV = exportToCSV(results);
+  const fullPath = join(outputDir, `benchmark_FULL_results_${timestamp}.csv`);
+  writeFileSync(fullPath, fullCSV, 'utf8');
+  console.log(`\n✓ Saved full results to: ${fullPath}`);
 
-console.log('\n🎉 COMPLETE Benchmark finished! All 14 algorithms tested.\n');
+  const columnarPath = join(outputDir, `benchmark_FULL_results_${timestamp}.pfcol`);
+  writeFileSync(columnarPath, exportToColumnar(results));
+  console.log(`✓ Saved columnar results to: ${columnarPath}`);
+
+  console.log(`✓ Saved maps to: ${mapsPath}`);
+
+  const summaryCSV = generateSummaryCSV(results);
+  const summaryPath = join(outputDir, `benchmark_FULL_summary_${timestamp}.csv`);
+  writeFileSync(summaryPath, summaryCSV, 'utf8');
+  console.log(`✓ Saved summary to: ${summaryPath}`);
+
+  console.log(`\n🎉 COMPLETE Benchmark finished! ${algorithmCount} algorithm configurations tested.\n`);
+}
@@ -1,11 +1,13 @@
 let walls;
-export function horizontalMaze(grid, startNode, finishNode) {
+let random;
+export function horizontalMaze(grid, startNode, finishNode, randomSource = Math.random) {
   if (!startNode || !finishNode || startNode === finishNode) {
     return false;
   }
   let vertical = range(grid[0].length);
   let horizontal = range(grid.length);
   walls = [];
+  random = randomSource;
   getHorizontalWalls(vertical, horizontal, startNode, finishNode);
   return walls;
 }
@@ -23,7 +25,7 @@ function getHorizontalWalls(vertical, horizontal, startNode, finishNode) {
     return;
   }
 
-  let choice = Math.floor(Math.random() * 2);
+  let choice = Math.floor(random() * 2);
   for (let num of horizontal) {
     if (choice === 0 && num % 2 !== 0) {
       addWall(num, vertical, startNode, finishNode);
@@ -48,7 +50,7 @@ function addWall(num, vertical, startNode, finishNode) {
     tempWalls.push([num, temp]);
   }
   if (!isStartFinish) {
-    tempWalls.splice(Math.floor(Math.random() * tempWalls.length), 1);
+    tempWalls.splice(Math.floor(random() * tempWalls.length), 1);
   }
   for (let wall of tempWalls) {
     walls.push(wall);
@@ -1,4 +1,4 @@
-export function randomMaze(grid, startNode, finishNode) {
+export function randomMaze(grid, startNode, finishNode, random = Math.random) {
   if (!startNode || !finishNode || startNode === finishNode) {
     return false;
   }
@@ -10,11 +10,11 @@ export function randomMaze(grid, startNode, finishNode) {
         (row === finishNode.row && col === finishNode.col)
       )
         continue;
-      if (Math.random() < 0.33) {
+      if (random() < 0.33) {
         walls.push([row, col]);
       }
     }
   }
-  walls.sort(() => Math.random() - 0.5);
+  walls.sort(() => random() - 0.5);
   return walls;
 }
@@ -1,11 +1,13 @@
 let walls;
-export function recursiveDivisionMaze(grid, startNode, finishNode) {
+let random;
+export function recursiveDivisionMaze(grid, startNode, finishNode, randomSource = Math.random) {
   if (!startNode || !finishNode || startNode === finishNode) {
     return false;
   }
   let vertical = range(grid[0].length);
   let horizontal = range(grid.length);
   walls = [];
+  random = randomSource;
   getRecursiveWalls(vertical, horizontal, grid, startNode, finishNode);
   return walls;
 }
@@ -74,8 +76,8 @@ function getRecursiveWalls(vertical, horizontal, grid, startNode, finishNode) {
 function generateOddRandomNumber(array) {
   let max = array.length - 1;
   let randomNum =
-    Math.floor(Math.random() * (max / 2)) +
-    Math.floor(Math.random() * (max / 2));
+    Math.floor(random() * (max / 2)) +
+    Math.floor(random() * (max / 2));
   if (randomNum % 2 === 0) {
     if (randomNum === max) {
       randomNum -= 1;
@@ -127,8 +129,8 @@ function addWall(dir, num, vertical, horizontal, startNode, finishNode) {
 
 function generateRandomNumber(max) {
   let randomNum =
-    Math.floor(Math.random() * (max / 2)) +
-    Math.floor(Math.random() * (max / 2));
+    Math.floor(random() * (max / 2)) +
+    Math.floor(random() * (max / 2));
   if (randomNum % 2 !== 0) {
     if (randomNum === max) {
       randomNum -= 1;
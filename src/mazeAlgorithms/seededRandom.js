@@ -0,0 +1,25 @@
+// Seeded PRNG for benchmark runs that must be repeatable: same seed, same
+// sequence, same maze. Each maze generator takes an optional `random` function
+// and falls back to Math.random.
+
+// mulberry32: 32-bit state, uniform floats in [0, 1) like Math.random
+export function mulberry32(seed) {
+  let state = seed >>> 0;
+  return function random() {
+    state = (state + 0x6d2b79f5) >>> 0;
+    let t = state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+// 32-bit FNV-1a hash of the parts, to derive one seed per use from a base seed
+export function hashSeed(...parts) {
+  let hash = 0x811c9dc5;
+  for (const char of parts.join('|')) {
+    hash ^= char.charCodeAt(0);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+}
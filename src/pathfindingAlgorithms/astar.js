@@ -1,12 +1,17 @@
 import TinyQueue from 'tinyqueue';
 import { getHeuristicFunction, METRIC_TYPES } from './metricSpace/index.js';
+import { beginRun, countedHeuristic, neighbourBuffer } from './instrumentation.js';
+import { compactGridFor, nodeAt, ORDER_RDLU } from './compactGrid.js';
 
 export function astar(grid, startNode, finishNode, metricType = METRIC_TYPES.MANHATTAN, weight = 1) {
   if (!startNode || !finishNode || startNode === finishNode) {
     return false;
   }
   
-  const heuristic = getHeuristicFunction(metricType, weight);
+  const probe = beginRun();
+  const heuristic = countedHeuristic(getHeuristicFunction(metricType, weight, grid), probe);
+  const compact = compactGridFor(grid);
+  const neighbours = neighbourBuffer(probe); // reused for every expansion
   
   let visitedNodesInOrder = []; //closed list
   let maxMemoryUsage = 0; // Track memory usage
@@ -18,12 +23,17 @@ export function astar(grid, startNode, finishNode, metricType = METRIC_TYPES.MAN
   const compare = (a, b) => a.totalDistance - b.totalDistance;
   let openList = new TinyQueue([startNode], compare);
   maxMemoryUsage = openList.length;
+  if (probe) probe.heapPushes++;
 
   while (openList.length > 0) {
     let closestNode = openList.pop();
+    if (probe) probe.heapPops++;
     
     // Skip if already visited (allows duplicates in queue)
-    if (closestNode.isVisited) continue;
+    if (closestNode.isVisited) {
+      if (probe) probe.stalePops++;
+      continue;
+    }
     
     if (closestNode === finishNode) {
       visitedNodesInOrder.maxMemoryUsage = maxMemoryUsage;
@@ -33,8 +43,12 @@ export function astar(grid, startNode, finishNode, metricType = METRIC_TYPES.MAN
     closestNode.isVisited = true;
     visitedNodesInOrder.push(closestNode);
 
-    let neighbours = getNeighbours(closestNode, grid);
-    for (let neighbour of neighbours) {
+    const count = compact.neighbours(
+      compact.index(closestNode.row, closestNode.col), neighbours, ORDER_RDLU
+    );
+    for (let k = 0; k < count; k++) {
+      const neighbour = nodeAt(grid, neighbours[k]);
+      if (neighbour.isVisited) continue;
       let distance = closestNode.distance + 1;
       //f(n) = g(n) + h(n)
       if (distance < neighbour.distance) {
@@ -42,6 +56,10 @@ export function astar(grid, startNode, finishNode, metricType = METRIC_TYPES.MAN
         neighbour.totalDistance = distance + heuristic(neighbour, finishNode);
         neighbour.previousNode = closestNode;
         openList.push(neighbour);
+        if (probe) {
+          probe.relaxations++;
+          probe.heapPushes++;
+        }
       }
     }
     
@@ -53,18 +71,6 @@ export function astar(grid, startNode, finishNode, metricType = METRIC_TYPES.MAN
   return visitedNodesInOrder;
 }
 
-function getNeighbours(node, grid) {
-  let neighbours = [];
-  let { row, col } = node;
-  if (col !== grid[0].length - 1) neighbours.push(grid[row][col + 1]);
-  if (row !== grid.length - 1) neighbours.push(grid[row + 1][col]);
-  if (col !== 0) neighbours.push(grid[row][col - 1]);
-  if (row !== 0) neighbours.push(grid[row - 1][col]);
-  return neighbours.filter(
-    (neighbour) => !neighbour.isWall && !neighbour.isVisited
-  );
-}
-
 export function getNodesInShortestPathOrderAstar(finishNode) {
   let nodesInShortestPathOrder = [];
   let currentNode = finishNode;
@@ -0,0 +1,147 @@
+import { compactGridFor, nodeAt, UNREACHED } from './compactGrid.js';
+
+// Batched shortest-path queries on one map. Moves are 4-connected with unit
+// cost, so d(a, b) = d(b, a): one BFS distance field from an endpoint answers
+// every query that shares it. Pairs are grouped by their most shared endpoint
+// (the finish on ties), one field is computed per distinct endpoint, and each
+// path is read off by walking the field downhill from the other endpoint.
+// Fields are cached per map across calls (least recently used evicted first)
+// and dropped when the walls change.
+
+export const DEFAULT_FIELD_CACHE_SIZE = 32;
+
+let fieldCacheSize = DEFAULT_FIELD_CACHE_SIZE;
+const fieldCaches = new WeakMap(); // CompactGrid -> { wallVersion, fields: Map(source -> Int32Array) }
+const neighbours = new Int32Array(4);
+let queue = new Int32Array(0);
+
+/**
+ * Answer a list of [startNode, finishNode] pairs on `grid`. Returns
+ * { results, fieldsComputed, fieldsReused } where results[i] is
+ * { distance, path } for pairs[i]: path is an Int32Array of flat indices
+ * (row * cols + col) from start to finish, empty with distance Infinity if
+ * the finish cannot be reached.
+ */
+export function batchShortestPaths(grid, pairs) {
+  const compact = compactGridFor(grid);
+  const cache = fieldCacheFor(compact);
+  const endpoints = pairs.map(([startNode, finishNode]) => [
+    compact.index(startNode.row, startNode.col),
+    compact.index(finishNode.row, finishNode.col),
+  ]);
+
+  const shared = new Map();
+  for (const [start, finish] of endpoints) {
+    shared.set(start, (shared.get(start) || 0) + 1);
+    shared.set(finish, (shared.get(finish) || 0) + 1);
+  }
+
+  // Group by field source so each field is fetched (or computed) once per call
+  const groups = new Map();
+  endpoints.forEach(([start, finish], i) => {
+    const source = shared.get(start) > shared.get(finish) ? start : finish;
+    if (!groups.has(source)) groups.set(source, []);
+    groups.get(source).push(i);
+  });
+
+  const results = new Array(pairs.length);
+  let fieldsComputed = 0;
+  let fieldsReused = 0;
+  for (const [source, queries] of groups) {
+    let field = cache.fields.get(source);
+    if (field) {
+      cache.fields.delete(source);
+      fieldsReused++;
+    } else {
+      field = distanceField(compact, source);
+      fieldsComputed++;
+    }
+    cache.fields.set(source, field);
+    evict(cache.fields);
+
+    for (const i of queries) {
+      const [start, finish] = endpoints[i];
+      results[i] = source === finish
+        ? walkDownhill(compact, field, start)
+        : reversed(walkDownhill(compact, field, finish));
+    }
+  }
+  return { results, fieldsComputed, fieldsReused };
+}
+
+export function getNodesInShortestPathOrderBatch(grid, result) {
+  return Array.from(result.path, index => nodeAt(grid, index));
+}
+
+export function setDistanceFieldCacheSize(size) {
+  fieldCacheSize = size;
+}
+
+export function clearDistanceFieldCache(grid) {
+  fieldCaches.delete(compactGridFor(grid));
+}
+
+function fieldCacheFor(compact) {
+  let cache = fieldCaches.get(compact);
+  if (!cache || cache.wallVersion !== compact.wallVersion) {
+    cache = { wallVersion: compact.wallVersion, fields: new Map() };
+    fieldCaches.set(compact, cache);
+  }
+  return cache;
+}
+
+function evict(fields) {
+  for (const source of fields.keys()) {
+    if (fields.size <= fieldCacheSize) break;
+    fields.delete(source);
+  }
+}
+
+// BFS distances to `source`; walls and unreachable cells stay UNREACHED
+function distanceField(compact, source) {
+  const field = new Int32Array(compact.size).fill(UNREACHED);
+  if (queue.length < compact.size) queue = new Int32Array(compact.size);
+  field[source] = 0;
+  queue[0] = source;
+  let head = 0;
+  let tail = 1;
+  while (head < tail) {
+    const node = queue[head++];
+    const next = field[node] + 1;
+    const count = compact.neighbours(node, neighbours);
+    for (let k = 0; k < count; k++) {
+      if (field[neighbours[k]] === UNREACHED) {
+        field[neighbours[k]] = next;
+        queue[tail++] = neighbours[k];
+      }
+    }
+  }
+  return field;
+}
+
+// Path from `from` to the field's source, one step to a neighbour one closer each time
+function walkDownhill(compact, field, from) {
+  const distance = field[from];
+  if (distance === UNREACHED) {
+    return { distance: Infinity, path: new Int32Array(0) };
+  }
+  const path = new Int32Array(distance + 1);
+  let node = from;
+  path[0] = node;
+  for (let step = 1; step <= distance; step++) {
+    const count = compact.neighbours(node, neighbours);
+    for (let k = 0; k < count; k++) {
+      if (field[neighbours[k]] === distance - step) {
+        node = neighbours[k];
+        break;
+      }
+    }
+    path[step] = node;
+  }
+  return { distance, path };
+}
+
+function reversed(result) {
+  result.path.reverse();
+  return result;
+}
@@ -0,0 +1,241 @@
+import { compactGridFor, nodeAt, NO_PARENT, UNREACHED } from './compactGrid.js';
+import { IndexHeap } from './indexHeap.js';
+import { getIndexHeuristicFunction, METRIC_TYPES } from './metricSpace/index.js';
+import { beginRun, countedHeuristic } from './instrumentation.js';
+
+// Bidirectional search on a CompactGrid: one IndexHeap per direction, parents
+// and distances in the grid's typed arrays (forward) and its sibling (backward).
+//
+// GREEDY expands one node per side per iteration, ordered by the heuristic to
+// the other end, and stops as soon as the frontiers touch (not optimal).
+// ASTAR expands the side with the smaller open list, ordered by g + h, and
+// keeps the best meeting cost mu seen so far; it stops once the smallest f on
+// either side is >= mu, which makes the path optimal for a consistent
+// heuristic (manhattan/euclidean with weight <= 1).
+//
+// Returns [visitedStart, visitedFinish, found] like bidirectionalGreedySearch;
+// visitedStart also carries maxMemoryUsage and shortestPath.
+export const BIDIRECTIONAL_MODES = {
+  GREEDY: 'greedy',
+  ASTAR: 'astar',
+};
+
+// Reused between queries: searches are synchronous and never nested
+const forwardHeap = new IndexHeap();
+const backwardHeap = new IndexHeap();
+const neighbours = new Int32Array(4);
+
+export function bidirectionalSearch(
+  grid,
+  startNode,
+  finishNode,
+  metricType = METRIC_TYPES.MANHATTAN,
+  weight = 1,
+  mode = BIDIRECTIONAL_MODES.GREEDY
+) {
+  if (!startNode || !finishNode || startNode === finishNode) {
+    return false;
+  }
+
+  const forward = compactGridFor(grid);
+  const backward = forward.sibling();
+  forward.reset();
+  backward.reset();
+  forwardHeap.clear();
+  backwardHeap.clear();
+
+  const probe = beginRun();
+  const heuristic = countedHeuristic(getIndexHeuristicFunction(metricType, weight, forward), probe);
+  const start = forward.index(startNode.row, startNode.col);
+  const finish = forward.index(finishNode.row, finishNode.col);
+  const search = mode === BIDIRECTIONAL_MODES.ASTAR ? searchAstar : searchGreedy;
+  const result = search(forward, backward, start, finish, heuristic, probe);
+
+  const visitedStart = toNodes(grid, result.visitedStart, forward, 'start');
+  const visitedFinish = toNodes(grid, result.visitedFinish, backward, 'finish');
+  visitedStart.maxMemoryUsage = result.maxMemoryUsage;
+  visitedStart.shortestPath = [];
+
+  const found = result.meetStart !== NO_PARENT;
+  if (found) {
+    for (const index of forward.pathTo(result.meetStart)) {
+      visitedStart.shortestPath.push(nodeAt(grid, index));
+    }
+    for (let index = result.meetFinish; index !== NO_PARENT; index = backward.getParent(index)) {
+      visitedStart.shortestPath.push(nodeAt(grid, index));
+    }
+    if (result.shared !== NO_PARENT) {
+      // One side reached a node the other had labelled: only that node is
+      // the intersection, and it keeps the labelling side's visitedFrom and
+      // distance, as in the original implementation
+      const owner = result.sharedFrom === 'start' ? forward : backward;
+      const node = nodeAt(grid, result.shared);
+      node.isIntersection = true;
+      node.visitedFrom = result.sharedFrom;
+      node.distance = owner.getDistance(result.shared);
+    } else {
+      nodeAt(grid, result.meetStart).isIntersection = true;
+      if (result.meetFinish !== NO_PARENT) nodeAt(grid, result.meetFinish).isIntersection = true;
+    }
+  }
+  return [visitedStart, visitedFinish, found];
+}
+
+export function bidirectionalAstar(grid, startNode, finishNode, metricType = METRIC_TYPES.MANHATTAN, weight = 1) {
+  return bidirectionalSearch(grid, startNode, finishNode, metricType, weight, BIDIRECTIONAL_MODES.ASTAR);
+}
+
+export function getNodesInShortestPathOrderBidirectional(visitedStart) {
+  return (visitedStart && visitedStart.shortestPath) || [];
+}
+
+function toNodes(grid, indices, side, visitedFrom) {
+  const nodes = new Array(indices.length);
+  for (let i = 0; i < indices.length; i++) {
+    const node = nodeAt(grid, indices[i]);
+    node.isVisited = true;
+    node.distance = side.getDistance(indices[i]);
+    node.visitedFrom = visitedFrom;
+    nodes[i] = node;
+  }
+  return nodes;
+}
+
+function isNeighbour(a, b, cols) {
+  const rowDiff = Math.abs(((a / cols) | 0) - ((b / cols) | 0));
+  const colDiff = Math.abs((a % cols) - (b % cols));
+  return rowDiff + colDiff === 1;
+}
+
+// Same expansion order, tie-breaking and meeting rules as the original
+// sort/shift implementation: both sides share one closed set, a node is
+// labelled by at most one side, and the search ends when a side reaches a
+// node the other side has labelled (or the two popped nodes are adjacent).
+function searchGreedy(forward, backward, start, finish, heuristic, probe) {
+  const visitedStart = [];
+  const visitedFinish = [];
+  let maxMemoryUsage = 0;
+  // shared: the node both sides labelled (NO_PARENT when the popped nodes
+  // met as neighbours); sharedFrom: the side that labelled it first
+  const done = (meetStart, meetFinish, shared = NO_PARENT, sharedFrom = null) => ({
+    visitedStart, visitedFinish, meetStart, meetFinish, shared, sharedFrom, maxMemoryUsage,
+  });
+
+  forward.setDistance(start, 0);
+  backward.setDistance(finish, 0);
+  forwardHeap.push(start, heuristic(start, finish));
+  backwardHeap.push(finish, heuristic(finish, start));
+  if (probe) probe.heapPushes += 2;
+
+  while (forwardHeap.length > 0 && backwardHeap.length > 0) {
+    const nodeStart = forwardHeap.pop();
+    const nodeFinish = backwardHeap.pop();
+    if (probe) probe.heapPops += 2;
+    forward.markVisited(nodeStart);
+    forward.markVisited(nodeFinish);
+    visitedStart.push(nodeStart);
+    visitedFinish.push(nodeFinish);
+
+    if (isNeighbour(nodeStart, nodeFinish, forward.cols)) {
+      return done(nodeStart, nodeFinish);
+    }
+
+    let count = forward.openNeighbours(nodeStart, neighbours);
+    for (let k = 0; k < count; k++) {
+      const next = neighbours[k];
+      if (backward.getDistance(next) !== UNREACHED) {
+        forward.setDistance(next, forward.getDistance(nodeStart) + 1, nodeStart);
+        if (probe) probe.relaxations++;
+        visitedStart.push(next);
+        return done(next, backward.getParent(next), next, 'finish');
+      }
+      if (forward.getDistance(next) === UNREACHED) {
+        forward.setDistance(next, forward.getDistance(nodeStart) + 1, nodeStart);
+        forwardHeap.push(next, heuristic(next, finish));
+        if (probe) {
+          probe.relaxations++;
+          probe.heapPushes++;
+        }
+      }
+    }
+
+    count = forward.openNeighbours(nodeFinish, neighbours);
+    for (let k = 0; k < count; k++) {
+      const next = neighbours[k];
+      if (forward.getDistance(next) !== UNREACHED) {
+        backward.setDistance(next, backward.getDistance(nodeFinish) + 1, nodeFinish);
+        if (probe) probe.relaxations++;
+        visitedFinish.push(next);
+        return done(next, nodeFinish, next, 'start');
+      }
+      if (backward.getDistance(next) === UNREACHED) {
+        backward.setDistance(next, backward.getDistance(nodeFinish) + 1, nodeFinish);
+        backwardHeap.push(next, heuristic(next, start));
+        if (probe) {
+          probe.relaxations++;
+          probe.heapPushes++;
+        }
+      }
+    }
+
+    maxMemoryUsage = Math.max(maxMemoryUsage, forwardHeap.length + backwardHeap.length);
+  }
+  return done(NO_PARENT, NO_PARENT);
+}
+
+function searchAstar(forward, backward, start, finish, heuristic, probe) {
+  const visitedStart = [];
+  const visitedFinish = [];
+  const meeting = { cost: Infinity, node: NO_PARENT };
+
+  forward.setDistance(start, 0);
+  backward.setDistance(finish, 0);
+  forwardHeap.push(start, heuristic(start, finish));
+  backwardHeap.push(finish, heuristic(finish, start));
+  if (probe) probe.heapPushes += 2;
+  let maxMemoryUsage = forwardHeap.length + backwardHeap.length;
+
+  while (forwardHeap.length > 0 && backwardHeap.length > 0) {
+    // Stale heap entries only lower the bound, so the test never stops early
+    if (forwardHeap.peekPriority() >= meeting.cost || backwardHeap.peekPriority() >= meeting.cost) break;
+    if (forwardHeap.length <= backwardHeap.length) {
+      expandAstar(forward, backward, forwardHeap, finish, heuristic, visitedStart, meeting, probe);
+    } else {
+      expandAstar(backward, forward, backwardHeap, start, heuristic, visitedFinish, meeting, probe);
+    }
+    maxMemoryUsage = Math.max(maxMemoryUsage, forwardHeap.length + backwardHeap.length);
+  }
+
+  const meetFinish = meeting.node === NO_PARENT ? NO_PARENT : backward.getParent(meeting.node);
+  return { visitedStart, visitedFinish, meetStart: meeting.node, meetFinish, shared: NO_PARENT, sharedFrom: null, maxMemoryUsage };
+}
+
+function expandAstar(side, other, heap, target, heuristic, visited, meeting, probe) {
+  const node = heap.pop();
+  if (probe) probe.heapPops++;
+  if (side.isVisited(node)) {
+    if (probe) probe.stalePops++;
+    return;
+  }
+  side.markVisited(node);
+  visited.push(node);
+
+  const distance = side.getDistance(node) + 1;
+  const count = side.openNeighbours(node, neighbours);
+  for (let k = 0; k < count; k++) {
+    const next = neighbours[k];
+    if (distance < side.getDistance(next)) {
+      side.setDistance(next, distance, node);
+      heap.push(next, distance + heuristic(next, target));
+      if (probe) {
+        probe.relaxations++;
+        probe.heapPushes++;
+      }
+      const rest = other.getDistance(next);
+      if (rest !== UNREACHED && distance + rest < meeting.cost) {
+        meeting.cost = distance + rest;
+        meeting.node = next;
+      }
+    }
+  }
+}
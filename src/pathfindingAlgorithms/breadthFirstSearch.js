@@ -1,7 +1,13 @@
+import { beginRun, neighbourBuffer } from './instrumentation.js';
+import { compactGridFor, nodeAt } from './compactGrid.js';
+
 export function breadthFirstSearch(grid, startNode, finishNode) {
   if (!startNode || !finishNode || startNode === finishNode) {
     return false;
   }
+  const probe = beginRun();
+  const compact = compactGridFor(grid);
+  const neighbours = neighbourBuffer(probe); // reused for every expansion
   let unvisitedNodes = [];
   let visitedNodesInOrder = [];
   let maxMemoryUsage = 0; // Track memory usage
@@ -9,9 +15,11 @@ export function breadthFirstSearch(grid, startNode, finishNode) {
   startNode.distance = 0; // BFS guarantees shortest distance
   startNode.isVisited = true; // Mark visited when adding to queue
   unvisitedNodes.push(startNode);
+  if (probe) probe.heapPushes++;
   
   while (unvisitedNodes.length !== 0) {
     let closestNode = unvisitedNodes.shift();
+    if (probe) probe.heapPops++;
     if (closestNode.isWall) continue;
     
     if (closestNode === finishNode) {
@@ -19,13 +27,18 @@ export function breadthFirstSearch(grid, startNode, finishNode) {
       return visitedNodesInOrder;
     }
     visitedNodesInOrder.push(closestNode);
-    let neighbours = getNeighbours(closestNode, grid);
-    for (let neighbour of neighbours) {
-      if (!neighbour.isVisited && !neighbour.isWall) {
+    const count = compact.neighbours(compact.index(closestNode.row, closestNode.col), neighbours);
+    for (let k = 0; k < count; k++) {
+      const neighbour = nodeAt(grid, neighbours[k]);
+      if (!neighbour.isVisited) {
         neighbour.isVisited = true; // Mark visited when adding to queue
         neighbour.previousNode = closestNode;
         neighbour.distance = closestNode.distance + 1;
         unvisitedNodes.push(neighbour);
+        if (probe) {
+          probe.relaxations++;
+          probe.heapPushes++;
+        }
       }
     }
     
@@ -37,18 +50,6 @@ export function breadthFirstSearch(grid, startNode, finishNode) {
   return visitedNodesInOrder;
 }
 
-function getNeighbours(node, grid) {
-  let neighbours = [];
-  let { row, col } = node;
-  if (row !== 0) neighbours.push(grid[row - 1][col]);
-  if (col !== grid[0].length - 1) neighbours.push(grid[row][col + 1]);
-  if (row !== grid.length - 1) neighbours.push(grid[row + 1][col]);
-  if (col !== 0) neighbours.push(grid[row][col - 1]);
-  return neighbours;
-}
-
-
-
 export function getNodesInShortestPathOrderBFS(finishNode) {
   let nodesInShortestPathOrder = [];
   let currentNode = finishNode;
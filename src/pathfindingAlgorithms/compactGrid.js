@@ -0,0 +1,207 @@
+// Compact grid: typed arrays indexed by row * cols + col instead of one
+// object per cell. Per-query state (distance, parent, visited) is tagged with
+// a generation number, so reset() only bumps the generation: O(1) instead of
+// walking the whole grid.
+
+export const UP = 0;
+export const RIGHT = 1;
+export const DOWN = 2;
+export const LEFT = 3;
+
+// Neighbour orders used by the existing algorithms
+export const ORDER_URDL = [UP, RIGHT, DOWN, LEFT]; // dijkstra, BFS, greedy, bidirectional
+export const ORDER_RDLU = [RIGHT, DOWN, LEFT, UP]; // astar
+export const ORDER_LURD = [LEFT, UP, RIGHT, DOWN]; // DFS
+
+export const UNREACHED = 0x7fffffff;
+export const NO_PARENT = -1;
+
+const MAX_GENERATION = 0xffffffff;
+
+export class CompactGrid {
+  constructor(rows, cols, walls = new Uint8Array(rows * cols)) {
+    this.rows = rows;
+    this.cols = cols;
+    this.size = rows * cols;
+    this.walls = walls;
+    this.distance = new Int32Array(this.size);
+    this.parent = new Int32Array(this.size);
+    // Generation in which distance/parent were written, and in which the node was closed
+    this.stamp = new Uint32Array(this.size);
+    this.closed = new Uint32Array(this.size);
+    this.generation = 1;
+    // Bumped on every wall change, so caches built on the walls can tell they are stale
+    this.wallVersion = 0;
+  }
+
+  static fromNodeGrid(grid) {
+    const compact = new CompactGrid(grid.length, grid[0].length);
+    compact.syncWalls(grid);
+    return compact;
+  }
+
+  // Second set of per-query arrays over the same walls, for searches that keep
+  // two labels per node (e.g. bidirectional); created once and reused
+  sibling() {
+    if (!this.siblingGrid) {
+      this.siblingGrid = new CompactGrid(this.rows, this.cols, this.walls);
+    }
+    return this.siblingGrid;
+  }
+
+  index(row, col) {
+    return row * this.cols + col;
+  }
+
+  rowOf(index) {
+    return (index / this.cols) | 0;
+  }
+
+  colOf(index) {
+    return index % this.cols;
+  }
+
+  // Forget every distance, parent and visited mark in O(1)
+  reset() {
+    if (this.generation === MAX_GENERATION) {
+      this.stamp.fill(0);
+      this.closed.fill(0);
+      this.generation = 0;
+    }
+    this.generation++;
+  }
+
+  isWall(index) {
+    return this.walls[index] === 1;
+  }
+
+  setWall(index, isWall) {
+    const value = isWall ? 1 : 0;
+    if (this.walls[index] !== value) {
+      this.walls[index] = value;
+      this.wallVersion++;
+    }
+  }
+
+  // Copy walls from a grid of node objects; wallVersion only changes if a wall did
+  syncWalls(grid) {
+    const { cols, walls } = this;
+    let changed = false;
+    for (let row = 0; row < grid.length; row++) {
+      const nodes = grid[row];
+      const offset = row * cols;
+      for (let col = 0; col < cols; col++) {
+        const value = nodes[col].isWall ? 1 : 0;
+        if (walls[offset + col] !== value) {
+          walls[offset + col] = value;
+          changed = true;
+        }
+      }
+    }
+    if (changed) this.wallVersion++;
+  }
+
+  getDistance(index) {
+    return this.stamp[index] === this.generation ? this.distance[index] : UNREACHED;
+  }
+
+  getParent(index) {
+    return this.stamp[index] === this.generation ? this.parent[index] : NO_PARENT;
+  }
+
+  setDistance(index, distance, parent = NO_PARENT) {
+    this.stamp[index] = this.generation;
+    this.distance[index] = distance;
+    this.parent[index] = parent;
+  }
+
+  isVisited(index) {
+    return this.closed[index] === this.generation;
+  }
+
+  markVisited(index) {
+    this.closed[index] = this.generation;
+  }
+
+  /**
+   * Write the non-wall neighbours of `index` into `out` (length >= 4) in the
+   * given order and return how many were written. Allocates nothing.
+   */
+  neighbours(index, out, order = ORDER_URDL) {
+    const { rows, cols, walls } = this;
+    const row = (index / cols) | 0;
+    const col = index - row * cols;
+    let count = 0;
+    for (let k = 0; k < order.length; k++) {
+      let next;
+      switch (order[k]) {
+        case UP:
+          if (row === 0) continue;
+          next = index - cols;
+          break;
+        case RIGHT:
+          if (col === cols - 1) continue;
+          next = index + 1;
+          break;
+        case DOWN:
+          if (row === rows - 1) continue;
+          next = index + cols;
+          break;
+        default:
+          if (col === 0) continue;
+          next = index - 1;
+      }
+      if (walls[next] === 0) out[count++] = next;
+    }
+    return count;
+  }
+
+  // Same as neighbours(), also skipping nodes already visited in this generation
+  openNeighbours(index, out, order = ORDER_URDL) {
+    const count = this.neighbours(index, out, order);
+    const { closed, generation } = this;
+    let open = 0;
+    for (let k = 0; k < count; k++) {
+      if (closed[out[k]] !== generation) out[open++] = out[k];
+    }
+    return open;
+  }
+
+  // Indices from the search root to `index`, following parents of this generation
+  pathTo(index) {
+    let length = 0;
+    for (let node = index; node !== NO_PARENT; node = this.getParent(node)) length++;
+    const path = new Int32Array(length);
+    for (let node = index, i = length - 1; node !== NO_PARENT; node = this.getParent(node), i--) {
+      path[i] = node;
+    }
+    return path;
+  }
+}
+
+// One CompactGrid per node grid, built on first use and reused across queries.
+// Keyed by the first row array: the visualizer copies the outer array
+// (grid.slice()) on every state update but keeps the rows. Walls are not
+// re-read on lookup; every wall edit made after the first lookup must be
+// reported through setCompactWall().
+const compactGrids = new WeakMap();
+
+export function compactGridFor(grid) {
+  let compact = compactGrids.get(grid[0]);
+  if (!compact || compact.rows !== grid.length || compact.cols !== grid[0].length) {
+    compact = CompactGrid.fromNodeGrid(grid);
+    compactGrids.set(grid[0], compact);
+  }
+  return compact;
+}
+
+// Apply a wall edit of the node grid to its cached CompactGrid, if it has one
+export function setCompactWall(grid, row, col, isWall) {
+  const compact = compactGrids.get(grid[0]);
+  if (compact) compact.setWall(compact.index(row, col), isWall);
+}
+
+export function nodeAt(grid, index) {
+  const cols = grid[0].length;
+  return grid[(index / cols) | 0][index % cols];
+}
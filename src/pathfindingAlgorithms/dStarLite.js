@@ -0,0 +1,330 @@
+import { CompactGrid, nodeAt } from './compactGrid.js';
+import { getIndexHeuristicFunction, METRIC_TYPES } from './metricSpace/index.js';
+import { beginRun, countedHeuristic } from './instrumentation.js';
+
+// D* Lite (Koenig & Likhachev, 2002) on a CompactGrid: an incremental planner
+// that keeps its search state between calls. g(s) is the current distance from
+// s to the goal and rhs(s) the one-step lookahead min over neighbours of
+// 1 + g; a cell with g != rhs is inconsistent and sits in the priority queue.
+// The search runs backwards from the goal, so when walls change only the
+// cells whose distances actually change are re-expanded, and the start can
+// move (km keeps the queued keys valid lower bounds) without a restart.
+//
+// Moves are 4-connected with unit cost, like the other algorithms; the
+// heuristic comes from metricSpace. LANDMARK bounds are computed from the
+// walls at the last full plan: adding walls only lengthens distances so they
+// stay admissible, but clearing one can make them overestimate, so that falls
+// back to a full replan. Start and goal must stay open.
+//
+//   const planner = new DStarLite(rows, cols, walls, start, goal);
+//   planner.plan();                 // full search
+//   planner.setWall(index, true);   // any number of edits...
+//   planner.plan();                 // ...repaired incrementally
+
+export class DStarLite {
+  constructor(rows, cols, walls, start, goal, metricType = METRIC_TYPES.MANHATTAN, weight = 1) {
+    this.rows = rows;
+    this.cols = cols;
+    this.start = start;
+    this.goal = goal;
+    this.metricType = metricType;
+    this.weight = weight;
+    // Own copy of the walls: edits arrive through setWall()/syncWalls()
+    this.compact = new CompactGrid(rows, cols, Uint8Array.from(walls));
+    this.g = new Float64Array(this.compact.size);
+    this.rhs = new Float64Array(this.compact.size);
+    this.queue = new KeyHeap(this.compact.size);
+    this.km = 0;
+    this.probe = null;
+    this.baseHeuristic = null;
+    this.heuristic = null;
+    this.needsReset = true;
+    this.expanded = [];
+    // Two buffers: updateVertex() scans neighbours while its caller is iterating its own
+    this.around = new Int32Array(4);
+    this.successors = new Int32Array(4);
+  }
+
+  // Forget all search state; the next plan() searches from scratch
+  reset() {
+    this.baseHeuristic = getIndexHeuristicFunction(this.metricType, this.weight, this.compact);
+    this.heuristic = countedHeuristic(this.baseHeuristic, this.probe);
+    this.g.fill(Infinity);
+    this.rhs.fill(Infinity);
+    this.queue.clear();
+    this.km = 0;
+    this.rhs[this.goal] = 0;
+    this.insert(this.goal);
+    this.needsReset = false;
+  }
+
+  setWall(index, isWall) {
+    const { compact } = this;
+    if (compact.isWall(index) === isWall) return;
+    compact.setWall(index, isWall);
+    if (this.needsReset) return;
+    if (!isWall && this.metricType === METRIC_TYPES.LANDMARK) {
+      this.needsReset = true;
+      return;
+    }
+    this.updateVertex(index);
+    const count = compact.neighbours(index, this.around);
+    for (let k = 0; k < count; k++) this.updateVertex(this.around[k]);
+  }
+
+  // Apply every difference between `walls` and the planner's copy
+  syncWalls(walls) {
+    const current = this.compact.walls;
+    for (let i = 0; i < current.length; i++) {
+      if (current[i] !== walls[i]) this.setWall(i, walls[i] === 1);
+    }
+  }
+
+  moveStart(index) {
+    if (index === this.start) return;
+    if (!this.needsReset) this.km += this.baseHeuristic(this.start, index);
+    this.start = index;
+  }
+
+  /**
+   * Bring the search up to date and return { path, distance, expanded,
+   * maxMemoryUsage }: path is an Int32Array of flat indices from start to
+   * goal (empty, distance Infinity, if the goal cannot be reached) and
+   * expanded the cells expanded by this call, in order.
+   */
+  plan() {
+    this.probe = beginRun();
+    if (this.needsReset) this.reset();
+    this.heuristic = countedHeuristic(this.baseHeuristic, this.probe);
+    this.expanded = [];
+    const maxMemoryUsage = this.computeShortestPath();
+    this.heuristic = this.baseHeuristic;
+    const path = this.extractPath();
+    return {
+      path,
+      distance: path.length > 0 ? path.length - 1 : Infinity,
+      expanded: Int32Array.from(this.expanded),
+      maxMemoryUsage,
+    };
+  }
+
+  computeShortestPath() {
+    const { g, rhs, queue, compact, around, probe } = this;
+    const start = this.start;
+    let maxMemoryUsage = queue.length;
+    while (queue.length > 0) {
+      const startKey2 = Math.min(g[start], rhs[start]);
+      const startKey1 = startKey2 + this.km; // h(start, start) = 0
+      if (!keyLess(queue.topKey1(), queue.topKey2(), startKey1, startKey2) && rhs[start] === g[start]) break;
+
+      const u = queue.top();
+      const oldKey1 = queue.topKey1();
+      const oldKey2 = queue.topKey2();
+      const newKey2 = Math.min(g[u], rhs[u]);
+      const newKey1 = newKey2 + this.heuristic(start, u) + this.km;
+      if (keyLess(oldKey1, oldKey2, newKey1, newKey2)) {
+        queue.set(u, newKey1, newKey2);
+        continue;
+      }
+
+      queue.remove(u);
+      if (probe) probe.heapPops++;
+      this.expanded.push(u);
+      const count = compact.neighbours(u, around);
+      if (g[u] > rhs[u]) {
+        g[u] = rhs[u];
+      } else {
+        g[u] = Infinity;
+        this.updateVertex(u);
+      }
+      for (let k = 0; k < count; k++) this.updateVertex(around[k]);
+      maxMemoryUsage = Math.max(maxMemoryUsage, queue.length);
+    }
+    return maxMemoryUsage;
+  }
+
+  updateVertex(index) {
+    const { g, rhs, compact, successors, probe } = this;
+    if (index !== this.goal) {
+      let best = Infinity;
+      if (!compact.isWall(index)) {
+        const count = compact.neighbours(index, successors);
+        for (let k = 0; k < count; k++) {
+          const cost = 1 + g[successors[k]];
+          if (cost < best) best = cost;
+        }
+      }
+      if (rhs[index] !== best) {
+        rhs[index] = best;
+        if (probe) probe.relaxations++;
+      }
+    }
+    if (g[index] !== rhs[index]) {
+      this.insert(index);
+    } else if (this.queue.has(index)) {
+      this.queue.remove(index);
+    }
+  }
+
+  insert(index) {
+    const key2 = Math.min(this.g[index], this.rhs[index]);
+    const key1 = key2 + this.heuristic(this.start, index) + this.km;
+    if (!this.queue.has(index) && this.probe) this.probe.heapPushes++;
+    this.queue.set(index, key1, key2);
+  }
+
+  // Greedy descent of 1 + g from the start; ties go to the first neighbour
+  // in the compact grid's order
+  extractPath() {
+    const { g, compact, successors, goal } = this;
+    if (g[this.start] === Infinity) return new Int32Array(0);
+    const path = [this.start];
+    let node = this.start;
+    while (node !== goal) {
+      let best = Infinity;
+      let next = -1;
+      const count = compact.neighbours(node, successors);
+      for (let k = 0; k < count; k++) {
+        if (g[successors[k]] < best) {
+          best = g[successors[k]];
+          next = successors[k];
+        }
+      }
+      if (next === -1 || path.length > compact.size) return new Int32Array(0);
+      path.push(next);
+      node = next;
+    }
+    return Int32Array.from(path);
+  }
+}
+
+// `planner` brought up to date for a new request if it plans on the same grid
+// size, goal and heuristic (walls synced, start moved, so the next plan()
+// only repairs what changed); otherwise a new planner
+export function plannerFor(planner, rows, cols, walls, start, goal, metricType, weight) {
+  if (
+    planner &&
+    planner.rows === rows &&
+    planner.cols === cols &&
+    planner.goal === goal &&
+    planner.metricType === metricType &&
+    planner.weight === weight
+  ) {
+    planner.syncWalls(walls);
+    planner.moveStart(start);
+    return planner;
+  }
+  return new DStarLite(rows, cols, walls, start, goal, metricType, weight);
+}
+
+export function getNodesInShortestPathOrderDStarLite(grid, result) {
+  return Array.from(result.path, (index, i) => {
+    const node = nodeAt(grid, index);
+    node.distance = i;
+    return node;
+  });
+}
+
+function keyLess(a1, a2, b1, b2) {
+  return a1 < b1 || (a1 === b1 && a2 < b2);
+}
+
+// Binary min-heap of cell indices keyed by (key1, key2) lexicographically,
+// with a position table so a cell's key can be changed or the cell removed in
+// O(log n); each cell is in the heap at most once
+class KeyHeap {
+  constructor(size) {
+    this.ids = new Int32Array(size);
+    this.key1 = new Float64Array(size);
+    this.key2 = new Float64Array(size);
+    this.position = new Int32Array(size).fill(-1);
+    this.length = 0;
+  }
+
+  clear() {
+    for (let i = 0; i < this.length; i++) this.position[this.ids[i]] = -1;
+    this.length = 0;
+  }
+
+  has(id) {
+    return this.position[id] !== -1;
+  }
+
+  top() {
+    return this.ids[0];
+  }
+
+  topKey1() {
+    return this.length > 0 ? this.key1[0] : Infinity;
+  }
+
+  topKey2() {
+    return this.length > 0 ? this.key2[0] : Infinity;
+  }
+
+  // Insert `id`, or move it to its new key if already queued
+  set(id, key1, key2) {
+    let pos = this.position[id];
+    if (pos === -1) {
+      pos = this.length++;
+    }
+    this.place(pos, id, key1, key2);
+    this.restore(pos);
+  }
+
+  remove(id) {
+    const pos = this.position[id];
+    this.position[id] = -1;
+    const last = --this.length;
+    if (pos === last) return;
+    this.place(pos, this.ids[last], this.key1[last], this.key2[last]);
+    this.restore(pos);
+  }
+
+  // The entry at `pos` has a new key: move it up or down into place
+  restore(pos) {
+    const id = this.ids[pos];
+    this.siftUp(pos);
+    this.siftDown(this.position[id]);
+  }
+
+  place(pos, id, key1, key2) {
+    this.ids[pos] = id;
+    this.key1[pos] = key1;
+    this.key2[pos] = key2;
+    this.position[id] = pos;
+  }
+
+  siftUp(pos) {
+    const { ids, key1, key2 } = this;
+    const id = ids[pos];
+    const k1 = key1[pos];
+    const k2 = key2[pos];
+    while (pos > 0) {
+      const parent = (pos - 1) >> 1;
+      if (!keyLess(k1, k2, key1[parent], key2[parent])) break;
+      this.place(pos, ids[parent], key1[parent], key2[parent]);
+      pos = parent;
+    }
+    this.place(pos, id, k1, k2);
+  }
+
+  siftDown(pos) {
+    const { ids, key1, key2 } = this;
+    const id = ids[pos];
+    const k1 = key1[pos];
+    const k2 = key2[pos];
+    const half = this.length >> 1;
+    while (pos < half) {
+      let child = 2 * pos + 1;
+      const right = child + 1;
+      if (right < this.length && keyLess(key1[right], key2[right], key1[child], key2[child])) {
+        child = right;
+      }
+      if (!keyLess(key1[child], key2[child], k1, k2)) break;
+      this.place(pos, ids[child], key1[child], key2[child]);
+      pos = child;
+    }
+    this.place(pos, id, k1, k2);
+  }
+}
@@ -1,15 +1,23 @@
+import { beginRun, neighbourBuffer } from './instrumentation.js';
+import { compactGridFor, nodeAt, ORDER_LURD } from './compactGrid.js';
+
 export function depthFirstSearch(grid, startNode, finishNode) {
   if (!startNode || !finishNode || startNode === finishNode) {
     return false;
   }
+  const probe = beginRun();
+  const compact = compactGridFor(grid);
+  const neighbours = neighbourBuffer(probe); // reused for every expansion
   let unvisitedNodes = [];
   let visitedNodesInOrder = [];
   let maxMemoryUsage = 0; // Track stack depth
   
   unvisitedNodes.push(startNode);
+  if (probe) probe.heapPushes++;
   
   while (unvisitedNodes.length !== 0) {
     let closestNode = unvisitedNodes.shift();
+    if (probe) probe.heapPops++;
     if (closestNode.isWall) continue;
     if (closestNode === finishNode) {
       visitedNodesInOrder.maxMemoryUsage = maxMemoryUsage;
@@ -18,11 +26,19 @@ export function depthFirstSearch(grid, startNode, finishNode) {
     visitedNodesInOrder.push(closestNode);
     closestNode.isVisited = true;
     
-    let unvisitedNeighbours = getUnvisitedNeighbours(closestNode, grid);
-    for (let unvisitedNeighbour of unvisitedNeighbours) {
+    const count = compact.neighbours(
+      compact.index(closestNode.row, closestNode.col), neighbours, ORDER_LURD
+    );
+    for (let k = 0; k < count; k++) {
+      const unvisitedNeighbour = nodeAt(grid, neighbours[k]);
+      if (unvisitedNeighbour.isVisited) continue;
       unvisitedNeighbour.previousNode = closestNode;
       // DFS: No distance calculation for visited nodes
       unvisitedNodes.unshift(unvisitedNeighbour);
+      if (probe) {
+        probe.relaxations++;
+        probe.heapPushes++;
+      }
     }
     
     // Track memory: stack depth (unvisitedNodes = call stack)
@@ -33,16 +49,6 @@ export function depthFirstSearch(grid, startNode, finishNode) {
   return visitedNodesInOrder;
 }
 
-function getUnvisitedNeighbours(node, grid) {
-  let neighbours = [];
-  let { row, col } = node;
-  if (col !== 0) neighbours.push(grid[row][col - 1]);
-  if (row !== 0) neighbours.push(grid[row - 1][col]);
-  if (col !== grid[0].length - 1) neighbours.push(grid[row][col + 1]);
-  if (row !== grid.length - 1) neighbours.push(grid[row + 1][col]);
-  return neighbours.filter((neighbour) => !neighbour.isVisited);
-}
-
 export function getNodesInShortestPathOrderDFS(finishNode) {
   let nodesInShortestPathOrder = [];
   let currentNode = finishNode;
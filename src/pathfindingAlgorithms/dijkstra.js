@@ -1,9 +1,14 @@
 import TinyQueue from 'tinyqueue';
+import { beginRun, neighbourBuffer } from './instrumentation.js';
+import { compactGridFor, nodeAt } from './compactGrid.js';
 
 export function dijkstra(grid, startNode, finishNode) {
   if (!startNode || !finishNode || startNode === finishNode) {
     return false;
   }
+  const probe = beginRun();
+  const compact = compactGridFor(grid);
+  const neighbours = neighbourBuffer(probe); // reused for every expansion
   startNode.distance = 0;
   let visitedNodesInOrder = [];
   // Use TinyQueue as a priority queue. We push the start node first and only
@@ -12,10 +17,12 @@ export function dijkstra(grid, startNode, finishNode) {
   const compare = (a, b) => a.distance - b.distance;
   let heap = new TinyQueue([], compare);
   heap.push(startNode);
+  if (probe) probe.heapPushes++;
   let maxMemoryUsage = heap.length; // track peak queue size
 
   while (heap.length > 0) {
     let closestNode = heap.pop();
+    if (probe) probe.heapPops++;
     if (closestNode.isWall) continue;
     if (closestNode.distance === Infinity) {
       visitedNodesInOrder.maxMemoryUsage = maxMemoryUsage;
@@ -25,10 +32,13 @@ export function dijkstra(grid, startNode, finishNode) {
       visitedNodesInOrder.maxMemoryUsage = maxMemoryUsage;
       return visitedNodesInOrder;
     }
-    if (closestNode.isVisited) continue;
+    if (closestNode.isVisited) {
+      if (probe) probe.stalePops++;
+      continue;
+    }
     closestNode.isVisited = true;
     visitedNodesInOrder.push(closestNode);
-    updateUnvisitedNeighbours(closestNode, grid, heap);
+    updateUnvisitedNeighbours(closestNode, grid, compact, neighbours, heap, probe);
 
     // Track memory: priority queue + distance map (all nodes need distance tracking)
     maxMemoryUsage = Math.max(maxMemoryUsage, heap.length);
@@ -48,30 +58,24 @@ function getNodes(grid) {
   return nodes;
 }
 
-function updateUnvisitedNeighbours(node, grid, heap) {
-  let unvisitedNeighbours = getUnvisitedNeighbours(node, grid);
-  for (let unvisitedNeighbour of unvisitedNeighbours) {
+function updateUnvisitedNeighbours(node, grid, compact, neighbours, heap, probe = null) {
+  const count = compact.neighbours(compact.index(node.row, node.col), neighbours);
+  for (let k = 0; k < count; k++) {
+    const unvisitedNeighbour = nodeAt(grid, neighbours[k]);
+    if (unvisitedNeighbour.isVisited) continue;
     const newDistance = node.distance + 1;
     if (newDistance < unvisitedNeighbour.distance) {
       unvisitedNeighbour.distance = newDistance;
       unvisitedNeighbour.previousNode = node;
       if (heap) heap.push(unvisitedNeighbour);
+      if (probe) {
+        probe.relaxations++;
+        if (heap) probe.heapPushes++;
+      }
     }
   }
 }
 
-function getUnvisitedNeighbours(node, grid) {
-  let neighbours = [];
-  let { row, col } = node;
-  if (row !== 0) neighbours.push(grid[row - 1][col]);
-  if (col !== grid[0].length - 1) neighbours.push(grid[row][col + 1]);
-  if (row !== grid.length - 1) neighbours.push(grid[row + 1][col]);
-  if (col !== 0) neighbours.push(grid[row][col - 1]);
-  return neighbours
-    .filter((neighbour) => !neighbour.isWall)
-    .filter((neighbour) => !neighbour.isVisited);
-}
-
 export function getNodesInShortestPathOrderDijkstra(finishNode) {
   let nodesInShortestPathOrder = [];
   let currentNode = finishNode;
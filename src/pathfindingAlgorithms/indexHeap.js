@@ -0,0 +1,91 @@
+// Binary min-heap of node indices (see compactGrid.js). Each entry carries its
+// own priority, so pushing a node again with a better priority is safe (stale
+// entries are skipped by the caller), and equal priorities pop in insertion
+// order, like a stable sort of an open list. Storage is typed arrays, grown by
+// doubling and reused across queries via clear().
+
+export class IndexHeap {
+  constructor(capacity = 64) {
+    this.ids = new Int32Array(capacity);
+    this.priorities = new Float64Array(capacity);
+    this.sequence = new Float64Array(capacity);
+    this.length = 0;
+    this.counter = 0;
+  }
+
+  clear() {
+    this.length = 0;
+    this.counter = 0;
+  }
+
+  peek() {
+    return this.ids[0];
+  }
+
+  peekPriority() {
+    return this.length > 0 ? this.priorities[0] : Infinity;
+  }
+
+  push(id, priority) {
+    if (this.length === this.ids.length) this.grow();
+    const { ids, priorities, sequence } = this;
+    const order = this.counter++;
+    let pos = this.length++;
+    while (pos > 0) {
+      const parent = (pos - 1) >> 1;
+      const parentPriority = priorities[parent];
+      if (parentPriority < priority || (parentPriority === priority && sequence[parent] < order)) break;
+      ids[pos] = ids[parent];
+      priorities[pos] = parentPriority;
+      sequence[pos] = sequence[parent];
+      pos = parent;
+    }
+    ids[pos] = id;
+    priorities[pos] = priority;
+    sequence[pos] = order;
+  }
+
+  pop() {
+    const { ids, priorities, sequence } = this;
+    const top = ids[0];
+    const last = --this.length;
+    if (last > 0) {
+      const id = ids[last];
+      const priority = priorities[last];
+      const order = sequence[last];
+      const half = last >> 1;
+      let pos = 0;
+      while (pos < half) {
+        let child = 2 * pos + 1;
+        const right = child + 1;
+        if (right < last && (priorities[right] < priorities[child] ||
+            (priorities[right] === priorities[child] && sequence[right] < sequence[child]))) {
+          child = right;
+        }
+        if (priority < priorities[child] ||
+            (priority === priorities[child] && order < sequence[child])) break;
+        ids[pos] = ids[child];
+        priorities[pos] = priorities[child];
+        sequence[pos] = sequence[child];
+        pos = child;
+      }
+      ids[pos] = id;
+      priorities[pos] = priority;
+      sequence[pos] = order;
+    }
+    return top;
+  }
+
+  grow() {
+    const capacity = this.ids.length * 2;
+    const ids = new Int32Array(capacity);
+    const priorities = new Float64Array(capacity);
+    const sequence = new Float64Array(capacity);
+    ids.set(this.ids);
+    priorities.set(this.priorities);
+    sequence.set(this.sequence);
+    this.ids = ids;
+    this.priorities = priorities;
+    this.sequence = sequence;
+  }
+}
@@ -0,0 +1,58 @@
+// Opt-in cost counters for the search algorithms. Each search calls
+// beginRun() once: it returns null while instrumentation is off, and every
+// counting site is guarded by `if (probe)`, so an uninstrumented run only pays
+// one null check per site. When on, beginRun() returns a fresh set of
+// counters that stays readable through lastRunCounters() after the search.
+//
+//   heapPushes / heapPops  open-list operations (priority queue, BFS queue or DFS stack)
+//   stalePops              pops discarded because the node was already closed (lazy deletion)
+//   heuristicCalls         heuristic evaluations
+//   neighbourArrays        neighbour buffers allocated, counted where they are allocated
+//                          (neighbourBuffer(); module-level buffers reused across runs count 0)
+//   relaxations            successful distance/parent updates of a neighbour
+
+export const COUNTER_NAMES = [
+  'heapPushes',
+  'heapPops',
+  'stalePops',
+  'heuristicCalls',
+  'neighbourArrays',
+  'relaxations',
+];
+
+let enabled = false;
+let lastRun = null;
+
+export function enableInstrumentation() {
+  enabled = true;
+}
+
+export function disableInstrumentation() {
+  enabled = false;
+}
+
+export function beginRun() {
+  if (!enabled) return null;
+  lastRun = {};
+  for (const name of COUNTER_NAMES) lastRun[name] = 0;
+  return lastRun;
+}
+
+export function lastRunCounters() {
+  return lastRun;
+}
+
+// Scratch buffer for CompactGrid.neighbours(); every allocation is counted
+export function neighbourBuffer(probe) {
+  if (probe) probe.neighbourArrays++;
+  return new Int32Array(4);
+}
+
+// Wrap a heuristic so that each evaluation is counted; unchanged without a probe
+export function countedHeuristic(heuristic, probe) {
+  if (!probe) return heuristic;
+  return (a, b) => {
+    probe.heuristicCalls++;
+    return heuristic(a, b);
+  };
+}
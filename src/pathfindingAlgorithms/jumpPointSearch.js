@@ -0,0 +1,177 @@
+import { compactGridFor, nodeAt, NO_PARENT, UNREACHED } from './compactGrid.js';
+import { IndexHeap } from './indexHeap.js';
+import { getHeuristicFunction, METRIC_TYPES } from './metricSpace/index.js';
+import { beginRun, countedHeuristic } from './instrumentation.js';
+
+// Jump Point Search for 4-connected grids with unit move cost (the movement of
+// astar.js). A* only expands jump points: from a node, a
+// straight run continues until it hits the finish or a cell with a forced
+// neighbour (a side cell that is open while the cell behind it is a wall), and
+// vertical runs also stop where a horizontal run would find a jump point.
+// Pruning rules follow PathFinding.js (JPFNeverMoveDiagonally).
+//
+// Returns visitedNodesInOrder (the expanded jump points) with maxMemoryUsage,
+// and links previousNode along every cell of the path, like astar.js.
+
+const openList = new IndexHeap();
+const neighbours = new Int32Array(4);
+
+export function jumpPointSearch(grid, startNode, finishNode, metricType = METRIC_TYPES.MANHATTAN, weight = 1) {
+  if (!startNode || !finishNode || startNode === finishNode) {
+    return false;
+  }
+
+  const compact = compactGridFor(grid);
+  compact.reset();
+  openList.clear();
+
+  const probe = beginRun();
+  const heuristic = countedHeuristic(getHeuristicFunction(metricType, weight, grid), probe);
+  const start = compact.index(startNode.row, startNode.col);
+  const finish = compact.index(finishNode.row, finishNode.col);
+  const visitedNodesInOrder = [];
+
+  compact.setDistance(start, 0);
+  openList.push(start, heuristic(startNode, finishNode));
+  let maxMemoryUsage = openList.length;
+  if (probe) probe.heapPushes++;
+
+  while (openList.length > 0) {
+    const current = openList.pop();
+    if (probe) probe.heapPops++;
+    if (compact.isVisited(current)) {
+      if (probe) probe.stalePops++;
+      continue;
+    }
+
+    if (current === finish) {
+      linkPath(grid, compact, finish);
+      visitedNodesInOrder.maxMemoryUsage = maxMemoryUsage;
+      return visitedNodesInOrder;
+    }
+
+    compact.markVisited(current);
+    const node = nodeAt(grid, current);
+    node.isVisited = true;
+    node.distance = compact.getDistance(current);
+    visitedNodesInOrder.push(node);
+
+    const count = prunedNeighbours(compact, current, neighbours);
+    for (let k = 0; k < count; k++) {
+      const jumpPoint = jump(compact, neighbours[k], current, finish);
+      if (jumpPoint === NO_PARENT || compact.isVisited(jumpPoint)) continue;
+      const distance = compact.getDistance(current) + manhattan(compact, current, jumpPoint);
+      if (distance < compact.getDistance(jumpPoint)) {
+        compact.setDistance(jumpPoint, distance, current);
+        openList.push(jumpPoint, distance + heuristic(nodeAt(grid, jumpPoint), finishNode));
+        if (probe) {
+          probe.relaxations++;
+          probe.heapPushes++;
+        }
+      }
+    }
+
+    maxMemoryUsage = Math.max(maxMemoryUsage, openList.length);
+  }
+
+  visitedNodesInOrder.maxMemoryUsage = maxMemoryUsage;
+  return visitedNodesInOrder;
+}
+
+export function getNodesInShortestPathOrderJPS(finishNode) {
+  let nodesInShortestPathOrder = [];
+  let currentNode = finishNode;
+  while (currentNode !== null) {
+    nodesInShortestPathOrder.unshift(currentNode);
+    currentNode = currentNode.previousNode;
+  }
+  return nodesInShortestPathOrder;
+}
+
+function walkable(compact, row, col) {
+  return row >= 0 && row < compact.rows && col >= 0 && col < compact.cols &&
+    compact.walls[row * compact.cols + col] === 0;
+}
+
+function manhattan(compact, a, b) {
+  return Math.abs(compact.rowOf(a) - compact.rowOf(b)) + Math.abs(compact.colOf(a) - compact.colOf(b));
+}
+
+// Directions worth following from `index`: all open neighbours at the start
+// node, otherwise straight on plus the two sides of the direction of travel
+function prunedNeighbours(compact, index, out) {
+  const parent = compact.getParent(index);
+  if (parent === NO_PARENT) {
+    return compact.neighbours(index, out);
+  }
+  const row = compact.rowOf(index);
+  const col = compact.colOf(index);
+  const dRow = Math.sign(row - compact.rowOf(parent));
+  const dCol = Math.sign(col - compact.colOf(parent));
+  let count = 0;
+  if (dCol !== 0) {
+    if (walkable(compact, row - 1, col)) out[count++] = index - compact.cols;
+    if (walkable(compact, row + 1, col)) out[count++] = index + compact.cols;
+    if (walkable(compact, row, col + dCol)) out[count++] = index + dCol;
+  } else {
+    if (walkable(compact, row, col - 1)) out[count++] = index - 1;
+    if (walkable(compact, row, col + 1)) out[count++] = index + 1;
+    if (walkable(compact, row + dRow, col)) out[count++] = index + dRow * compact.cols;
+  }
+  return count;
+}
+
+// Follow the direction from `from` to `index` until a jump point; NO_PARENT if the run dies
+function jump(compact, index, from, finish) {
+  const dRow = compact.rowOf(index) - compact.rowOf(from);
+  const dCol = compact.colOf(index) - compact.colOf(from);
+  return dCol !== 0
+    ? jumpHorizontal(compact, compact.rowOf(index), compact.colOf(index), dCol, finish)
+    : jumpVertical(compact, compact.rowOf(index), compact.colOf(index), dRow, finish);
+}
+
+function jumpHorizontal(compact, row, col, dCol, finish) {
+  for (; walkable(compact, row, col); col += dCol) {
+    const index = row * compact.cols + col;
+    if (index === finish) return index;
+    if ((walkable(compact, row - 1, col) && !walkable(compact, row - 1, col - dCol)) ||
+        (walkable(compact, row + 1, col) && !walkable(compact, row + 1, col - dCol))) {
+      return index;
+    }
+  }
+  return NO_PARENT;
+}
+
+function jumpVertical(compact, row, col, dRow, finish) {
+  for (; walkable(compact, row, col); row += dRow) {
+    const index = row * compact.cols + col;
+    if (index === finish) return index;
+    if ((walkable(compact, row, col - 1) && !walkable(compact, row - dRow, col - 1)) ||
+        (walkable(compact, row, col + 1) && !walkable(compact, row - dRow, col + 1))) {
+      return index;
+    }
+    if (jumpHorizontal(compact, row, col + 1, 1, finish) !== NO_PARENT ||
+        jumpHorizontal(compact, row, col - 1, -1, finish) !== NO_PARENT) {
+      return index;
+    }
+  }
+  return NO_PARENT;
+}
+
+// Set previousNode on every cell between consecutive jump points
+function linkPath(grid, compact, finish) {
+  let node = finish;
+  let parent = compact.getParent(node);
+  while (parent !== NO_PARENT) {
+    const step = compact.rowOf(parent) === compact.rowOf(node)
+      ? Math.sign(compact.colOf(parent) - compact.colOf(node))
+      : Math.sign(compact.rowOf(parent) - compact.rowOf(node)) * compact.cols;
+    for (let cell = node; cell !== parent; cell += step) {
+      nodeAt(grid, cell).previousNode = nodeAt(grid, cell + step);
+    }
+    node = parent;
+    parent = compact.getParent(node);
+  }
+  const finishNode = nodeAt(grid, finish);
+  finishNode.distance = compact.getDistance(finish) === UNREACHED ? Infinity : compact.getDistance(finish);
+}
@@ -1,25 +1,64 @@
 // Import the functions for the switch statement
 import { manhattanDistance } from './manhattan.js';
-import { euclideanDistance } from './euclidean.js'; 
+import { euclideanDistance } from './euclidean.js';
+import { landmarkTableFor } from './landmark.js';
+import { compactGridFor } from '../compactGrid.js';
 
 // Export all metric space functions
 export * from './manhattan.js';
 export * from './euclidean.js';
+export * from './landmark.js';
 
 // Metric type constants
 export const METRIC_TYPES = {
   MANHATTAN: 'manhattan',
-  EUCLIDEAN: 'euclidean'
+  EUCLIDEAN: 'euclidean',
+  LANDMARK: 'landmark'
 };
 
 // Get heuristic function based on metric type
-export function getHeuristicFunction(metricType, weight = 1) {
+// LANDMARK needs the grid (node grid) to look up its precomputed distance
+// fields; it is max(landmark bound, manhattan), and plain manhattan without a
+// grid or when the fields do not fit in the landmark memory budget.
+export function getHeuristicFunction(metricType, weight = 1, grid = null) {
   switch (metricType) {
     case METRIC_TYPES.MANHATTAN:
       return (nodeA, nodeB) => weight * manhattanDistance(nodeA, nodeB);
     case METRIC_TYPES.EUCLIDEAN:
       return (nodeA, nodeB) => weight * euclideanDistance(nodeA, nodeB);
+    case METRIC_TYPES.LANDMARK: {
+      const table = grid ? landmarkTableFor(compactGridFor(grid)) : null;
+      if (!table) return (nodeA, nodeB) => weight * manhattanDistance(nodeA, nodeB);
+      const { cols } = table;
+      return (nodeA, nodeB) => weight * Math.max(
+        manhattanDistance(nodeA, nodeB),
+        table.distance(nodeA.row * cols + nodeA.col, nodeB.row * cols + nodeB.col)
+      );
+    }
     default:
       return (nodeA, nodeB) => weight * manhattanDistance(nodeA, nodeB);
   }
-}
\ No newline at end of file
+}
+
+// Same heuristics on flat node indices (row * cols + col) of a CompactGrid
+export function getIndexHeuristicFunction(metricType, weight = 1, compact) {
+  const { cols } = compact;
+  const manhattan = (a, b) =>
+    Math.abs(((a / cols) | 0) - ((b / cols) | 0)) + Math.abs((a % cols) - (b % cols));
+  switch (metricType) {
+    case METRIC_TYPES.EUCLIDEAN:
+      return (a, b) => {
+        const dx = ((a / cols) | 0) - ((b / cols) | 0);
+        const dy = (a % cols) - (b % cols);
+        return weight * Math.sqrt(dx * dx + dy * dy);
+      };
+    case METRIC_TYPES.LANDMARK: {
+      const table = landmarkTableFor(compact);
+      if (table) return (a, b) => weight * Math.max(manhattan(a, b), table.distance(a, b));
+      return (a, b) => weight * manhattan(a, b);
+    }
+    case METRIC_TYPES.MANHATTAN:
+    default:
+      return (a, b) => weight * manhattan(a, b);
+  }
+}
@@ -0,0 +1,159 @@
+// Landmark (ALT) lower bounds
+// For any landmark L, |d(L, a) - d(L, b)| <= d(a, b) by the triangle
+// inequality, so the maximum over K landmarks is an admissible, consistent
+// heuristic that follows walls instead of ignoring them. Distance fields are
+// one BFS per landmark on a CompactGrid, computed once per map and cached.
+
+export const DEFAULT_LANDMARK_COUNT = 8;
+
+// Total bytes of distance fields kept across maps (least recently used evicted first)
+let memoryBudget = 64 * 1024 * 1024;
+let cachedBytes = 0;
+const tables = new Map(); // CompactGrid -> LandmarkTable, in LRU order
+let mostRecent = null; // last table returned, already at the end of `tables`
+
+export class LandmarkTable {
+  constructor(compact, count) {
+    const FieldArray = compact.size < 0xffff ? Uint16Array : Uint32Array;
+    this.cols = compact.cols;
+    this.size = compact.size;
+    this.wallVersion = compact.wallVersion;
+    this.unreachable = FieldArray === Uint16Array ? 0xffff : 0xffffffff;
+    this.landmarks = new Int32Array(count);
+    this.count = 0;
+    // Interleaved: fields[index * count + k] is the distance from landmark k,
+    // so one lookup reads K adjacent values
+    this.fields = new FieldArray(compact.size * count);
+    this.byteLength = this.fields.byteLength;
+    selectLandmarks(this, compact, count);
+  }
+
+  // Largest triangle-inequality lower bound on the distance between two cells
+  distance(a, b) {
+    const { fields, count, unreachable } = this;
+    const offsetA = a * count;
+    const offsetB = b * count;
+    let best = 0;
+    for (let k = 0; k < count; k++) {
+      const da = fields[offsetA + k];
+      const db = fields[offsetB + k];
+      if (da === unreachable || db === unreachable) continue;
+      const d = da > db ? da - db : db - da;
+      if (d > best) best = d;
+    }
+    return best;
+  }
+}
+
+// BFS distances from `source` over open cells; unreachable cells keep `unreachable`
+function distanceField(compact, source, field, queue, unreachable) {
+  const neighbours = new Int32Array(4);
+  field.fill(unreachable);
+  field[source] = 0;
+  queue[0] = source;
+  let head = 0;
+  let tail = 1;
+  while (head < tail) {
+    const node = queue[head++];
+    const next = field[node] + 1;
+    const count = compact.neighbours(node, neighbours);
+    for (let k = 0; k < count; k++) {
+      const neighbour = neighbours[k];
+      if (field[neighbour] === unreachable) {
+        field[neighbour] = next;
+        queue[tail++] = neighbour;
+      }
+    }
+  }
+}
+
+function farthest(values, unreachable) {
+  let best = -1;
+  let bestValue = 0;
+  for (let i = 0; i < values.length; i++) {
+    if (values[i] !== unreachable && values[i] > bestValue) {
+      bestValue = values[i];
+      best = i;
+    }
+  }
+  return best;
+}
+
+// Farthest-point selection: the first landmark is the cell farthest from the
+// first open cell, each next one the cell farthest from all chosen so far
+function selectLandmarks(table, compact, count) {
+  const { unreachable } = table;
+  const FieldArray = table.fields.constructor;
+  const field = new FieldArray(compact.size);
+  const nearest = new FieldArray(compact.size);
+  const queue = new Int32Array(compact.size);
+
+  const seed = compact.walls.indexOf(0);
+  if (seed === -1) return;
+  distanceField(compact, seed, field, queue, unreachable);
+  let landmark = farthest(field, unreachable);
+  if (landmark === -1) landmark = seed;
+  nearest.fill(unreachable);
+
+  while (table.count < count && landmark !== -1) {
+    distanceField(compact, landmark, field, queue, unreachable);
+    const k = table.count++;
+    table.landmarks[k] = landmark;
+    for (let i = 0; i < compact.size; i++) {
+      table.fields[i * count + k] = field[i];
+      if (field[i] < nearest[i]) nearest[i] = field[i];
+    }
+    landmark = farthest(nearest, unreachable);
+  }
+  // Fewer landmarks than requested (tiny maps): unused slots never match
+  for (let k = table.count; k < count; k++) {
+    for (let i = 0; i < compact.size; i++) table.fields[i * count + k] = unreachable;
+  }
+}
+
+/**
+ * Landmark table for a CompactGrid, built on first use and rebuilt when its
+ * wallVersion changes. Returns null if even one distance field does not fit
+ * in the memory budget (callers fall back to a geometric heuristic).
+ */
+export function landmarkTableFor(compact, count = DEFAULT_LANDMARK_COUNT) {
+  let table = tables.get(compact);
+  // Repeated queries on one map only compare wall versions
+  if (table && table === mostRecent && table.wallVersion === compact.wallVersion) return table;
+  if (table) {
+    tables.delete(compact);
+    cachedBytes -= table.byteLength;
+    if (table.wallVersion !== compact.wallVersion) table = null;
+  }
+  if (!table) {
+    const bytesPerField = compact.size * (compact.size < 0xffff ? 2 : 4);
+    const fitting = Math.min(count, Math.floor(memoryBudget / bytesPerField));
+    if (fitting < 1) return null;
+    table = new LandmarkTable(compact, fitting);
+  }
+  tables.set(compact, table);
+  cachedBytes += table.byteLength;
+  mostRecent = table;
+  evict();
+  return table;
+}
+
+function evict() {
+  for (const [compact, table] of tables) {
+    if (cachedBytes <= memoryBudget || tables.size === 1) break;
+    tables.delete(compact);
+    cachedBytes -= table.byteLength;
+    if (table === mostRecent) mostRecent = null;
+  }
+}
+
+export function setLandmarkMemoryBudget(bytes) {
+  memoryBudget = bytes;
+  evict();
+}
+
+export function clearLandmarkCache() {
+  tables.clear();
+  cachedBytes = 0;
+  mostRecent = null;
+}
@@ -0,0 +1,154 @@
+import { dijkstra, getNodesInShortestPathOrderDijkstra } from './dijkstra.js';
+import { astar, getNodesInShortestPathOrderAstar } from './astar.js';
+import { breadthFirstSearch, getNodesInShortestPathOrderBFS } from './breadthFirstSearch.js';
+import { depthFirstSearch, getNodesInShortestPathOrderDFS } from './depthFirstSearch.js';
+import { greedyBFS, getNodesInShortestPathOrderGreedyBFS } from './greedyBestFirstSearch.js';
+import {
+  bidirectionalGreedySearch,
+  getNodesInShortestPathOrderBidirectionalGreedySearch,
+} from './bidirectionalGreedySearch.js';
+import { plannerFor } from './dStarLite.js';
+
+// One search on a map described by flat arrays, so that request and answer can
+// cross a Web Worker boundary as typed arrays instead of node objects.
+//
+//   request { algorithm, rows, cols, walls: Uint8Array (row * cols + col),
+//             start, finish (flat indices), metricType, weight }
+//   answer  { visited, path, intersections: Int32Array of flat indices,
+//             found, maxMemoryUsage }
+//
+// visited is the expansion order (bidirectional: both sides interleaved, as the
+// visualizer animates them) and path runs from start to finish. The buffers
+// are listed by transferablesOf() so postMessage moves them without copying.
+//
+// 'dStarLite' keeps its planner between requests (one per worker), so after a
+// first request with walls, a request { algorithm: 'dStarLite', edits } with
+// edits an Int32Array of (index, isWall) pairs repairs the last plan.
+
+export const SEARCH_ALGORITHMS = {
+  dijkstra: (grid, start, finish) => {
+    const visited = dijkstra(grid, start, finish);
+    return { visited, path: getNodesInShortestPathOrderDijkstra(finish) };
+  },
+  astar: (grid, start, finish, metricType, weight) => {
+    const visited = astar(grid, start, finish, metricType, weight);
+    return { visited, path: getNodesInShortestPathOrderAstar(finish) };
+  },
+  bfs: (grid, start, finish) => {
+    const visited = breadthFirstSearch(grid, start, finish);
+    return { visited, path: getNodesInShortestPathOrderBFS(finish) };
+  },
+  dfs: (grid, start, finish) => {
+    const visited = depthFirstSearch(grid, start, finish);
+    return { visited, path: getNodesInShortestPathOrderDFS(finish) };
+  },
+  greedy: (grid, start, finish, metricType, weight) => {
+    const visited = greedyBFS(grid, start, finish, metricType, weight);
+    return { visited, path: getNodesInShortestPathOrderGreedyBFS(finish) };
+  },
+  bidirectionalGreedy: (grid, start, finish, metricType, weight) => {
+    const [visitedStart, visitedFinish, isShortedPath] =
+      bidirectionalGreedySearch(grid, start, finish, metricType, weight);
+    const path = isShortedPath
+      ? getNodesInShortestPathOrderBidirectionalGreedySearch(visitedStart)
+      : [finish];
+    const visited = interleave(visitedStart, visitedFinish);
+    visited.maxMemoryUsage = visitedStart.maxMemoryUsage || visited.length;
+    return { visited, path };
+  },
+};
+
+let dynamicPlanner = null;
+
+export function runSearch(request) {
+  const { algorithm, rows, cols, walls, start, finish, metricType, weight } = request;
+  if (algorithm === 'dStarLite') {
+    return runDynamicPlan(request);
+  }
+  const search = SEARCH_ALGORITHMS[algorithm];
+  if (!search) {
+    throw new Error(`Unknown algorithm: ${algorithm}`);
+  }
+  const grid = gridFromWalls(walls, rows, cols, start, finish);
+  const startNode = grid[Math.floor(start / cols)][start % cols];
+  const finishNode = grid[Math.floor(finish / cols)][finish % cols];
+  const { visited, path } = search(grid, startNode, finishNode, metricType, weight);
+
+  const visitedNodes = visited || [];
+  const intersections = path.filter(node => node.isIntersection);
+  return {
+    visited: toIndices(visitedNodes, cols),
+    path: toIndices(path, cols),
+    intersections: toIndices(intersections, cols),
+    found: path.length > 1,
+    maxMemoryUsage: visitedNodes.maxMemoryUsage || 0,
+  };
+}
+
+function runDynamicPlan(request) {
+  const { rows, cols, walls, start, finish, metricType, weight, edits } = request;
+  if (edits) {
+    if (!dynamicPlanner) {
+      throw new Error('No D* Lite plan to repair');
+    }
+    for (let i = 0; i < edits.length; i += 2) {
+      dynamicPlanner.setWall(edits[i], edits[i + 1] === 1);
+    }
+  } else {
+    dynamicPlanner = plannerFor(dynamicPlanner, rows, cols, walls, start, finish, metricType, weight);
+  }
+  const result = dynamicPlanner.plan();
+  return {
+    visited: result.expanded,
+    path: result.path,
+    intersections: new Int32Array(0),
+    found: result.path.length > 1,
+    maxMemoryUsage: result.maxMemoryUsage,
+  };
+}
+
+export function transferablesOf(answer) {
+  return [answer.visited.buffer, answer.path.buffer, answer.intersections.buffer];
+}
+
+function gridFromWalls(walls, rows, cols, start, finish) {
+  const grid = new Array(rows);
+  for (let row = 0; row < rows; row++) {
+    const currentRow = new Array(cols);
+    for (let col = 0; col < cols; col++) {
+      const index = row * cols + col;
+      currentRow[col] = {
+        row,
+        col,
+        isStart: index === start,
+        isFinish: index === finish,
+        distance: index === start ? 0 : Infinity,
+        totalDistance: Infinity,
+        isVisited: false,
+        isShortest: false,
+        isWall: walls[index] === 1,
+        previousNode: null,
+      };
+    }
+    grid[row] = currentRow;
+  }
+  return grid;
+}
+
+function toIndices(nodes, cols) {
+  const indices = new Int32Array(nodes.length);
+  for (let i = 0; i < nodes.length; i++) {
+    indices[i] = nodes[i].row * cols + nodes[i].col;
+  }
+  return indices;
+}
+
+function interleave(first, second) {
+  const merged = [];
+  const n = Math.max(first.length, second.length);
+  for (let i = 0; i < n; i++) {
+    if (first[i] !== undefined) merged.push(first[i]);
+    if (second[i] !== undefined) merged.push(second[i]);
+  }
+  return merged;
+}
@@ -0,0 +1,16 @@
+/* eslint-disable no-restricted-globals */
+import { runSearch, transferablesOf } from './searchTask.js';
+
+// Web Worker entry: runs searches off the main thread so the page keeps
+// painting while a large grid is searched. Messages are { id, request } in and
+// { id, answer } or { id, error } out; the answer's typed arrays are
+// transferred, not copied.
+self.onmessage = (event) => {
+  const { id, request } = event.data;
+  try {
+    const answer = runSearch(request);
+    self.postMessage({ id, answer }, transferablesOf(answer));
+  } catch (error) {
+    self.postMessage({ id, error: error.message });
+  }
+};
@@ -0,0 +1,217 @@
+// Canvas renderer for large grids. The grid is one <canvas>; each cell's state
+// lives in a Uint8Array indexed row * cols + col (the same flat layout the
+// search worker uses). All drawing happens in a single requestAnimationFrame
+// loop: animations are queues of flat indices, and every frame applies up to
+// cellsPerFrame of them and repaints only the cells that changed.
+
+export const CELL = {
+  EMPTY: 0,
+  WALL: 1,
+  VISITED: 2,
+  PATH: 3,
+  INTERSECTION: 4,
+  START: 5,
+  FINISH: 6,
+};
+
+// Flat versions of the node.css colours
+const CELL_COLOURS = [
+  "#1b2b3c", // empty
+  "#3f5260", // wall
+  "#2eb2ec", // visited
+  "#faa816", // shortest path
+  "#0000ff", // intersection
+  "#00bd5f", // start
+  "#ff3d4d", // finish
+];
+const GRID_LINE_COLOUR = "#2c4b6b";
+const FRAME_MS = 1000 / 60;
+
+// Cells per frame for an animation that DOM mode would play at msPerCell:
+// never slower than the DOM pace, and scaled with the grid so that a 500×500
+// grid finishes in seconds rather than minutes
+export function cellsPerFrame(cellCount, msPerCell) {
+  const domPace = FRAME_MS / msPerCell;
+  const gridPace = cellCount / (msPerCell * 60);
+  return Math.max(1, Math.round(Math.max(domPace, gridPace)));
+}
+
+export class CanvasGridRenderer {
+  constructor(canvas) {
+    this.canvas = canvas;
+    this.context = canvas.getContext("2d");
+    this.rows = 0;
+    this.cols = 0;
+    this.cellSize = 1;
+    this.cells = new Uint8Array(0);
+    this.dirty = new Int32Array(0);
+    this.isDirty = new Uint8Array(0);
+    this.dirtyCount = 0;
+    this.fullRedraw = true;
+    this.animations = []; // { indices, state, cellsPerFrame, position, resolve }
+    this.frameId = null;
+  }
+
+  resize(rows, cols, cellSize) {
+    this.cancel();
+    this.rows = rows;
+    this.cols = cols;
+    this.cellSize = cellSize;
+    this.canvas.width = cols * cellSize;
+    this.canvas.height = rows * cellSize;
+    this.cells = new Uint8Array(rows * cols);
+    this.dirty = new Int32Array(rows * cols);
+    this.isDirty = new Uint8Array(rows * cols);
+    this.dirtyCount = 0;
+    this.requestFullRedraw();
+  }
+
+  // walls: Uint8Array (1 = wall); start/finish: flat indices
+  load(walls, start, finish) {
+    this.cancel();
+    for (let i = 0; i < this.cells.length; i++) {
+      this.cells[i] = walls[i] ? CELL.WALL : CELL.EMPTY;
+    }
+    this.cells[start] = CELL.START;
+    this.cells[finish] = CELL.FINISH;
+    this.requestFullRedraw();
+  }
+
+  setCell(index, state) {
+    if (this.cells[index] === state) return;
+    this.cells[index] = state;
+    this.markDirty(index);
+    this.schedule();
+  }
+
+  // Drop visited/path colouring, keep walls, start and finish
+  clearSearch() {
+    this.cancel();
+    for (let i = 0; i < this.cells.length; i++) {
+      if (this.cells[i] >= CELL.VISITED && this.cells[i] <= CELL.INTERSECTION) {
+        this.cells[i] = CELL.EMPTY;
+      }
+    }
+    this.requestFullRedraw();
+  }
+
+  // Paint `indices` with `state`, cellsPerFrame at a time, after any queued
+  // animations. Start and finish cells are left as they are. Resolves true when
+  // done, false if cancelled first.
+  animate(indices, state, cellsPerFrame) {
+    return new Promise(resolve => {
+      this.animations.push({ indices, state, cellsPerFrame, position: 0, resolve });
+      this.schedule();
+    });
+  }
+
+  cancel() {
+    for (const animation of this.animations) animation.resolve(false);
+    this.animations = [];
+  }
+
+  // Cell under a mouse event, or null outside the grid
+  cellAt(clientX, clientY) {
+    const bounds = this.canvas.getBoundingClientRect();
+    const scaleX = this.canvas.width / bounds.width;
+    const scaleY = this.canvas.height / bounds.height;
+    const col = Math.floor(((clientX - bounds.left) * scaleX) / this.cellSize);
+    const row = Math.floor(((clientY - bounds.top) * scaleY) / this.cellSize);
+    if (row < 0 || row >= this.rows || col < 0 || col >= this.cols) return null;
+    return { row, col };
+  }
+
+  destroy() {
+    this.cancel();
+    if (this.frameId !== null) cancelAnimationFrame(this.frameId);
+    this.frameId = null;
+  }
+
+  requestFullRedraw() {
+    this.fullRedraw = true;
+    this.schedule();
+  }
+
+  markDirty(index) {
+    if (this.isDirty[index]) return;
+    this.isDirty[index] = 1;
+    this.dirty[this.dirtyCount++] = index;
+  }
+
+  schedule() {
+    if (this.frameId === null) {
+      this.frameId = requestAnimationFrame(() => this.frame());
+    }
+  }
+
+  frame() {
+    this.frameId = null;
+    this.step();
+    this.paint();
+    if (this.animations.length > 0) this.schedule();
+  }
+
+  // Advance the queued animations by one frame's budget
+  step() {
+    let budget = this.animations.length > 0 ? this.animations[0].cellsPerFrame : 0;
+    while (budget > 0 && this.animations.length > 0) {
+      const animation = this.animations[0];
+      const { indices, state } = animation;
+      const end = Math.min(indices.length, animation.position + budget);
+      for (let i = animation.position; i < end; i++) {
+        const index = indices[i];
+        const current = this.cells[index];
+        if (current === CELL.START || current === CELL.FINISH || current === state) continue;
+        this.cells[index] = state;
+        this.markDirty(index);
+      }
+      budget -= end - animation.position;
+      animation.position = end;
+      if (animation.position === indices.length) {
+        this.animations.shift();
+        animation.resolve(true);
+      }
+    }
+  }
+
+  paint() {
+    const { context, cellSize } = this;
+    // Leave a one-pixel grid line between cells when they are big enough
+    const inset = cellSize >= 6 ? 1 : 0;
+    const size = cellSize - inset;
+
+    if (this.fullRedraw || this.dirtyCount > this.cells.length / 4) {
+      // Without grid lines the background is the empty colour, so on large
+      // grids only the non-empty cells are filled
+      context.fillStyle = inset ? GRID_LINE_COLOUR : CELL_COLOURS[CELL.EMPTY];
+      context.fillRect(0, 0, this.canvas.width, this.canvas.height);
+      // One pass per colour keeps fillStyle changes to a handful per frame
+      for (let state = inset ? CELL.EMPTY : CELL.WALL; state < CELL_COLOURS.length; state++) {
+        context.fillStyle = CELL_COLOURS[state];
+        for (let i = 0; i < this.cells.length; i++) {
+          if (this.cells[i] !== state) continue;
+          const row = (i / this.cols) | 0;
+          const col = i - row * this.cols;
+          context.fillRect(col * cellSize, row * cellSize, size, size);
+        }
+      }
+      this.fullRedraw = false;
+    } else {
+      let fillState = -1;
+      for (let k = 0; k < this.dirtyCount; k++) {
+        const i = this.dirty[k];
+        const state = this.cells[i];
+        if (state !== fillState) {
+          context.fillStyle = CELL_COLOURS[state];
+          fillState = state;
+        }
+        const row = (i / this.cols) | 0;
+        const col = i - row * this.cols;
+        context.fillRect(col * cellSize, row * cellSize, size, size);
+      }
+    }
+
+    for (let k = 0; k < this.dirtyCount; k++) this.isDirty[this.dirty[k]] = 0;
+    this.dirtyCount = 0;
+  }
+}
@@ -114,6 +114,8 @@ class NavBar extends Component {
         this.props.visualizeBFS();
       else if (this.state.algorithm === "Depth First Search")
         this.props.visualizeDFS();
+      else if (this.state.algorithm === "D* Lite")
+        this.props.visualizeDStarLite(metricType, weight);
     }
   }
 
@@ -280,6 +282,14 @@ class NavBar extends Component {
                   >
                     Bidirectional Greedy Search
                   </button></li>
+                  <li><button
+                    className="dropdown-item"
+                    type="button"
+                    onClick={() => {this.selectAlgorithm("D* Lite"); this.toggleDropdown('');}}
+                    title="Incremental replanning: after a run, editing walls repairs the path instantly"
+                  >
+                    D* Lite
+                  </button></li>
                   <li><hr className="dropdown-divider" /></li>
                   <li><button
                     className="dropdown-item"
@@ -437,6 +447,13 @@ class NavBar extends Component {
                   >
                     Euclidean
                   </button></li>
+                  <li><button
+                    className="dropdown-item"
+                    type="button"
+                    onClick={() => {this.selectMetric("Landmark"); this.toggleDropdown('');}}
+                  >
+                    Landmark
+                  </button></li>
                 </ul>
               </div>
 
@@ -502,6 +519,16 @@ class NavBar extends Component {
                 {this.props.skipAnimation ? 'Animation ON' : 'Skip Animation'}
               </button>
 
+              <button
+                type="button"
+                className={`btn btn-sm w-100 mb-2 ${this.props.renderer === 'canvas' ? 'btn-success' : 'btn-outline-success'}`}
+                onClick={() => this.props.toggleRenderer()}
+                disabled={this.props.visualizingAlgorithm || this.props.generatingMaze}
+                title="Draw the grid on a canvas and search in a background worker (for large grids)"
+              >
+                {this.props.renderer === 'canvas' ? 'Canvas Renderer' : 'DOM Renderer'}
+              </button>
+
               <button
                 type="button"
                 className={`btn btn-sm w-100 mb-3 ${this.props.showDistances ? 'btn-warning' : 'btn-outline-warning'}`}
@@ -555,7 +582,7 @@ class NavBar extends Component {
                       onChange={(e) => this.props.updateCustomRows(e.target.value)}
                       disabled={this.props.visualizingAlgorithm || this.props.generatingMaze}
                       style={{width: '70px', backgroundColor: 'rgba(255,255,255,0.1)', color: 'white', border: '1px solid rgba(255,255,255,0.3)'}}
-                      placeholder="5-20"
+                      placeholder={this.props.renderer === 'canvas' ? '5-1000' : '5-20'}
                     />
                   </div>
                   <div className="d-flex align-items-center mb-2">
@@ -567,7 +594,7 @@ class NavBar extends Component {
                       onChange={(e) => this.props.updateCustomCols(e.target.value)}
                       disabled={this.props.visualizingAlgorithm || this.props.generatingMaze}
                       style={{width: '70px', backgroundColor: 'rgba(255,255,255,0.1)', color: 'white', border: '1px solid rgba(255,255,255,0.3)'}}
-                      placeholder="5-40"
+                      placeholder={this.props.renderer === 'canvas' ? '5-1000' : '5-40'}
                     />
                   </div>
                   <div className="text-white mb-2" style={{fontSize: '0.7rem', opacity: 0.6, fontStyle: 'italic'}}>
@@ -2,6 +2,8 @@ import React, { Component } from "react";
 import "./pathfindingVisualizer.css";
 import Node from "./Node/node";
 import NavBar from "./navbar";
+import { CanvasGridRenderer, CELL, cellsPerFrame } from "./canvasRenderer";
+import { searchInWorker } from "./searchClient";
 
 //Pathfinding Algorithms
 import {
@@ -28,6 +30,11 @@ import {
   bidirectionalGreedySearch,
   getNodesInShortestPathOrderBidirectionalGreedySearch,
 } from "../pathfindingAlgorithms/bidirectionalGreedySearch";
+import {
+  plannerFor,
+  getNodesInShortestPathOrderDStarLite,
+} from "../pathfindingAlgorithms/dStarLite";
+import { nodeAt, setCompactWall } from "../pathfindingAlgorithms/compactGrid";
 
 //Maze Algorithms
 import { randomMaze } from "../mazeAlgorithms/randomMaze";
@@ -45,6 +52,13 @@ let startNodeCol = startFinishNode[1];
 let finishNodeRow = startFinishNode[2];
 let finishNodeCol = startFinishNode[3];
 
+// Custom size limits: DOM mode renders one element per cell, canvas mode one
+// <canvas> for the whole grid
+const DOM_MAX_ROWS = 20;
+const DOM_MAX_COLS = 40;
+const CANVAS_MAX_SIZE = 1000;
+const DOM_CELL_SIZE = 27;
+
 class PathfindingVisualizer extends Component {
   state = {
     grid: [],
@@ -73,9 +87,18 @@ class PathfindingVisualizer extends Component {
       memoryUsage: 0
     },
     // Add mode for setting start/finish nodes
-    settingMode: null // null, 'start', or 'finish'
+    settingMode: null, // null, 'start', or 'finish'
+    // 'dom': one Node element per cell; 'canvas': canvas renderer + search worker
+    renderer: 'dom'
   };
 
+  canvasRef = React.createRef();
+  canvasRenderer = null;
+  canvasGrid = null; // grid last drawn on the canvas
+  lastCanvasCell = null;
+  dynamicPlanner = null; // D* Lite planner kept between runs
+  dynamicPath = null; // its path on screen; while set, wall edits replan at once
+
   updateDimensions = () => {
     this.setState({
       width: window.innerWidth,
@@ -111,6 +134,7 @@ class PathfindingVisualizer extends Component {
       finishNodeCol = newStartFinish[3];
       
       const newGrid = getInitialGrid(newNumRows, newNumColumns);
+      this.dynamicPath = null;
       this.setState({
         gridSizeMode: 'auto',
         numRows: newNumRows,
@@ -144,9 +168,13 @@ class PathfindingVisualizer extends Component {
       return;
     }
     
-    // Check if values are within valid range (min 5, max 20 for rows, max 40 for cols)
-    if (rowsValue < 5 || rowsValue > 20 || colsValue < 5 || colsValue > 40) {
-      alert(`Grid size must be:\n- Rows: 5-20\n- Columns: 5-40\n\nYour input: ${rowsValue} × ${colsValue}`);
+    // Check if values are within valid range (min 5, max 20 for rows, max 40 for cols;
+    // up to CANVAS_MAX_SIZE either way with the canvas renderer)
+    const canvas = this.state.renderer === 'canvas';
+    const maxRows = canvas ? CANVAS_MAX_SIZE : DOM_MAX_ROWS;
+    const maxCols = canvas ? CANVAS_MAX_SIZE : DOM_MAX_COLS;
+    if (rowsValue < 5 || rowsValue > maxRows || colsValue < 5 || colsValue > maxCols) {
+      alert(`Grid size must be:\n- Rows: 5-${maxRows}\n- Columns: 5-${maxCols}\n\nYour input: ${rowsValue} × ${colsValue}`);
       // Reset input to current grid size
       this.setState({
         customRows: this.state.numRows,
@@ -168,8 +196,9 @@ class PathfindingVisualizer extends Component {
     const maxCellHeight = Math.floor(availableHeight / rows);
     
     // Use the smaller dimension to ensure grid fits both width and height
-    // Also cap at reasonable max (30px) and min (10px) for usability
-    const optimalCellSize = Math.min(Math.max(Math.min(maxCellWidth, maxCellHeight), 10), 30);
+    // Also cap at reasonable max (30px) and min (10px, 2px on canvas) for usability
+    const minCellSize = canvas ? 2 : 10;
+    const optimalCellSize = Math.min(Math.max(Math.min(maxCellWidth, maxCellHeight), minCellSize), 30);
     
     // Update start/finish positions for new grid
     const newStartFinish = getStartFinishNode(rows, cols);
@@ -179,6 +208,7 @@ class PathfindingVisualizer extends Component {
     finishNodeCol = newStartFinish[3];
     
     const newGrid = getInitialGrid(rows, cols);
+    this.dynamicPath = null;
     this.setState({
       numRows: rows,
       numColumns: cols,
@@ -205,12 +235,99 @@ class PathfindingVisualizer extends Component {
     this.setState({ skipAnimation: !this.state.skipAnimation });
   };
 
+  toggleRenderer = () => {
+    if (this.state.visualizingAlgorithm || this.state.generatingMaze) {
+      return;
+    }
+    this.clearPath();
+    if (this.state.renderer === 'dom') {
+      this.setState({ renderer: 'canvas' });
+      return;
+    }
+    this.setState({ renderer: 'dom' });
+    // Grids beyond the DOM limits fall back to the auto size
+    if (this.state.numRows > DOM_MAX_ROWS || this.state.numColumns > DOM_MAX_COLS) {
+      this.setGridSizeMode('auto');
+    }
+  };
+
   componentDidMount() {
     window.addEventListener("resize", this.updateDimensions);
     const grid = getInitialGrid(this.state.numRows, this.state.numColumns);
     this.setState({ grid });
   }
 
+  componentDidUpdate() {
+    if (this.state.renderer === 'canvas') {
+      this.syncCanvas();
+    } else if (this.canvasRenderer) {
+      this.canvasRenderer.destroy();
+      this.canvasRenderer = null;
+      this.canvasGrid = null;
+    }
+  }
+
+  componentWillUnmount() {
+    if (this.canvasRenderer) this.canvasRenderer.destroy();
+  }
+
+  // Keep the canvas in step with the grid: resize on a new size, redraw when
+  // the grid was replaced (clear, maze, new start/finish). Wall edits paint
+  // their own cell and mark the grid as drawn, so they skip the full redraw.
+  syncCanvas() {
+    const canvas = this.canvasRef.current;
+    if (!canvas) return;
+    if (!this.canvasRenderer || this.canvasRenderer.canvas !== canvas) {
+      if (this.canvasRenderer) this.canvasRenderer.destroy();
+      this.canvasRenderer = new CanvasGridRenderer(canvas);
+      this.canvasGrid = null;
+    }
+    const { grid, numRows, numColumns } = this.state;
+    const cellSize = this.state.gridSizeMode === 'custom' ? this.state.cellSize : DOM_CELL_SIZE;
+    const renderer = this.canvasRenderer;
+    if (renderer.rows !== numRows || renderer.cols !== numColumns || renderer.cellSize !== cellSize) {
+      renderer.resize(numRows, numColumns, cellSize);
+      this.canvasGrid = null;
+    }
+    if (this.canvasGrid !== grid && grid.length === numRows) {
+      renderer.load(
+        getWallArray(grid),
+        startNodeRow * numColumns + startNodeCol,
+        finishNodeRow * numColumns + finishNodeCol
+      );
+      this.canvasGrid = grid;
+    }
+  }
+
+  paintCanvasCell(grid, row, col) {
+    if (this.state.renderer !== 'canvas' || !this.canvasRenderer) return;
+    const node = grid[row][col];
+    if (!node.isStart && !node.isFinish) {
+      this.canvasRenderer.setCell(
+        row * this.state.numColumns + col,
+        node.isWall ? CELL.WALL : CELL.EMPTY
+      );
+    }
+    this.canvasGrid = grid;
+  }
+
+  handleCanvasMouseDown = (event) => {
+    const cell = this.canvasRenderer && this.canvasRenderer.cellAt(event.clientX, event.clientY);
+    if (!cell) return;
+    this.lastCanvasCell = cell;
+    this.handleMouseDown(cell.row, cell.col);
+  };
+
+  handleCanvasMouseMove = (event) => {
+    if (!this.state.mouseIsPressed) return;
+    const cell = this.canvasRenderer && this.canvasRenderer.cellAt(event.clientX, event.clientY);
+    if (!cell) return;
+    const last = this.lastCanvasCell;
+    if (last && last.row === cell.row && last.col === cell.col) return;
+    this.lastCanvasCell = cell;
+    this.handleMouseEnter(cell.row, cell.col);
+  };
+
   handleMouseDown(row, col) {
     if (this.state.visualizingAlgorithm || this.state.generatingMaze) {
       return;
@@ -229,13 +346,15 @@ class PathfindingVisualizer extends Component {
 
     // Normal wall toggle behavior
     const newGrid = getNewGridWithWalls(this.state.grid, row, col);
-    this.setState({ grid: newGrid, mouseIsPressed: true });
+    this.paintCanvasCell(newGrid, row, col);
+    this.setState({ grid: this.replanDynamicPath(newGrid, row, col), mouseIsPressed: true });
   }
 
   handleMouseEnter(row, col) {
     if (this.state.mouseIsPressed) {
       const newGrid = getNewGridWithWalls(this.state.grid, row, col);
-      this.setState({ grid: newGrid, mouseIsPressed: true });
+      this.paintCanvasCell(newGrid, row, col);
+      this.setState({ grid: this.replanDynamicPath(newGrid, row, col), mouseIsPressed: true });
     }
   }
 
@@ -247,15 +366,19 @@ class PathfindingVisualizer extends Component {
     if (this.state.visualizingAlgorithm || this.state.generatingMaze) {
       return;
     }
-    for (let row = 0; row < this.state.grid.length; row++) {
-      for (let col = 0; col < this.state.grid[0].length; col++) {
-        if (
-          !(
-            (row === startNodeRow && col === startNodeCol) ||
-            (row === finishNodeRow && col === finishNodeCol)
-          )
-        ) {
-          document.getElementById(`node-${row}-${col}`).className = "node";
+    this.dynamicPath = null;
+    // Canvas mode: the new grid is redrawn by syncCanvas
+    if (this.state.renderer === 'dom') {
+      for (let row = 0; row < this.state.grid.length; row++) {
+        for (let col = 0; col < this.state.grid[0].length; col++) {
+          if (
+            !(
+              (row === startNodeRow && col === startNodeCol) ||
+              (row === finishNodeRow && col === finishNodeCol)
+            )
+          ) {
+            document.getElementById(`node-${row}-${col}`).className = "node";
+          }
         }
       }
     }
@@ -271,6 +394,12 @@ class PathfindingVisualizer extends Component {
     if (this.state.visualizingAlgorithm || this.state.generatingMaze) {
       return;
     }
+    this.dynamicPath = null;
+    // Canvas mode: searches run on the worker's copy, so only the canvas has a path to clear
+    if (this.state.renderer === 'canvas') {
+      if (this.canvasRenderer) this.canvasRenderer.clearSearch();
+      return;
+    }
     for (let row = 0; row < this.state.grid.length; row++) {
       for (let col = 0; col < this.state.grid[0].length; col++) {
         const element = document.getElementById(`node-${row}-${col}`);
@@ -412,6 +541,8 @@ class PathfindingVisualizer extends Component {
   };
 
   animateAlgorithm = (visitedNodesInOrder, nodesInShortestPathOrder, algorithmType = 'default', maxMemoryUsage = 0) => {
+    // A new search replaces any live D* Lite path (visualizeDStarLite sets it again)
+    this.dynamicPath = null;
     let newGrid = this.state.grid.slice();
     for (let row of newGrid) {
       for (let node of row) {
@@ -516,6 +647,7 @@ class PathfindingVisualizer extends Component {
     nodesInShortestPathOrder,
     isShortedPath
   ) {
+    this.dynamicPath = null;
     // Pre-set distance values for all visited nodes (similar to animateAlgorithm)
     let newGrid = this.state.grid.slice();
     for (let row of newGrid) {
@@ -740,6 +872,10 @@ class PathfindingVisualizer extends Component {
     if (this.state.visualizingAlgorithm || this.state.generatingMaze) {
       return;
     }
+    if (this.state.renderer === 'canvas') {
+      this.visualizeOnCanvas('dijkstra', "Dijkstra's Algorithm");
+      return;
+    }
     this.setState({ visualizingAlgorithm: true });
     this.currentAlgorithmName = "Dijkstra's Algorithm";
     setTimeout(() => {
@@ -760,6 +896,10 @@ class PathfindingVisualizer extends Component {
     if (this.state.visualizingAlgorithm || this.state.generatingMaze) {
       return;
     }
+    if (this.state.renderer === 'canvas') {
+      this.visualizeOnCanvas('astar', "A* Search", metricType, weight);
+      return;
+    }
     this.setState({ visualizingAlgorithm: true });
     this.currentAlgorithmName = "A* Search";
     setTimeout(() => {
@@ -780,6 +920,10 @@ class PathfindingVisualizer extends Component {
     if (this.state.visualizingAlgorithm || this.state.generatingMaze) {
       return;
     }
+    if (this.state.renderer === 'canvas') {
+      this.visualizeOnCanvas('bfs', "Breadth First Search");
+      return;
+    }
     this.setState({ visualizingAlgorithm: true });
     this.currentAlgorithmName = "Breadth First Search";
     setTimeout(() => {
@@ -804,6 +948,10 @@ class PathfindingVisualizer extends Component {
     if (this.state.visualizingAlgorithm || this.state.generatingMaze) {
       return;
     }
+    if (this.state.renderer === 'canvas') {
+      this.visualizeOnCanvas('dfs', "Depth First Search");
+      return;
+    }
     this.setState({ visualizingAlgorithm: true });
     setTimeout(() => {
       const { grid } = this.state;
@@ -823,6 +971,10 @@ class PathfindingVisualizer extends Component {
     if (this.state.visualizingAlgorithm || this.state.generatingMaze) {
       return;
     }
+    if (this.state.renderer === 'canvas') {
+      this.visualizeOnCanvas('greedy', "Greedy Best First Search", metricType, weight);
+      return;
+    }
     this.setState({ visualizingAlgorithm: true });
     this.currentAlgorithmName = "Greedy Best First Search";
     setTimeout(() => {
@@ -843,6 +995,10 @@ class PathfindingVisualizer extends Component {
     if (this.state.visualizingAlgorithm || this.state.generatingMaze) {
       return;
     }
+    if (this.state.renderer === 'canvas') {
+      this.visualizeOnCanvas('bidirectionalGreedy', "Bidirectional Greedy Search", metricType, weight);
+      return;
+    }
     this.setState({ visualizingAlgorithm: true });
     setTimeout(() => {
       const { grid } = this.state;
@@ -873,7 +1029,185 @@ class PathfindingVisualizer extends Component {
     }, this.state.speed);
   }
 
+  visualizeDStarLite(metricType = 'manhattan', weight = 1) {
+    if (this.state.visualizingAlgorithm || this.state.generatingMaze) {
+      return;
+    }
+    // Canvas grids can be large, so there the planner lives in the search
+    // worker; DOM grids are small enough to plan on the main thread
+    if (this.state.renderer === 'canvas') {
+      this.visualizeOnCanvas('dStarLite', "D* Lite", metricType, weight);
+      return;
+    }
+    this.setState({ visualizingAlgorithm: true });
+    this.currentAlgorithmName = "D* Lite";
+    setTimeout(() => {
+      const { grid } = this.state;
+      const result = this.getDynamicPlanner(metricType, weight).plan();
+      const startNode = grid[startNodeRow][startNodeCol];
+      const finishNode = grid[finishNodeRow][finishNodeCol];
+      // animateAlgorithm skips the first entry (the start node for the other
+      // algorithms); D* Lite searches from the finish, so both ends are left out
+      const visitedNodesInOrder = [startNode];
+      for (const index of result.expanded) {
+        const node = nodeAt(grid, index);
+        if (node !== startNode && node !== finishNode) visitedNodesInOrder.push(node);
+      }
+      const nodesInShortestPathOrder = result.path.length > 1
+        ? getNodesInShortestPathOrderDStarLite(grid, result)
+        : [finishNode];
+      this.animateAlgorithm(visitedNodesInOrder, nodesInShortestPathOrder, 'default', result.maxMemoryUsage);
+      this.dynamicPath = result.path;
+    }, this.state.speed);
+  }
+
+  // DOM mode: one D* Lite planner kept across runs; a new run only repairs
+  // what changed (walls, start) if the size, finish and heuristic are the same
+  getDynamicPlanner(metricType, weight) {
+    const { grid, numRows, numColumns } = this.state;
+    this.dynamicPlanner = plannerFor(
+      this.dynamicPlanner,
+      numRows,
+      numColumns,
+      getWallArray(grid),
+      startNodeRow * numColumns + startNodeCol,
+      finishNodeRow * numColumns + finishNodeCol,
+      metricType,
+      weight
+    );
+    return this.dynamicPlanner;
+  }
+
+  // While a D* Lite path is shown, each wall edit replans immediately and
+  // only the path is redrawn; returns the grid to store. Canvas mode sends
+  // the edit to the worker's planner and redraws when the answer arrives.
+  replanDynamicPath(grid, row, col) {
+    const node = grid[row][col];
+    if (this.dynamicPath === null || node.isStart || node.isFinish) return grid;
+    const index = row * this.state.numColumns + col;
+    if (this.state.renderer === 'canvas') {
+      searchInWorker({ algorithm: 'dStarLite', edits: Int32Array.of(index, node.isWall ? 1 : 0) })
+        .then(this.drawCanvasReplan)
+        .catch((error) => console.error(error));
+      return grid;
+    }
+
+    const planner = this.dynamicPlanner;
+    planner.setWall(index, node.isWall);
+    const result = planner.plan();
+    const oldPath = this.dynamicPath;
+    this.dynamicPath = result.path;
+    const isEnd = (cell) => cell === planner.start || cell === planner.goal;
+    const newGrid = grid.slice();
+    for (const cell of oldPath) {
+      const pathNode = nodeAt(newGrid, cell);
+      if (isEnd(cell) || pathNode.isWall) continue;
+      newGrid[pathNode.row][pathNode.col] = { ...pathNode, isShortest: false, isVisited: false };
+    }
+    result.path.forEach((cell, i) => {
+      const pathNode = nodeAt(newGrid, cell);
+      if (isEnd(cell)) return;
+      newGrid[pathNode.row][pathNode.col] = { ...pathNode, isShortest: true, isVisited: false, distance: i };
+    });
+    this.showReplanResults(result.path, result.expanded.length, result.maxMemoryUsage);
+    return newGrid;
+  }
+
+  drawCanvasReplan = (answer) => {
+    // The path was cleared (or the renderer switched) while the worker replanned
+    if (this.dynamicPath === null || !this.canvasRenderer) return;
+    const { grid, numColumns } = this.state;
+    const start = startNodeRow * numColumns + startNodeCol;
+    const finish = finishNodeRow * numColumns + finishNodeCol;
+    const isEnd = (index) => index === start || index === finish;
+    for (const index of this.dynamicPath) {
+      if (!isEnd(index) && !nodeAt(grid, index).isWall) this.canvasRenderer.setCell(index, CELL.EMPTY);
+    }
+    for (const index of answer.path) {
+      if (!isEnd(index)) this.canvasRenderer.setCell(index, CELL.PATH);
+    }
+    this.dynamicPath = answer.path;
+    this.showReplanResults(answer.path, answer.visited.length, answer.maxMemoryUsage);
+  };
+
+  showReplanResults(path, expanded, maxMemoryUsage) {
+    this.showAlgorithmResults(
+      "D* Lite (replan)",
+      path.length > 1 ? path.length - 1 : 'No path found',
+      expanded,
+      maxMemoryUsage
+    );
+  }
+
+  // Canvas mode: run the search in the worker, then play its visit order and
+  // path through the canvas renderer's frame loop
+  visualizeOnCanvas(algorithm, algorithmName, metricType = 'manhattan', weight = 1) {
+    const { grid, numRows, numColumns } = this.state;
+    if (!this.canvasRenderer) return;
+    this.canvasRenderer.clearSearch();
+    this.dynamicPath = null;
+    this.setState({ visualizingAlgorithm: true });
+    searchInWorker({
+      algorithm,
+      rows: numRows,
+      cols: numColumns,
+      walls: getWallArray(grid),
+      start: startNodeRow * numColumns + startNodeCol,
+      finish: finishNodeRow * numColumns + finishNodeCol,
+      metricType,
+      weight,
+    })
+      .then((answer) => {
+        // A D* Lite path stays live: wall edits replan it in the worker
+        if (algorithm === 'dStarLite') this.dynamicPath = answer.path;
+        this.animateSearchOnCanvas(answer, algorithmName);
+      })
+      .catch((error) => {
+        console.error(error);
+        this.setState({ visualizingAlgorithm: false });
+      });
+  }
+
+  animateSearchOnCanvas = (answer, algorithmName) => {
+    const { visited, path, intersections, found, maxMemoryUsage } = answer;
+    const renderer = this.canvasRenderer;
+    const cellCount = this.state.numRows * this.state.numColumns;
+    const skip = this.state.skipAnimation;
+    const visitedRate = skip ? Infinity : cellsPerFrame(cellCount, this.state.speed);
+    // Same 3× slower pace as the DOM shortest path animation
+    const pathRate = skip ? Infinity : cellsPerFrame(cellCount, 3 * this.state.speed);
+
+    let done = renderer.animate(visited, CELL.VISITED, visitedRate);
+    if (found) {
+      renderer.animate(path, CELL.PATH, pathRate);
+      done = renderer.animate(intersections, CELL.INTERSECTION, Infinity);
+    }
+    done.then((completed) => {
+      this.setState({ visualizingAlgorithm: false });
+      if (!completed) return;
+      // Same counts as the DOM animation: the finish node counts as visited once reached
+      const pathLength = found ? path.length - 1 : 'No path found';
+      const visitedNodes = found ? visited.length + 1 : visited.length;
+      const show = () => this.showAlgorithmResults(algorithmName, pathLength, visitedNodes, maxMemoryUsage);
+      if (skip || !found) show();
+      else setTimeout(show, 500);
+    });
+  };
+
   animateMaze = (walls) => {
+    // The maze changes walls the planner does not know about
+    this.dynamicPath = null;
+    if (this.state.renderer === 'canvas') {
+      const { numRows, numColumns } = this.state;
+      const indices = Int32Array.from(walls, ([row, col]) => row * numColumns + col);
+      const rate = cellsPerFrame(numRows * numColumns, this.state.mazeSpeed);
+      this.canvasRenderer.animate(indices, CELL.WALL, rate).then(() => {
+        const newGrid = getNewGridWithMaze(this.state.grid, walls);
+        this.canvasGrid = newGrid; // already drawn by the animation
+        this.setState({ grid: newGrid, generatingMaze: false });
+      });
+      return;
+    }
     for (let i = 0; i <= walls.length; i++) {
       if (i === walls.length) {
         setTimeout(() => {
@@ -1031,6 +1365,7 @@ class PathfindingVisualizer extends Component {
           )}
           visualizeBFS={this.visualizeBFS.bind(this)}
           visualizeDFS={this.visualizeDFS.bind(this)}
+          visualizeDStarLite={this.visualizeDStarLite.bind(this)}
           generateRandomMaze={this.generateRandomMaze.bind(this)}
           generateRecursiveDivisionMaze={this.generateRecursiveDivisionMaze.bind(
             this
@@ -1042,6 +1377,8 @@ class PathfindingVisualizer extends Component {
           updateSpeed={this.updateSpeed.bind(this)}
           toggleDistanceMode={this.toggleDistanceMode.bind(this)}
           toggleSkipAnimation={this.toggleSkipAnimation.bind(this)}
+          renderer={this.state.renderer}
+          toggleRenderer={this.toggleRenderer.bind(this)}
           activateSetStartMode={this.activateSetStartMode.bind(this)}
           activateSetFinishMode={this.activateSetFinishMode.bind(this)}
           cancelSettingMode={this.cancelSettingMode.bind(this)}
@@ -1058,7 +1395,17 @@ class PathfindingVisualizer extends Component {
           }
           style={this.state.gridSizeMode === 'custom' ? { display: 'inline-block' } : {}}
         >
-          {grid.map((row, rowId) => {
+          {this.state.renderer === 'canvas' && (
+            <canvas
+              ref={this.canvasRef}
+              className="grid-canvas"
+              onMouseDown={this.handleCanvasMouseDown}
+              onMouseMove={this.handleCanvasMouseMove}
+              onMouseUp={() => this.handleMouseUp()}
+              onMouseLeave={() => this.handleMouseUp()}
+            />
+          )}
+          {this.state.renderer === 'dom' && grid.map((row, rowId) => {
             return (
               <div key={rowId} style={{ whiteSpace: 'nowrap' }}>
                 {row.map((node, nodeId) => {
@@ -1223,6 +1570,7 @@ const getNewGridWithWalls = (grid, row, col) => {
     isWall: !node.isWall,
   };
   newGrid[row][col] = newNode;
+  setCompactWall(newGrid, row, col, newNode.isWall);
   return newGrid;
 };
 
@@ -1235,10 +1583,23 @@ const getNewGridWithMaze = (grid, walls) => {
       isWall: true,
     };
     newGrid[wall[0]][wall[1]] = newNode;
+    setCompactWall(newGrid, wall[0], wall[1], true);
   }
   return newGrid;
 };
 
+// Uint8Array of walls (1 = wall), row * numColumns + col, for the canvas and the search worker
+const getWallArray = (grid) => {
+  const numColumns = grid.length > 0 ? grid[0].length : 0;
+  const walls = new Uint8Array(grid.length * numColumns);
+  for (let row = 0; row < grid.length; row++) {
+    for (let col = 0; col < numColumns; col++) {
+      if (grid[row][col].isWall) walls[row * numColumns + col] = 1;
+    }
+  }
+  return walls;
+};
+
 const getGridWithoutPath = (grid) => {
   let newGrid = grid.slice();
   for (let row of grid) {
@@ -0,0 +1,47 @@
+import { runSearch } from "../pathfindingAlgorithms/searchTask";
+
+// Page side of the search worker. One worker is started on first use and
+// reused; each request gets an id so answers can be matched to their promise.
+// Without Worker support (e.g. the test environment) the search runs inline.
+
+let worker = null;
+let nextId = 0;
+const pending = new Map();
+
+function getWorker() {
+  if (worker === null && typeof Worker !== "undefined") {
+    worker = new Worker(
+      new URL("../pathfindingAlgorithms/searchWorker.js", import.meta.url)
+    );
+    worker.onmessage = (event) => {
+      const { id, answer, error } = event.data;
+      const request = pending.get(id);
+      if (!request) return;
+      pending.delete(id);
+      if (error) request.reject(new Error(error));
+      else request.resolve(answer);
+    };
+    worker.onerror = (event) => {
+      for (const request of pending.values()) {
+        request.reject(new Error(event.message || "Search worker failed"));
+      }
+      pending.clear();
+    };
+  }
+  return worker;
+}
+
+// request: see runSearch in searchTask.js; request.walls and request.edits are
+// transferred to the worker and must not be used by the caller afterwards
+export function searchInWorker(request) {
+  const searchWorker = getWorker();
+  if (searchWorker === null) {
+    return Promise.resolve().then(() => runSearch(request));
+  }
+  return new Promise((resolve, reject) => {
+    const id = nextId++;
+    pending.set(id, { resolve, reject });
+    const transfer = [request.walls, request.edits].filter(Boolean).map((array) => array.buffer);
+    searchWorker.postMessage({ id, request }, transfer);
+  });
+}